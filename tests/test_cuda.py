@@ -109,6 +109,15 @@ def test_utils_benchmarks():
     ProfileModels([MODEL], imgsz=32, half=False, min_time=1, num_timed_runs=3, num_warmup_runs=1).profile()
 
 
+@pytest.mark.skipif(not CUDA_IS_AVAILABLE, reason="CUDA is not available")
+def test_dataloader_benchmark():
+    """Benchmark the dataloader with batches staged on the GPU by a background thread."""
+    from ultralytics.utils.benchmarks import benchmark_dataloader
+
+    df = benchmark_dataloader("coco8.yaml", imgsz=64, batch=4, workers=2, prefetch=(2,), device=0, batches=4)
+    assert df["Staged"].tolist() == [False, True] and (df["Images/s"] > 0).all()
+
+
 @pytest.mark.skipif(not CUDA_IS_AVAILABLE, reason="CUDA is not available")
 def test_predict_sam():
     """Test SAM model predictions using different prompts, including bounding boxes and point annotations."""
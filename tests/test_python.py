@@ -2,6 +2,8 @@
 
 import contextlib
 import csv
+import gc
+import itertools
 import urllib
 from copy import copy
 from pathlib import Path
@@ -196,6 +198,122 @@ def test_track_stream():
             yaml.safe_dump(data, f)
         model.track(video_url, imgsz=160, tracker=tracker)
 
+    # Test BoT-SORT ReID with native detector features and a separate YOLO encoder model
+    for reid_model in "auto", "yolo11n-cls.pt":
+        with open(ROOT / "cfg/trackers/botsort.yaml", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        tracker = TMP / f"botsort-reid-{Path(reid_model).stem}.yaml"
+        data["with_reid"] = True
+        data["model"] = reid_model
+        with open(tracker, "w", encoding="utf-8") as f:
+            yaml.safe_dump(data, f)
+        model.track(video_url, imgsz=160, tracker=tracker)
+
+
+def test_tracker_state_dict():
+    """Test that BYTETracker and BOTSORT resume with identical track IDs after a state_dict() checkpoint round-trip."""
+    from types import SimpleNamespace
+
+    from ultralytics.trackers import BOTSORT, BYTETracker
+    from ultralytics.trackers.basetrack import BaseTrack
+    from ultralytics.utils import IterableSimpleNamespace, yaml_load
+
+    rng = np.random.default_rng(0)
+    xywh, vel = rng.uniform(20, 400, (10, 4)), rng.uniform(-3, 3, (10, 2))
+    frames = []
+    for i in range(20):
+        boxes = xywh + np.concatenate([vel * i, np.zeros((10, 2))], 1) + rng.normal(0, 0.5, (10, 4))
+        keep = rng.random(10) > 0.2
+        dets = SimpleNamespace(conf=rng.uniform(0.05, 1, keep.sum()), cls=np.zeros(keep.sum()), xywh=boxes[keep])
+        frames.append((dets, rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)))
+
+    for tracker_cls, cfg in (BYTETracker, "bytetrack.yaml"), (BOTSORT, "botsort.yaml"):
+        args = IterableSimpleNamespace(**yaml_load(ROOT / "cfg/trackers" / cfg))
+        tracker = tracker_cls(args)
+        for dets, im in frames[:10]:
+            tracker.update(dets, im)
+        np.savez(TMP / "tracker.npz", **tracker.state_dict())  # compact binary checkpoint
+        count = BaseTrack._count
+        expected = [tracker.update(dets, im) for dets, im in frames[10:]]
+
+        BaseTrack._count = 0
+        standby = tracker_cls(args)
+        standby.load_state_dict(np.load(TMP / "tracker.npz"))
+        assert BaseTrack._count == count
+        for a, b in zip(expected, [standby.update(dets, im) for dets, im in frames[10:]]):
+            assert np.array_equal(a[:, 4], b[:, 4])  # identical track IDs
+            assert np.allclose(a, b, atol=1e-3)
+
+
+def test_reid_encoder_shared(tmp_path):
+    """Test that BoT-SORT trackers of several streams share one ReID encoder per model and device until released."""
+    from ultralytics.trackers import BOTSORT
+    from ultralytics.trackers.bot_sort import REID_ENCODERS
+    from ultralytics.utils import IterableSimpleNamespace, yaml_load
+
+    weights = tmp_path / "reid-cls.pt"
+    torch.save({"model": YOLO("yolo11n-cls.yaml").model}, weights)
+    args = IterableSimpleNamespace(**{**yaml_load(ROOT / "cfg/trackers/botsort.yaml"), "with_reid": True})
+    args.model = str(weights)
+    args.device = "cpu"
+    trackers = [BOTSORT(args) for _ in range(3)]  # i.e. one tracker per stream
+    assert trackers[0].encoder is not None and all(t.encoder is trackers[0].encoder for t in trackers)
+    assert trackers[0].encoder.device.type == "cpu" and (args.model, "cpu") in REID_ENCODERS
+    del trackers
+    gc.collect()
+    assert (args.model, "cpu") not in REID_ENCODERS  # released with the trackers
+
+
+def test_track_offline():
+    """Test offline tracking of stored detections for multiple videos in a process pool."""
+    from ultralytics.trackers.offline import load_detections, track_detections, track_videos
+
+    rng = np.random.default_rng(0)
+    files = []
+    for i in range(2):
+        xywh, vel = rng.uniform(50, 400, (10, 4)), rng.uniform(-3, 3, (10, 2))
+        dets = [
+            np.concatenate([np.full((10, 1), f), xywh + np.pad(vel * f, ((0, 0), (0, 2))), rng.random((10, 2))], 1)
+            for f in range(30)
+        ]
+        files.append(TMP / f"dets_{i}.npy")
+        np.save(files[-1], np.concatenate(dets).astype(np.float32))
+
+    results = track_videos(files, tracker="botsort.yaml", workers=2, save_dir=TMP / "offline_tracks")
+    for file in files:
+        tracks = results[str(file)]
+        assert tracks.shape[1] == 9 and len(tracks)
+        assert np.array_equal(tracks, track_detections(load_detections(file), tracker="botsort.yaml"))
+        assert np.array_equal(tracks, np.load(TMP / "offline_tracks" / f"{file.stem}.npy"))
+
+
+def test_track_obb_iou():
+    """Test gated OBB association IoU against dense batch_probiou and vectorized track coordinate stacking."""
+    from ultralytics.trackers.byte_tracker import STrack
+    from ultralytics.trackers.utils.matching import iou_distance, obb_iou
+    from ultralytics.utils.metrics import batch_probiou
+
+    rng = np.random.default_rng(0)
+    obbs = np.concatenate([rng.uniform(0, 300, (50, 2)), rng.uniform(5, 40, (50, 2)), rng.uniform(0, 3, (50, 1))], 1)
+    obbs = obbs.astype(np.float32)
+    dense, gated = batch_probiou(obbs, obbs).numpy(), obb_iou(obbs, obbs)
+    assert np.array_equal(gated[gated > 0], dense[gated > 0]) and dense[gated == 0].max() < 0.15
+
+    tracks = [STrack(np.append(box, i), 0.9, 0) for i, box in enumerate(obbs)]
+    assert np.allclose(STrack.multi_coords(tracks), np.stack([t.xywha for t in tracks]))
+    assert np.allclose(iou_distance(tracks, tracks), 1 - gated)
+
+
+def test_track_benchmark():
+    """Test tracker benchmark metrics on perfect tracks and a synthetic MOT replay."""
+    from ultralytics.utils.track_benchmarks import mot_metrics, synthetic_mot, track_benchmark
+
+    dets, gt = synthetic_mot(frames=50, objects=10)
+    perfect = np.column_stack([gt[:, 0], gt[:, 2:4], gt[:, 2:4] + gt[:, 4:6], gt[:, 1]])
+    assert all(v == 1.0 for k, v in mot_metrics(perfect, gt).items() if k != "IDSW")
+    df = track_benchmark(frames=50, objects=10)
+    assert len(df) == 2 and (df["HOTA"] > 0.5).all() and (df["FPS"] > 0).all()
+
 
 def test_val():
     """Test the validation mode of the YOLO model."""
@@ -345,6 +463,318 @@ def test_data_annotator():
     )
 
 
+def make_dataset(root, labels, shape=(48, 64)):
+    """Write a YOLO dataset with one random JPEG image per label string, None for images without a label file."""
+    (root / "images").mkdir(parents=True, exist_ok=True)
+    (root / "labels").mkdir(parents=True, exist_ok=True)
+    for i, label in enumerate(labels):
+        cv2.imwrite(str(root / "images" / f"{i}.jpg"), np.random.randint(0, 255, (*shape, 3), dtype=np.uint8))
+        if label is not None:
+            (root / "labels" / f"{i}.txt").write_text(label)
+    return root / "images"
+
+
+def test_label_store(tmp_path):
+    """Test the columnar memory-mapped label cache against per-image labels, class filtering and rect ordering."""
+    import pickle
+
+    from ultralytics.data import YOLODataset
+    from ultralytics.data.labels import LabelStore
+
+    images = make_dataset(tmp_path / "det", ["0 0.5 0.5 0.2 0.2\n1 0.3 0.3 0.1 0.1\n", "", None, "1 0.4 0.4 0.2 0.2\n"])
+    data = {"names": {0: "a", 1: "b"}}
+    dataset = YOLODataset(img_path=str(images), data=data, augment=False)
+    assert isinstance(dataset.labels, LabelStore) and (tmp_path / "det" / "labels.cache" / "cls.npy").exists()
+    assert np.allclose(dataset.labels[0]["bboxes"], [[0.5, 0.5, 0.2, 0.2], [0.3, 0.3, 0.1, 0.1]])
+    assert [len(lb["cls"]) for lb in dataset.labels] == [2, 0, 0, 1] and dataset.labels[0]["shape"] == (48, 64)
+
+    cached = YOLODataset(img_path=str(images), data=data, augment=False, classes=[1])
+    assert not isinstance(cached.labels.cls, np.memmap)  # filtered columns are held in memory
+    assert [lb["cls"].tolist() for lb in cached.labels] == [[[1.0]], [], [], [[1.0]]]
+
+    rect = YOLODataset(img_path=str(images), data=data, augment=False, rect=True, batch_size=2)
+    assert isinstance(rect.labels.cls, np.memmap) and rect.im_files == rect.labels.im_files
+    restored = pickle.loads(pickle.dumps(rect.labels))  # spawned DataLoader workers map the cache again
+    assert isinstance(restored.cls, np.memmap) and restored[1]["im_file"] == rect.labels[1]["im_file"]
+
+    seg = "1 0.1 0.1 0.5 0.1 0.5 0.5\n0 0.2 0.2 0.9 0.2 0.9 0.9 0.2 0.9\n"
+    images = make_dataset(tmp_path / "seg", [seg, ""])
+    dataset = YOLODataset(img_path=str(images), data=data, augment=False, task="segment")
+    assert [len(s) for s in dataset.labels[0]["segments"]] == [3, 4] and not dataset.labels[1]["segments"]
+    assert dataset.get_image_and_label(0)["instances"].segments.shape == (2, 1000, 2)
+
+
+def test_label_cache_update(tmp_path):
+    """Test that label cache updates verify only new and changed files and drop the labels of removed images."""
+    import json
+    import shutil
+
+    from ultralytics.data import YOLODataset
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", "", None, "1 0.4 0.4 0.2 0.2\n"])
+    data = {"names": {0: "a", 1: "b"}}
+    YOLODataset(img_path=str(images), data=data, augment=False)
+    cache = tmp_path / "labels.cache"
+    bboxes = np.load(cache / "bboxes.npy")
+    bboxes[0] = 0.25  # labels of unchanged files are reused from the cache, not verified again
+    np.save(cache / "bboxes.npy", bboxes)
+
+    (tmp_path / "labels" / "3.txt").write_text("0 0.4 0.4 0.2 0.2\n1 0.6 0.6 0.2 0.2\n")  # changed
+    (images / "1.jpg").unlink()  # removed
+    shutil.copy(images / "0.jpg", images / "4.jpg")  # new
+    (tmp_path / "labels" / "4.txt").write_text("1 0.5 0.5 0.1 0.1\n")
+    (images / "5.jpg").write_bytes(b"corrupt")
+    labels = YOLODataset(img_path=str(images), data=data, augment=False).labels
+    assert [Path(f).stem for f in labels.im_files] == ["0", "2", "3", "4"]
+    assert np.allclose(labels[0]["bboxes"], 0.25) and [len(lb["cls"]) for lb in labels] == [1, 0, 2, 1]
+    assert json.loads((cache / "meta.json").read_text())["results"] == [3, 1, 0, 1, 5]  # found, missing, empty, corrupt
+
+    labels = YOLODataset(img_path=str(images), data=data, augment=False).labels  # unchanged, cache used as is
+    assert isinstance(labels.cls, np.memmap) and np.allclose(labels[0]["bboxes"], 0.25)
+
+
+def test_verify_images(tmp_path):
+    """Test header-only and decoding image verification in a process pool."""
+    from itertools import repeat
+
+    from ultralytics.data.utils import imap_verify, img2label_paths, verify_image, verify_image_label
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n"] * 40)
+    data = (images / "0.jpg").read_bytes()
+    (images / "0.jpg").write_bytes(data[: len(data) // 2])  # truncated JPEG with a valid header
+    im_files = sorted(str(f) for f in images.iterdir())
+    lb_files = img2label_paths(im_files)
+    for decode in False, True:
+        args = zip(im_files, lb_files, repeat(""), repeat(False), repeat(1), repeat(0), repeat(0), repeat(decode))
+        results = list(imap_verify(verify_image_label, args, len(im_files), workers=2))
+        assert [r[0] for r in results[1:]] == im_files[1:] and sum(r[8] for r in results) == decode
+    assert verify_image(((im_files[0], 0), "", False))[1] == 1  # found from the header
+    assert verify_image(((im_files[0], 0), "", True))[2] == 1  # corrupt when decoded
+
+
+def test_shards(tmp_path):
+    """Test packing a dataset into shards, reading images and labels from them and shard-level shuffling."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import YOLOShardDataset, pack_shards
+    from ultralytics.data.build import build_dataloader, build_yolo_dataset
+    from ultralytics.data.shards import ShardSampler, is_shard_dir
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", "", "1 0.4 0.4 0.2 0.2\n0 0.5 0.5 0.1 0.1\n"])
+    data = {"names": {0: "a", 1: "b"}}
+    for imgsz in None, 32:
+        save_dir = pack_shards(str(images), data, tmp_path / f"shards{imgsz}", imgsz=imgsz, shard_size=0)
+        dataset = YOLOShardDataset(img_path=str(save_dir), data=data, augment=False, imgsz=32)
+        assert len(dataset.shards.index) == 3 and dataset.shards.index[:, 0].tolist() == [0, 1, 2]  # one per shard
+        assert [len(lb["cls"]) for lb in dataset.labels] == [1, 0, 2]
+        im, hw0, hw = dataset.load_image(2)
+        assert hw0 == ((48, 64) if imgsz is None else (24, 32)) and hw == (24, 32)
+        if imgsz is None:
+            assert np.array_equal(im, cv2.imread(str(images / "2.jpg"), cv2.IMREAD_REDUCED_COLOR_2))  # 64 >= 2 * 32
+
+    cfg = get_cfg(overrides={"imgsz": 32, "cache": False})
+    dataset = build_yolo_dataset(cfg, str(save_dir), batch=2, data=data)
+    assert isinstance(dataset, YOLOShardDataset)
+    assert isinstance(build_dataloader(dataset, batch=2, workers=0).sampler, ShardSampler)
+
+    jpeg = bytearray((images / "0.jpg").read_bytes())
+    i = jpeg.index(b"\xff\xc4")  # Huffman table
+    jpeg[i + 5 : i + 21] = b"\xff" * 16
+    (images / "0.jpg").write_bytes(jpeg)  # valid header, undecodable image data
+    with pytest.raises(FileNotFoundError):
+        pack_shards(str(images), data, tmp_path / "truncated", imgsz=32)
+    assert not is_shard_dir(tmp_path / "truncated")
+
+    sampler = ShardSampler(np.repeat([0, 1, 2], 4), num_replicas=2, rank=1)
+    order = list(sampler)
+    assert len(order) == 6 and len(set(order)) == 6 and order != list(sampler)  # new order every epoch
+    assert all(len(set(np.array(order[i : i + 4]) // 4)) <= 2 for i in range(0, 6, 4))  # images grouped by shard
+
+
+def test_stream_shards(tmp_path):
+    """Test streaming shards from a URL with per-worker shard assignment, shuffle buffers and epoch accounting."""
+    from ultralytics.data import YOLOStreamDataset, pack_shards
+    from ultralytics.data.augment import MixUp
+    from ultralytics.data.build import build_dataloader
+    from ultralytics.data.shards import shuffle_buffer
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", "", "1 0.4 0.4 0.2 0.2\n"] * 2)
+    data = {"names": {0: "a", 1: "b"}}
+    save_dir = pack_shards(str(images), data, tmp_path / "shards", shard_size=0)  # one image per shard
+    dataset = YOLOStreamDataset(img_path=save_dir.as_uri(), data=data, imgsz=32, batch_size=2)
+    assert dataset.stream.url and len(dataset.stream.rows) == 6 and dataset.ni == 6
+    loader = build_dataloader(dataset, batch=2, workers=0)
+    assert len(loader) == 3
+    for epoch in range(2):
+        files = [f for batch in loader for f in batch["im_file"]]
+        assert sorted(files) == sorted(dataset.im_files) and dataset.epoch == epoch + 1  # every image once per epoch
+    assert MixUp(dataset).get_indexes() in dataset.buffer  # mixed images come from the rolling buffer
+
+    dataset.distribute(batch=2, workers=0, num_replicas=4, rank=3)  # fewer shards than ranks
+    assert dataset.num_batches() == 1 and len(list(itertools.islice(iter(dataset), 2))) == 2
+    items = list(shuffle_buffer(range(10), 4, np.random.default_rng(0)))
+    assert sorted(items) == list(range(10)) and items != list(range(10))
+
+
+def test_stream_shards_val(tmp_path):
+    """Test that streamed validation yields each image exactly once per epoch, with partial last batches."""
+    from ultralytics.data import YOLOStreamDataset, pack_shards
+    from ultralytics.data.build import build_dataloader
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n"] * 5)
+    data = {"names": {0: "a"}}
+    save_dir = pack_shards(str(images), data, tmp_path / "shards", shard_size=0)
+    dataset = YOLOStreamDataset(img_path=save_dir.as_uri(), data=data, imgsz=32, batch_size=2, augment=False)
+    for workers in 0, 2:
+        loader = build_dataloader(dataset, batch=2, workers=workers, shuffle=False)
+        for _ in range(2):
+            batches = [batch["im_file"] for batch in loader]
+            assert len(batches) == len(loader) == 3  # 2+2+1 images, or 2+1 and 2 images of two workers
+            assert sorted(f for b in batches for f in b) == sorted(dataset.im_files)  # no repeated images
+
+
+def test_yolo_bbox2segment(tmp_path, monkeypatch):
+    """Test that segments generated from boxes by SAM are written to the segment label files."""
+    from types import SimpleNamespace
+
+    import ultralytics
+    from ultralytics.data.converter import yolo_bbox2segment
+
+    class BoxSAM:
+        """SAM stand-in returning one triangle per box."""
+
+        def __init__(self, model):
+            """Ignore the model path."""
+
+        def __call__(self, im, bboxes, **kwargs):
+            """Return results with one normalized polygon per box."""
+            xyn = [np.array([[0.1, 0.1], [0.5, 0.1], [0.5, 0.5]], dtype=np.float32) for _ in bboxes]
+            return [SimpleNamespace(masks=SimpleNamespace(xyn=xyn))]
+
+    monkeypatch.setattr(ultralytics, "SAM", BoxSAM)
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", ""])
+    yolo_bbox2segment(str(images), save_dir=tmp_path / "segments")
+    assert (tmp_path / "segments" / "0.txt").read_text() == "0 0.1 0.1 0.5 0.1 0.5 0.5\n"
+
+
+def test_disk_cache(tmp_path):
+    """Test the disk cache of resized images in a single memory-mapped file per imgsz, raw and PNG-compressed."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import YOLODataset
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", "", None])
+    data = {"names": {0: "a"}}
+    reference = YOLODataset(img_path=str(images), data=data, augment=False, imgsz=32)
+    for compress in False, True:
+        hyp = get_cfg(overrides={"cache_compress": compress})
+        dataset = YOLODataset(img_path=str(images), data=data, augment=False, imgsz=32, cache="disk", hyp=hyp)
+        cache = dataset.image_cache.path
+        assert cache.parent == tmp_path and cache.name.startswith("images-") and cache.name.endswith("-32.cache")
+        assert dataset.image_cache.meta["format"] == ("encoded" if compress else "raw")
+        assert [f.name for f in cache.glob("*.bin")] == ["shard-00000.bin"]  # one file for all images
+        for i in range(3):
+            im, hw0, hw = dataset.load_image(i)
+            assert np.array_equal(im, reference.load_image(i)[0]) and hw0 == (48, 64) and hw == (24, 32)
+    mtime = (cache / "shard-00000.bin").stat().st_mtime_ns
+    YOLODataset(img_path=str(images), data=data, augment=False, imgsz=32, cache="disk", hyp=hyp)  # reused
+    assert (cache / "shard-00000.bin").stat().st_mtime_ns == mtime and not list(images.glob("*.npy"))
+
+
+def test_disk_cache_shared_folder(tmp_path):
+    """Test that splits listing images of one folder, i.e. from autosplit, get separate disk caches."""
+    from ultralytics.data import YOLODataset
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n"] * 6)
+    for i in range(6):
+        cv2.imwrite(str(images / f"{i}.jpg"), np.full((48, 64, 3), 40 * i, dtype=np.uint8))
+    for split, ids in ("train", (0, 1, 2)), ("val", (3, 4, 5)):
+        (tmp_path / f"{split}.txt").write_text("".join(f"{images / f'{i}.jpg'}\n" for i in ids))
+    data = {"names": {0: "a"}}
+    train = YOLODataset(img_path=str(tmp_path / "train.txt"), data=data, augment=False, imgsz=32, cache="disk")
+    val = YOLODataset(img_path=str(tmp_path / "val.txt"), data=data, augment=False, imgsz=32, cache="disk")
+    assert train.image_cache.path != val.image_cache.path and train.image_cache.path.is_dir()
+    for dataset, ids in (train, (0, 1, 2)), (val, (3, 4, 5)):
+        assert [round(dataset.load_image(k)[0].mean() / 40) for k in range(3)] == list(ids)
+
+
+def test_reduced_decode(tmp_path):
+    """Test decoding JPEGs much larger than imgsz at a reduced size with unchanged shapes and labels."""
+    from ultralytics.data import YOLODataset
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", ""], shape=(256, 320))
+    cv2.imwrite(str(images / "2.png"), np.zeros((256, 320, 3), dtype=np.uint8))
+    dataset = YOLODataset(img_path=str(images), data={"names": {0: "a"}}, augment=False, imgsz=64)
+    assert [dataset.decode_factor(i, dataset.image_shape(i)) for i in range(3)] == [4, 4, 1]  # 320 >= 4 * 64, PNG
+    assert dataset.decode_factor(0, (160, 320), rect_mode=False) == 2  # square stretch keeps the short side >= imgsz
+    for i in range(3):
+        im, hw0, hw = dataset.load_image(i)
+        full = cv2.resize(cv2.imread(dataset.im_files[i]), (64, 52), interpolation=cv2.INTER_LINEAR)
+        assert hw0 == (256, 320) and hw == (52, 64) and np.abs(im.astype(float) - full).mean() < 64
+    assert len(dataset.labels[0]["bboxes"]) == 1 and dataset[0]["ori_shape"] == (256, 320)
+
+
+def test_dataloader_prefetch(tmp_path):
+    """Test the prefetch depth of dataloader workers and batches passing through DevicePrefetcher on CPU."""
+    from ultralytics.data import YOLODataset
+    from ultralytics.data.build import DevicePrefetcher, build_dataloader
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", "", None, ""])
+    dataset = YOLODataset(img_path=str(images), data={"names": {0: "a"}}, augment=False, imgsz=32)
+    assert build_dataloader(dataset, batch=2, workers=0, prefetch=4).prefetch_factor is None  # no workers
+    loader = build_dataloader(dataset, batch=2, workers=0)
+    batches = list(DevicePrefetcher(loader, torch.device("cpu")))
+    assert len(batches) == len(loader) == 2 and sum(len(b["im_file"]) for b in batches) == 4
+
+
+def test_rect_buckets(tmp_path):
+    """Test shuffled rectangular training batches drawn from aspect ratio buckets, also split across ranks."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data.build import AspectRatioSampler, build_dataloader, build_yolo_dataset
+
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n"] * 10, shape=(32, 96))
+    for i in range(4):
+        cv2.imwrite(str(images / f"{i}.jpg"), np.zeros((96, 48, 3), dtype=np.uint8))  # tall images
+    cfg = get_cfg(overrides={"imgsz": 64, "rect": True, "cache": False})
+    dataset = build_yolo_dataset(cfg, str(images), batch=2, data={"names": {0: "a"}})
+    loader = build_dataloader(dataset, batch=2, workers=0)
+    assert isinstance(loader.sampler, AspectRatioSampler)
+    shapes = {tuple(b["img"].shape[2:]) for b in loader}  # images of a batch share one bucket shape
+    assert shapes == {(64, 32), (32, 64)} and len(loader) == 5
+
+    buckets = np.repeat([0, 1, 2], [5, 4, 3])  # last batches of buckets 0 and 2 filled with repeated images
+    ranks = [list(AspectRatioSampler(buckets, 2, num_replicas=2, rank=r)) for r in range(2)]
+    assert len(ranks[0]) == len(ranks[1]) == 8 and set(ranks[0] + ranks[1]) == set(range(12))  # 7 batches padded
+    assert all(len(set(buckets[r[i : i + 2]])) == 1 for r in ranks for i in range(0, 8, 2))
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="requires /dev/shm")
+def test_shared_ram_cache(tmp_path, monkeypatch):
+    """Test the RAM cache in one shared-memory arena per node that later datasets attach to instead of copying."""
+    import atexit
+    import shutil
+
+    from ultralytics.data import YOLODataset
+
+    hooks = []  # exit hooks removing arenas
+    monkeypatch.setattr(atexit, "register", lambda func, *args, **kwargs: hooks.append(args))
+    images = make_dataset(tmp_path, ["0 0.5 0.5 0.2 0.2\n", "", None])
+    data = {"names": {0: "a"}}
+    reference = YOLODataset(img_path=str(images), data=data, imgsz=32)
+    dataset = YOLODataset(img_path=str(images), data=data, imgsz=32, cache="ram")
+    try:
+        assert dataset.shared_ram and dataset.image_cache.path.parent == Path("/dev/shm")
+        assert hooks == [(dataset.image_cache.path,)]  # removed when the process that built it exits
+        mtime = (dataset.image_cache.path / "shard-00000.bin").stat().st_mtime_ns
+        other = YOLODataset(img_path=str(images), data=data, imgsz=32, cache="ram")  # i.e. another rank or run
+        assert other.image_cache.path == dataset.image_cache.path and len(hooks) == 1  # attached, never removed
+        assert (other.image_cache.path / "shard-00000.bin").stat().st_mtime_ns == mtime
+        for i in range(3):
+            im, hw0, hw = other.load_image(i)
+            assert np.array_equal(im, reference.load_image(i)[0]) and hw0 == (48, 64) and hw == (24, 32)
+        assert sum(x is not None for x in other.ims) <= other.max_buffer_length  # images are not copied per process
+    finally:
+        shutil.rmtree(dataset.image_cache.path, ignore_errors=True)
+
+
 def test_events():
     """Test event sending functionality."""
     from ultralytics.hub.utils import Events
@@ -1,6 +1,7 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
 import cv2
+import numpy as np
 import pytest
 
 from ultralytics import YOLO, solutions
@@ -54,6 +55,284 @@ def test_major_solutions():
     cap1.release()
 
 
+def test_region_geometry():
+    """Test vectorized point-in-polygon, segment crossing and direction checks used by the solutions."""
+    from ultralytics.solutions.geometry import Region
+
+    polygon = Region([(0, 0), (10, 0), (10, 10), (0, 10)])
+    points = np.array([(5, 5), (10, 5), (0, 0), (11, 5), (-1, -1)])
+    assert polygon.contains(points).tolist() == [True, False, False, False, False]  # boundary is not contained
+    starts, ends = np.array([(-5, 5), (-5, 5), (2, 2), (-5, 0)]), np.array([(5, 5), (-1, 5), (3, 3), (-1, 0)])
+    assert polygon.intersects(starts, ends).tolist() == [True, False, True, False]
+
+    line = Region([(5, 0), (5, 10)])
+    assert line.vertical and not line.contains(points).any()
+    starts, ends = np.array([(0, 5), (6, 5), (0, 10), (0, 11)]), np.array([(5, 5), (4, 5), (10, 10), (10, 11)])
+    assert line.intersects(starts, ends).tolist() == [True, True, True, False]  # touching counts as intersecting
+    assert line.inward(starts, ends).tolist() == [True, False, True, True]
+
+
+def test_region_raster():
+    """Test label raster region lookups with overlapping regions and points outside the frame."""
+    from ultralytics.solutions.geometry import RegionRaster
+
+    regions = [[(0, 0), (10, 0), (10, 10), (0, 10)], [(5, 5), (20, 5), (20, 20), (5, 20)], [(30, 0), (40, 0), (35, 9)]]
+    raster = RegionRaster(regions, (32, 48))
+    assert raster.layers.shape == (2, 32, 48)  # the overlapping second region needs its own layer
+    points = np.array([(2, 2), (7.5, 7.9), (15, 15), (35, 4), (25, 25), (-3, 5), (100, 5)])
+    assert raster.labels(points).max(1).tolist() == [0, 1, 1, 2, -1, -1, -1]
+    assert raster.counts(points).tolist() == [2, 2, 1]  # (7.5, 7.9) is inside both overlapping regions
+
+
+def test_track_history():
+    """Test ring-buffer track history bounds, point order and TTL eviction."""
+    from ultralytics.solutions.history import TrackHistory
+
+    history = TrackHistory(maxlen=3, ttl=2, capacity=1)
+    for i in range(5):
+        assert history.update([1, 2], np.array([(i, i), (10 + i, 0)])) == []
+    assert history[1].tolist() == [[2, 2], [3, 3], [4, 4]]  # bounded to the 3 most recent points
+    assert history.last([1, 3], 1)[0].tolist() == [3, 3] and np.isnan(history.last([1, 3], 1)[1]).all()
+    history.update([2], np.array([(20, 0)]))
+    assert history.update([2], np.array([(21, 0)])) == [1]  # track 1 unseen for 2 frames
+    assert 1 not in history and len(history) == 1 and len(history[1]) == 0
+    history.update([3], np.array([(5, 5)]))  # reuses the freed slot
+    assert history[3].tolist() == [[5, 5]] and len(history.points) == 2
+
+
+def isolate_defaults(monkeypatch):
+    """Use copies of the default configuration dictionaries, which solutions update with their arguments."""
+    from ultralytics.solutions import solutions as module
+
+    monkeypatch.setattr(module, "DEFAULT_SOL_DICT", module.DEFAULT_SOL_DICT.copy())
+    monkeypatch.setattr(module, "DEFAULT_CFG_DICT", module.DEFAULT_CFG_DICT.copy())
+
+
+def test_heatmap_accumulator(monkeypatch):
+    """Test batched heatmap splatting against per-box circles, time windows and lazy colorization."""
+    isolate_defaults(monkeypatch)
+    heatmap = solutions.Heatmap(model="yolo11n.yaml", heatmap_scale=1.0, heatmap_window=2, render=False, show=False)
+    heatmap.init_heatmap((64, 96))
+    boxes = np.array([[10, 10, 31, 25], [20, 12, 40, 40], [80, 50, 120, 90]])  # overlapping and out-of-frame boxes
+
+    def circles(boxes):
+        """Reference heatmap of the circles inscribed in the boxes, computed box by box."""
+        yv, xv = np.mgrid[:64, :96]
+        out = np.zeros((64, 96), dtype=np.float32)
+        for x0, y0, x1, y1 in boxes:
+            r = min(x1 - x0, y1 - y0) // 2
+            inside = (xv >= x0) & (xv < x1) & (yv >= y0) & (yv < y1)
+            out += inside & ((xv - (x0 + x1) // 2) ** 2 + (yv - (y0 + y1) // 2) ** 2 <= r**2)
+        return out
+
+    heatmap.heatmap_effect(boxes)
+    assert np.array_equal(heatmap.heatmap, circles(boxes))
+    heatmap.heatmap_effect(boxes[:1])
+    heatmap.heatmap_effect([])  # first frame leaves the 2-frame window
+    assert np.array_equal(heatmap.heatmap, circles(boxes[:1]))
+    heatmap.heatmap_effect([])
+    assert not heatmap.heatmap.any()
+    assert heatmap.colorize(np.zeros((64, 96, 3), dtype=np.uint8)).shape == (64, 96, 3)
+
+
+def test_solutions_headless(monkeypatch):
+    """Test that headless solutions return per-frame results without drawing on the frame."""
+    from ultralytics.solutions.solutions import SolutionResults
+
+    isolate_defaults(monkeypatch)
+    counter = solutions.ObjectCounter(region=[(50, 0), (50, 100)], model="yolo11n.yaml", render=False, show=False)
+
+    def extract_tracks(im0, x):
+        counter.boxes, counter.clss, counter.track_ids = np.array([[x - 5, 45, x + 5, 55]]), [0], [1]
+
+    im0 = np.zeros((100, 100, 3), dtype=np.uint8)
+    for x in 20, 40, 60, 80:
+        counter.extract_tracks = lambda im0, x=x: extract_tracks(im0, x)
+        results = counter.count(im0)
+        if x == 60:
+            assert [(e["type"], e["track_id"], e["direction"]) for e in results.events] == [("line_crossing", 1, "IN")]
+    assert isinstance(results, SolutionResults) and not results.events and not im0.any()
+    assert (results.in_count, results.out_count, results.total_tracks) == (1, 0, 1)
+
+
+def test_speed_estimation(monkeypatch):
+    """Test speeds from frame timestamps and homography calibration, independent of processing time."""
+    isolate_defaults(monkeypatch)
+    world = [(0, 0), (20, 0), (20, 10), (0, 10)]  # 200 x 100 pixel image of a 20 x 10 m ground area
+    speed = solutions.SpeedEstimator(
+        region=[(100, 0), (100, 100)],
+        model="yolo11n.yaml",
+        homography=[[(0, 0), (200, 0), (200, 100), (0, 100)], world],
+        fps=10,
+        speed_window=3,
+        render=False,
+        show=False,
+    )
+    assert np.allclose(speed.to_world([(100, 50)]), [(10, 5)])
+
+    def extract_tracks(im0, x):
+        speed.boxes, speed.clss, speed.track_ids = np.array([[x - 5, 45, x + 5, 55]]), [0], [1]
+
+    im0 = np.zeros((100, 200, 3), dtype=np.uint8)
+    for frame, x in enumerate(range(40, 160, 10)):  # 10 px = 1 m per frame at 10 FPS, i.e. 36 km/h
+        speed.extract_tracks = lambda im0, x=x: extract_tracks(im0, x)
+        results = speed.estimate_speed(im0, timestamp=frame / 10 if frame % 2 else None)  # mixed time sources
+    assert results.speed_dict == pytest.approx({1: 36.0})
+
+
+def test_solution_events(monkeypatch, tmp_path):
+    """Test region enter/exit events with dwell times written in batches to file and socket event sinks."""
+    import json
+    import socket
+
+    from ultralytics.solutions.events import SocketSink, build_sink
+
+    isolate_defaults(monkeypatch)
+    file = tmp_path / "events.jsonl"
+    counter = solutions.RegionCounter(
+        region={"lane": [(0, 0), (50, 0), (50, 50), (0, 50)]},
+        model="yolo11n.yaml",
+        event_sink=str(file),
+        event_batch=2,
+        fps=10,
+        track_ttl=2,
+        render=False,
+        show=False,
+    )
+
+    def extract_tracks(im0, tracks):
+        counter.boxes = np.array([[x - 5, 20, x + 5, 30] for x in tracks.values()]).reshape(-1, 4)
+        counter.clss, counter.track_ids = [0] * len(tracks), list(tracks)
+
+    im0 = np.zeros((64, 96, 3), dtype=np.uint8)
+    for tracks in {1: 20, 2: 25}, {1: 30}, {1: 80}:  # track 1 leaves on frame 3, track 2 is evicted on frame 3
+        counter.extract_tracks = lambda im0, tracks=tracks: extract_tracks(im0, tracks)
+        results = counter.count(im0)
+    assert results.region_counts == {"lane": 0} and len(results.events) == 2
+    counter.close()
+    events = [json.loads(line) for line in file.read_text().splitlines()]
+    assert [(e["type"], e["track_id"], e["frame"], e["region"], e["value"]) for e in events] == [
+        ("region_enter", 1, 1, "lane", None),
+        ("region_enter", 2, 1, "lane", None),
+        ("region_exit", 2, 3, "lane", pytest.approx(0.1)),
+        ("region_exit", 1, 3, "lane", pytest.approx(0.2)),
+    ]
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(tmp_path / "events.sock"))
+        server.listen(1)
+        sink = build_sink(f"unix://{tmp_path / 'events.sock'}", batch=3)
+        assert isinstance(sink, SocketSink)
+        sink.write(events[:2])  # buffered until a batch of 3 events
+        sink.close()
+        conn, _ = server.accept()
+        with conn:
+            assert [json.loads(line) for line in conn.recv(4096).decode().splitlines()] == events[:2]
+
+
+def test_solution_close(monkeypatch, tmp_path):
+    """Test that solutions close the event sinks they build on close, exit or collection, but not shared sinks."""
+    import gc
+
+    from ultralytics.solutions.events import JSONLSink
+
+    isolate_defaults(monkeypatch)
+    im0 = np.zeros((64, 96, 3), dtype=np.uint8)
+
+    def run(solution):
+        """Emit one event buffered in the event sink."""
+        solution.track_ids = []
+        solution.emit("line_crossing", 7, cls=0, direction="IN")
+        solution.output(im0)
+
+    kwargs = {"model": "yolo11n.yaml", "event_batch": 100, "render": False, "show": False}
+    with solutions.ObjectCounter(event_sink=str(tmp_path / "a.jsonl"), **kwargs) as counter:
+        run(counter)
+    assert len((tmp_path / "a.jsonl").read_text().splitlines()) == 1  # written when leaving the context
+
+    counter = solutions.ObjectCounter(event_sink=str(tmp_path / "b.jsonl"), **kwargs)
+    run(counter)
+    del counter
+    gc.collect()
+    assert len((tmp_path / "b.jsonl").read_text().splitlines()) == 1  # written when collected
+
+    sink = JSONLSink(tmp_path / "c.jsonl", batch=100)
+    counter = solutions.ObjectCounter(event_sink=sink, **kwargs)
+    run(counter)
+    counter.close()
+    assert len(sink.buffer) == 1 and not (tmp_path / "c.jsonl").exists()  # shared sinks are closed by their owner
+    sink.close()
+
+
+def test_queue_dwell(monkeypatch):
+    """Test queue dwell times, wait statistics and dwell events of tracks leaving the queue."""
+    isolate_defaults(monkeypatch)
+    queue = solutions.QueueManager(
+        region=[(0, 0), (50, 0), (50, 50), (0, 50)], model="yolo11n.yaml", fps=10, render=False, show=False
+    )
+
+    def extract_tracks(im0, tracks):
+        queue.boxes = np.array([[x - 5, 20, x + 5, 30] for x in tracks.values()])
+        queue.clss, queue.track_ids = [0] * len(tracks), list(tracks)
+
+    im0 = np.zeros((64, 96, 3), dtype=np.uint8)
+    frames = {1: 20, 2: 20}, {1: 20, 2: 20}, {1: 20, 2: 80}, {1: 20, 3: 20}, {1: 20, 3: 20}  # 10 FPS, t=0.0 to 0.4
+    for tracks in frames:
+        queue.extract_tracks = lambda im0, tracks=tracks: extract_tracks(im0, tracks)
+        results = queue.process_queue(im0)
+        if tracks.get(2) == 80:
+            assert [(e["type"], e["track_id"], e["value"]) for e in results.events] == [
+                ("dwell", 2, pytest.approx(0.1))
+            ]
+    assert results.queue_count == 2 and queue.queue_ids.tolist() == [1, 3]
+    assert results.queue_dwell == pytest.approx({"mean": 0.1, "p90": 0.1, "longest": 0.4, "completed": 1})
+
+
+def test_analytics_charts(monkeypatch):
+    """Test OpenCV analytics charts and the buffered series returned by headless analytics."""
+    from ultralytics.solutions.analytics import SeriesBuffer
+
+    series = SeriesBuffer(size=3)
+    for frame in range(5):
+        series.append(frame, {"person": frame} if frame % 2 else {"car": 1})
+    x, y = series.data()
+    assert x.tolist() == [2, 3, 4] and y["car"].tolist() == [1, 0, 1] and y["person"].tolist() == [0, 3, 0]
+
+    isolate_defaults(monkeypatch)
+    for analytics_type in "line", "area", "bar", "pie":
+        analytics = solutions.Analytics(analytics_type=analytics_type, model="yolo11n.yaml", show=False)
+        chart = analytics.update_graph(1, count_dict={"person": 2, "car": 1}, plot=analytics_type)
+        assert chart.shape == (1080, 1920, 3)
+    analytics = solutions.Analytics(analytics_type="line", model="yolo11n.yaml", show=False)
+    for frame in range(1, 4):
+        analytics.total_counts = frame
+        analytics.update_graph(frame)  # direct calls append the total counts to the line
+    x, y = analytics.series.data()
+    assert x.tolist() == y["Counts"].tolist() == [1, 2, 3]
+
+    analytics = solutions.Analytics(analytics_type="line", model="yolo11n.yaml", render=False, show=False)
+    im0 = np.zeros((64, 64, 3), dtype=np.uint8)
+    for frame in range(1, 4):
+        results = analytics.process_data(im0, frame)
+    assert results.analytics_series == {"frame": [1, 2, 3], "Counts": [0, 0, 0]}
+
+
+def test_solution_runner(monkeypatch):
+    """Test batched multi-stream solutions sharing one model with per-stream solution state."""
+    from ultralytics.solutions.solutions import SolutionResults
+
+    isolate_defaults(monkeypatch)
+    runner = solutions.SolutionRunner(
+        "count", streams=["cam0", "cam1"], model="yolo11n.yaml", render=False, imgsz=64, event_sink="queue"
+    )
+    frames = {"cam0": np.zeros((64, 64, 3), dtype=np.uint8), "cam1": np.zeros((48, 64, 3), dtype=np.uint8)}
+    outputs = runner(frames)
+    outputs.update(runner({"cam1": frames["cam1"]}))
+    assert all(isinstance(v, SolutionResults) for v in outputs.values()) and set(outputs) == set(frames)
+    assert runner.frame_counts == {"cam0": 1, "cam1": 2} and runner.solutions["cam1"].model is runner.model
+    assert runner.solutions["cam1"].event_sink is runner.event_sink and runner.solutions["cam1"].stream == "cam1"
+
+
 @pytest.mark.slow
 def test_instance_segmentation():
     """Test the instance segmentation solution."""
@@ -181,6 +181,7 @@ CFG_INT_KEYS = {  # integer-only arguments
     "epochs",
     "patience",
     "workers",
+    "prefetch",
     "seed",
     "close_mosaic",
     "mask_ratio",
@@ -196,6 +197,9 @@ CFG_BOOL_KEYS = {  # boolean-only arguments
     "verbose",
     "deterministic",
     "single_cls",
+    "verify_decode",
+    "stream_shards",
+    "cache_compress",
     "rect",
     "cos_lr",
     "overlap_mask",
@@ -702,12 +706,21 @@ def handle_yolo_solutions(args: List[str]) -> None:
             success, frame = cap.read()
             if not success:
                 break
-            frame = process(frame, f_n := f_n + 1) if s_n == "analytics" else process(frame)
-            vw.write(frame)
+            if s_n == "analytics":
+                results = process(frame, f_n := f_n + 1)
+            elif s_n in {"speed", "queue"}:  # speeds and dwell times follow the source timestamps in seconds
+                results = process(frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+            else:
+                results = process(frame)
+            if solution.render:
+                vw.write(results)
+            else:  # headless solutions return per-frame results instead of annotated frames
+                LOGGER.info(str(results))
             if cv2.waitKey(1) & 0xFF == ord("q"):
                 break
     finally:
         cap.release()
+        solution.close()  # write the buffered events
 
 
 def handle_streamlit_inference():
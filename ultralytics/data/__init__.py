@@ -9,7 +9,10 @@ from .dataset import (
     YOLOConcatDataset,
     YOLODataset,
     YOLOMultiModalDataset,
+    YOLOShardDataset,
+    YOLOStreamDataset,
 )
+from .shards import pack_shards
 
 __all__ = (
     "BaseDataset",
@@ -17,10 +20,13 @@ __all__ = (
     "SemanticDataset",
     "YOLODataset",
     "YOLOMultiModalDataset",
+    "YOLOShardDataset",
+    "YOLOStreamDataset",
     "YOLOConcatDataset",
     "GroundingDataset",
     "build_yolo_dataset",
     "build_grounding",
     "build_dataloader",
     "load_inference_source",
+    "pack_shards",
 )
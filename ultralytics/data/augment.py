@@ -921,6 +921,8 @@ class MixUp(BaseMixTransform):
             >>> print(index)
             42
         """
+        if getattr(self.dataset, "streaming", False):  # only the buffered images of a stream are available
+            return random.choice(self.dataset.buffer)
         return random.randint(0, len(self.dataset) - 1)
 
     def _mix_transform(self, labels):
@@ -1661,6 +1663,8 @@ class CopyPaste(BaseMixTransform):
 
     def get_indexes(self):
         """Returns a list of random indexes from the dataset for CopyPaste augmentation."""
+        if getattr(self.dataset, "streaming", False):  # only the buffered images of a stream are available
+            return random.choice(self.dataset.buffer)
         return random.randint(0, len(self.dataset) - 1)
 
     def _mix_transform(self, labels):
@@ -1,9 +1,12 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import atexit
 import glob
+import hashlib
 import math
 import os
 import random
+import shutil
 from copy import deepcopy
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
@@ -14,7 +17,9 @@ import numpy as np
 import psutil
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS
+from ultralytics.data.labels import LabelStore
+from ultralytics.data.shards import ShardReader, ShardWriter
+from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, REDUCED_DECODE_FLAGS
 from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
 
 
@@ -39,10 +44,13 @@ class BaseDataset(Dataset):
 
     Attributes:
         im_files (list): List of image file paths.
-        labels (list): List of label data dictionaries.
+        labels (list | LabelStore): List of label data dictionaries, or a columnar store returning them by index.
         ni (int): Number of images in the dataset.
+        verify_decode (bool): Whether dataset scans fully decode images instead of reading image headers only.
         ims (list): List of loaded images.
-        npy_files (list): List of numpy file paths.
+        cache_compress (bool): Whether images cached on disk are losslessly compressed as PNG.
+        image_cache (ShardReader | None): Reader of the disk or shared-memory cache of resized images, None otherwise.
+        shared_ram (bool): Whether cache='ram' images are in a shared-memory arena mapped by all processes of a node.
         transforms (callable): Image transformation function.
     """
 
@@ -70,6 +78,10 @@ class BaseDataset(Dataset):
         self.single_cls = single_cls
         self.prefix = prefix
         self.fraction = fraction
+        self.verify_decode = getattr(hyp, "verify_decode", False)  # used by get_labels() scans
+        self.cache_compress = getattr(hyp, "cache_compress", False)
+        self.image_cache = None
+        self.shared_ram = False
         self.im_files = self.get_img_files(self.img_path)
         self.labels = self.get_labels()
         self.update_labels(include_class=classes)  # single_cls and include_class
@@ -88,7 +100,6 @@ class BaseDataset(Dataset):
 
         # Cache images (options are cache = True, False, None, "ram", "disk")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
-        self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
         if self.cache == "ram" and self.check_cache_ram():
             if hyp.deterministic:
@@ -131,6 +142,9 @@ class BaseDataset(Dataset):
 
     def update_labels(self, include_class: Optional[list]):
         """Update labels to include only these classes (optional)."""
+        if isinstance(self.labels, LabelStore):  # filter all instances at once on the columns
+            self.labels.filter_classes(include_class, self.single_cls)
+            return
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -150,28 +164,13 @@ class BaseDataset(Dataset):
 
     def load_image(self, i, rect_mode=True):
         """Loads 1 image from dataset index 'i', returns (im, resized hw)."""
-        im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
+        im = self.ims[i]
         if im is None:  # not cached in RAM
-            if fn.exists():  # load npy
-                try:
-                    im = np.load(fn)
-                except Exception as e:
-                    LOGGER.warning(f"{self.prefix}WARNING ⚠️ Removing corrupt *.npy image file {fn} due to: {e}")
-                    Path(fn).unlink(missing_ok=True)
-                    im = cv2.imread(f)  # BGR
+            if self.image_cache is not None:  # read the resized image from the disk or shared-memory cache
+                h0, w0 = self.cache_hw0[i].tolist()
+                im = self.resize_image(self.image_cache.read(self.cache_rows[i]), rect_mode, (h0, w0))
             else:  # read image
-                im = cv2.imread(f)  # BGR
-            if im is None:
-                raise FileNotFoundError(f"Image Not Found {f}")
-
-            h0, w0 = im.shape[:2]  # orig hw
-            if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
-                r = self.imgsz / max(h0, w0)  # ratio
-                if r != 1:  # if sizes are not equal
-                    w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
-                    im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
-            elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
-                im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+                im, (h0, w0) = self.read_resized_image(i, rect_mode)
 
             # Add to buffer if training with augmentations
             if self.augment:
@@ -179,54 +178,177 @@ class BaseDataset(Dataset):
                 self.buffer.append(i)
                 if 1 < len(self.buffer) >= self.max_buffer_length:  # prevent empty buffer
                     j = self.buffer.pop(0)
-                    if self.cache != "ram":
+                    if self.cache != "ram" or self.shared_ram:  # not held in self.ims
                         self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
 
             return im, (h0, w0), im.shape[:2]
 
         return self.ims[i], self.im_hw0[i], self.im_hw[i]
 
+    def read_image(self, i, factor=1):
+        """Reads the BGR image of dataset index 'i', JPEGs downscaled by 'factor' while decoding, None if unreadable."""
+        return cv2.imread(self.im_files[i], REDUCED_DECODE_FLAGS[factor])
+
+    def read_resized_image(self, i, rect_mode=True):
+        """
+        Reads the image of dataset index 'i' resized to imgsz, returns (im, original hw).
+
+        JPEGs at least 2, 4 or 8 times larger than imgsz are decoded at a reduced size, which skips most of the inverse
+        DCT and the memory of the full-resolution image. The factor is chosen from the shape recorded by the label scan
+        and the result is resized to the same shape as a full decode, so labels and 'ori_shape' are unchanged.
+        """
+        shape0 = self.image_shape(i)
+        factor = self.decode_factor(i, shape0, rect_mode)
+        im = self.read_image(i, factor)  # BGR
+        if im is None:
+            raise FileNotFoundError(f"Image Not Found {self.im_files[i]}")
+        shape0 = shape0 if factor > 1 else im.shape[:2]  # orig hw
+        return self.resize_image(im, rect_mode, shape0), shape0
+
+    def image_shape(self, i):
+        """Returns the original (h, w) of dataset index 'i' recorded by the label scan, None if unknown."""
+        if isinstance(self.labels, LabelStore):
+            return tuple(self.labels.shapes[self.labels.rows[i]].tolist())
+        shape = self.labels[i].get("shape")
+        return None if shape is None else tuple(shape)
+
+    def decode_factor(self, i, shape0, rect_mode=True):
+        """Returns the largest factor 1, 2, 4 or 8 to downscale JPEG 'i' of shape 'shape0' by while decoding."""
+        if shape0 is None or not self.im_files[i].lower().endswith((".jpg", ".jpeg")):
+            return 1
+        s = max(shape0) if rect_mode else min(shape0)  # side resized to imgsz, never upsampled from a reduced decode
+        return next((f for f in (8, 4, 2) if s >= self.imgsz * f), 1)
+
+    def resize_image(self, im, rect_mode=True, shape0=None):
+        """Resizes an image of original hw 'shape0' to imgsz by its long side in rect mode, or to a square otherwise."""
+        h0, w0 = im.shape[:2] if shape0 is None else shape0  # orig hw
+        if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
+            r = self.imgsz / max(h0, w0)  # ratio
+            w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz)) if r != 1 else (w0, h0)
+        else:  # resize by stretching image to square imgsz
+            w, h = self.imgsz, self.imgsz
+        if im.shape[:2] != (h, w):
+            im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        return im
+
     def cache_images(self):
         """Cache images to memory or disk."""
+        if self.cache == "disk":
+            self.cache_images_to_file(self.disk_cache_path(), self.cache_compress)
+            return
+        if self.shared_ram:  # one arena per node, removed when the process that built it exits
+            path = self.ram_cache_path()
+            if self.cache_images_to_file(path):  # never removes an arena of another rank or run that may still use it
+                atexit.register(shutil.rmtree, path, ignore_errors=True)
+            return
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        fcn, storage = (self.cache_images_to_disk, "Disk") if self.cache == "disk" else (self.load_image, "RAM")
         with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(fcn, range(self.ni))
+            results = pool.imap(self.load_image, range(self.ni))
             pbar = TQDM(enumerate(results), total=self.ni, disable=LOCAL_RANK > 0)
             for i, x in pbar:
-                if self.cache == "disk":
-                    b += self.npy_files[i].stat().st_size
-                else:  # 'ram'
-                    self.ims[i], self.im_hw0[i], self.im_hw[i] = x  # im, hw_orig, hw_resized = load_image(self, i)
-                    b += self.ims[i].nbytes
-                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {storage})"
+                self.ims[i], self.im_hw0[i], self.im_hw[i] = x  # im, hw_orig, hw_resized = load_image(self, i)
+                b += self.ims[i].nbytes
+                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB RAM)"
             pbar.close()
 
-    def cache_images_to_disk(self, i):
-        """Saves an image as an *.npy file for faster loading."""
-        f = self.npy_files[i]
-        if not f.exists():
-            np.save(f.as_posix(), cv2.imread(self.im_files[i]), allow_pickle=False)
+    def disk_cache_path(self):
+        """Returns the disk cache directory of the images at the current imgsz, i.e. 'images/train-<hash>-640.cache'."""
+        d = Path(self.im_files[0]).parent
+        return d.with_name(f"{d.name}-{self.im_files_hash()}-{self.imgsz}.cache")  # splits may share a directory
 
-    def check_cache_disk(self, safety_margin=0.5):
-        """Check image caching requirements vs available disk space."""
-        import shutil
+    def ram_cache_path(self):
+        """Returns the shared-memory cache directory of the images at the current imgsz, None without /dev/shm."""
+        shm = Path("/dev/shm")
+        if not (shm.is_dir() and os.access(shm, os.W_OK)):
+            return None
+        return shm / f"ultralytics-{self.im_files_hash()}-{self.imgsz}.cache"
+
+    def im_files_hash(self):
+        """Returns a hash of the set of image files naming their caches, the same on all ranks."""
+        return hashlib.sha256("\0".join(sorted(self.im_files)).encode()).hexdigest()[:16]
+
+    def load_image_cache(self, path, compress=False):
+        """Opens an existing cache of all dataset images at the current imgsz, returns False if there is none."""
+        try:
+            cache = ShardReader(path)
+            assert cache.meta["imgsz"] == self.imgsz and cache.meta["format"] == ("encoded" if compress else "raw")
+            row = {f: k for k, f in enumerate(self.cached_im_files(path))}
+            rows = np.array([row[f] for f in self.im_files], dtype=np.int64)
+        except (FileNotFoundError, NotADirectoryError, ValueError, KeyError, AssertionError):
+            return False
+        cache.open()  # map the file now, DataLoader workers forked later inherit the map
+        self.image_cache, self.cache_rows, self.cache_hw0 = cache, rows, np.load(path / "shapes.npy")[rows]
+        return True
+
+    @staticmethod
+    def cached_im_files(path):
+        """Returns the image files of an image cache directory in cache order."""
+        return np.load(path / "im_files.npy").tobytes().decode().split("\0")
+
+    def cache_images_to_file(self, path, compress=False):
+        """
+        Caches images resized to imgsz as `load_image` would in one memory-mapped file of a cache directory.
+
+        Images are stored as raw BGR pixels that are read without decoding, or losslessly compressed as PNG with
+        `compress`. The cache is written to a temporary directory first and is reused by later runs and other ranks at
+        the same imgsz, on disk next to the images or in shared memory for cache='ram'.
+
+        Args:
+            path (Path): Cache directory.
+            compress (bool): Whether to store PNG-compressed images instead of raw pixels.
+
+        Returns:
+            (bool): Whether this call built the cache, False if an existing cache of another rank or run is used.
+        """
+        if self.image_cache is not None or self.load_image_cache(path, compress):
+            return False
+        tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        writer = ShardWriter(tmp, shard_size=1 << 30)  # a single file
+        shapes = np.zeros((self.ni, 2), dtype=np.int64)
+
+        def encode(i):
+            """Return the cached bytes and the resized and original shapes of image i."""
+            im, (h0, w0) = self.read_resized_image(i)
+            buf = cv2.imencode(".png", im, [cv2.IMWRITE_PNG_COMPRESSION, 1])[1] if compress else im
+            return buf.tobytes(), im.shape[:2], (h0, w0)
 
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        n = min(self.ni, 30)  # extrapolate from 30 random images
-        for _ in range(n):
-            im_file = random.choice(self.im_files)
-            im = cv2.imread(im_file)
-            if im is None:
-                continue
-            b += im.nbytes
-            if not os.access(Path(im_file).parent, os.W_OK):
-                self.cache = None
-                LOGGER.info(f"{self.prefix}Skipping caching images to disk, directory not writeable ⚠️")
-                return False
-        disk_required = b * self.ni / n * (1 + safety_margin)  # bytes required to cache dataset to disk
-        total, used, free = shutil.disk_usage(Path(self.im_files[0]).parent)
+        where = "Disk" if self.cache == "disk" else "shared RAM"
+        with ThreadPool(NUM_THREADS) as pool:
+            pbar = TQDM(enumerate(pool.imap(encode, range(self.ni))), total=self.ni, disable=LOCAL_RANK > 0)
+            for i, (buf, shape, shape0) in pbar:
+                writer.write(buf, shape)
+                shapes[i] = shape0
+                b += len(buf)
+                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {where})"
+            pbar.close()
+        np.save(tmp / "im_files.npy", np.frombuffer("\0".join(self.im_files).encode(), dtype=np.uint8))
+        np.save(tmp / "shapes.npy", shapes)
+        writer.close("encoded" if compress else "raw", imgsz=self.imgsz)
+        try:
+            if path.is_dir() and set(self.cached_im_files(path)) == set(self.im_files):
+                shutil.rmtree(path)  # cache of these images in another format
+            tmp.rename(path)
+            built = True
+        except OSError:  # written by another process at the same time, never replaces a cache of other images
+            shutil.rmtree(tmp, ignore_errors=True)
+            built = False
+        self.load_image_cache(path, compress)
+        return built
+
+    def check_cache_disk(self, safety_margin=0.5):
+        """Check image caching requirements vs available disk space."""
+        path = self.disk_cache_path()
+        if self.load_image_cache(path, self.cache_compress):  # cached by a previous run
+            return True
+        if not os.access(path.parent, os.W_OK):
+            self.cache = None
+            LOGGER.info(f"{self.prefix}Skipping caching images to disk, directory not writeable ⚠️")
+            return False
+        disk_required = self.estimate_cache_size() * (1 + safety_margin)  # bytes required to cache dataset to disk
+        total, used, free = shutil.disk_usage(path.parent)
         if disk_required > free:
+            gb = 1 << 30  # bytes per gigabytes
             self.cache = None
             LOGGER.info(
                 f"{self.prefix}{disk_required / gb:.1f}GB disk space required, "
@@ -237,16 +359,19 @@ class BaseDataset(Dataset):
         return True
 
     def check_cache_ram(self, safety_margin=0.5):
-        """Check image caching requirements vs available memory."""
-        b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        n = min(self.ni, 30)  # extrapolate from 30 random images
-        for _ in range(n):
-            im = cv2.imread(random.choice(self.im_files))  # sample image
-            if im is None:
-                continue
-            ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
-            b += im.nbytes * ratio**2
-        mem_required = b * self.ni / n * (1 + safety_margin)  # GB required to cache dataset into RAM
+        """
+        Check image caching requirements vs available memory.
+
+        Images are cached once per node in a shared-memory arena that all ranks and DataLoader workers map read-only, so
+        an arena already built by another rank or run needs no more memory and a new one is counted once, not once per
+        process. If /dev/shm is missing or too small, i.e. in containers, images are cached in each process instead.
+        """
+        path = self.ram_cache_path()
+        if path is not None and self.load_image_cache(path):  # built by another rank or run
+            self.shared_ram = True
+            return True
+        gb = 1 << 30  # bytes per gigabytes
+        mem_required = self.estimate_cache_size() * (1 + safety_margin)  # bytes required to cache dataset into RAM
         mem = psutil.virtual_memory()
         if mem_required > mem.available:
             self.cache = None
@@ -256,19 +381,60 @@ class BaseDataset(Dataset):
                 f"{mem.available / gb:.1f}/{mem.total / gb:.1f}GB available, not caching images ⚠️"
             )
             return False
+        if path is not None:
+            total, used, free = shutil.disk_usage(path.parent)
+            self.shared_ram = mem_required <= free
+            if not self.shared_ram:
+                LOGGER.info(
+                    f"{self.prefix}{mem_required / gb:.1f}GB shared memory required but only "
+                    f"{free / gb:.1f}/{total / gb:.1f}GB free in {path.parent}, caching images per process ⚠️"
+                )
         return True
 
+    def estimate_cache_size(self):
+        """Returns the bytes of all images resized to imgsz, extrapolated from 30 random images."""
+        b = 0  # bytes of sampled images
+        n = min(self.ni, 30)  # extrapolate from 30 random images
+        for _ in range(n):
+            j = random.randrange(self.ni)
+            im = self.read_image(j, self.decode_factor(j, self.image_shape(j)))  # sample image
+            if im is None:
+                continue
+            ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
+            b += im.nbytes * ratio**2  # uncompressed size, an upper bound with cache_compress
+        return b * self.ni / n
+
     def set_rectangle(self):
         """Sets the shape of bounding boxes for YOLO detections as rectangles."""
-        bi = np.floor(np.arange(self.ni) / self.batch_size).astype(int)  # batch index
-        nb = bi[-1] + 1  # number of batches
-
-        s = np.array([x.pop("shape") for x in self.labels])  # hw
-        ar = s[:, 0] / s[:, 1]  # aspect ratio
-        irect = ar.argsort()
+        irect = self.aspect_ratios().argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
-        ar = ar[irect]
+        if isinstance(self.labels, LabelStore):
+            self.labels = self.labels.subset(irect)
+        else:
+            self.labels = [self.labels[i] for i in irect]
+        self.set_batch_shapes(self.batch_size)
+
+    def aspect_ratios(self):
+        """Returns the height to width ratio of the original shape of each image."""
+        if isinstance(self.labels, LabelStore):
+            s = self.labels.shapes[self.labels.rows]  # hw
+        else:
+            s = np.array([x["shape"] for x in self.labels])  # hw
+        return s[:, 0] / s[:, 1]
+
+    def set_batch_shapes(self, size):
+        """
+        Sets the rectangular training image shape of each group of `size` images sorted by aspect ratio.
+
+        Groups are the batches of rectangular validation, or aspect ratio buckets of several batches shuffled by
+        `AspectRatioSampler` in rectangular training.
+
+        Args:
+            size (int): Number of images per group.
+        """
+        ar = self.aspect_ratios()
+        bi = np.floor(np.arange(self.ni) / size).astype(int)  # batch index
+        nb = bi[-1] + 1  # number of batches
 
         # Set training image shapes
         shapes = [[1, 1]] * nb
@@ -289,7 +455,12 @@ class BaseDataset(Dataset):
 
     def get_image_and_label(self, index):
         """Get and return label information from the dataset."""
-        label = deepcopy(self.labels[index])  # requires deepcopy() https://github.com/ultralytics/ultralytics/pull/1948
+        if isinstance(self.labels, LabelStore):
+            label = self.labels[index]  # new dict of column slices, no deepcopy needed
+        else:
+            label = deepcopy(
+                self.labels[index]
+            )  # requires deepcopy() https://github.com/ultralytics/ultralytics/pull/1948
         label.pop("shape", None)  # shape is for rect, remove it
         label["img"], label["ori_shape"], label["resized_shape"] = self.load_image(index)
         label["ratio_pad"] = (
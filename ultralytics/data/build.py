@@ -1,15 +1,25 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import contextlib
+import math
 import os
 import random
+import threading
 from pathlib import Path
+from queue import Empty, Queue
 
 import numpy as np
 import torch
 from PIL import Image
-from torch.utils.data import dataloader, distributed
-
-from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset
+from torch.utils.data import IterableDataset, Sampler, dataloader, distributed
+
+from ultralytics.data.dataset import (
+    GroundingDataset,
+    YOLODataset,
+    YOLOMultiModalDataset,
+    YOLOShardDataset,
+    YOLOStreamDataset,
+)
 from ultralytics.data.loaders import (
     LOADERS,
     LoadImagesAndVideos,
@@ -20,6 +30,7 @@ from ultralytics.data.loaders import (
     SourceTypes,
     autocast_list,
 )
+from ultralytics.data.shards import ShardSampler, is_shard_dir, is_shard_url
 from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, VID_FORMATS
 from ultralytics.utils import RANK, colorstr
 from ultralytics.utils.checks import check_file
@@ -39,13 +50,19 @@ class InfiniteDataLoader(dataloader.DataLoader):
         self.iterator = super().__iter__()
 
     def __len__(self):
-        """Returns the length of the batch sampler's sampler."""
+        """Returns the length of the batch sampler's sampler, or the batches per epoch of a streamed dataset."""
+        if isinstance(self.dataset, IterableDataset):
+            return self.dataset.num_batches()
         return len(self.batch_sampler.sampler)
 
     def __iter__(self):
         """Creates a sampler that repeats indefinitely."""
         for _ in range(len(self)):
             yield next(self.iterator)
+        if isinstance(self.dataset, IterableDataset):
+            self.dataset.epoch += 1  # workers started by reset() continue at the next epoch
+            if getattr(self.dataset, "exact", False):  # workers stop after one pass over the dataset
+                self.reset()
 
     def reset(self):
         """
@@ -56,6 +73,89 @@ class InfiniteDataLoader(dataloader.DataLoader):
         self.iterator = self._get_iterator()
 
 
+class DevicePrefetcher:
+    """
+    Iterate a dataloader while a background thread copies the next batches to the CUDA device.
+
+    Batch images are copied on a separate CUDA stream from the pinned batches of the dataloader while the current
+    training step runs, so steps wait neither for the host to device copy nor for the dataloader. Other devices iterate
+    the dataloader directly.
+
+    Attributes:
+        loader (InfiniteDataLoader): Dataloader of the batches.
+        device (torch.device): Device the batches are copied to.
+        depth (int): Number of batches staged on the device ahead of the current one.
+        keys (Tuple[str]): Batch keys of the tensors copied to the device.
+
+    Examples:
+        >>> for batch in DevicePrefetcher(train_loader, torch.device("cuda:0")):
+        ...     loss = model(batch["img"].float() / 255)  # image already on the device
+    """
+
+    def __init__(self, loader, device, depth=1, keys=("img",)):
+        """
+        Initialize the prefetcher, the staging thread is started by each iteration.
+
+        Args:
+            loader (InfiniteDataLoader): Dataloader of the batches.
+            device (torch.device): Device the batches are copied to.
+            depth (int): Number of batches staged on the device ahead of the current one.
+            keys (Tuple[str]): Batch keys of the tensors copied to the device.
+        """
+        self.loader = loader
+        self.device = device
+        self.depth = depth
+        self.keys = keys
+
+    def __len__(self):
+        """Returns the number of batches of the dataloader."""
+        return len(self.loader)
+
+    def __iter__(self):
+        """Yield the batches of one epoch of the dataloader with their staged tensors on the device."""
+        if self.device.type != "cuda":
+            yield from self.loader
+            return
+        stream = torch.cuda.Stream(self.device)
+        queue, stop, done = Queue(maxsize=self.depth), threading.Event(), object()
+
+        def stage():
+            """Copy the batches of one epoch to the device on the side stream."""
+            try:
+                with torch.cuda.device(self.device), torch.cuda.stream(stream):
+                    for batch in self.loader:
+                        for k in self.keys:
+                            if isinstance(batch.get(k), torch.Tensor):
+                                batch[k] = batch[k].to(self.device, non_blocking=True)
+                        queue.put((batch, stream.record_event()))
+                        if stop.is_set():
+                            return
+                queue.put((done, None))
+            except Exception as e:
+                queue.put((e, None))
+
+        thread = threading.Thread(target=stage, daemon=True)
+        thread.start()
+        try:
+            while True:
+                batch, event = queue.get()
+                if batch is done:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                current = torch.cuda.current_stream(self.device)
+                current.wait_event(event)  # copy finished before the step uses the tensors
+                for k in self.keys:
+                    if isinstance(batch.get(k), torch.Tensor):
+                        batch[k].record_stream(current)  # memory is not reused by the side stream while in use
+                yield batch
+        finally:
+            stop.set()
+            while thread.is_alive():  # unblock and finish the thread, i.e. if the epoch loop breaks early
+                with contextlib.suppress(Empty):
+                    queue.get(timeout=0.1)
+
+
 class _RepeatSampler:
     """
     Sampler that repeats forever.
@@ -74,6 +174,78 @@ class _RepeatSampler:
             yield from iter(self.sampler)
 
 
+class AspectRatioSampler(Sampler):
+    """
+    Sampler of shuffled batches that each take their images from one aspect ratio bucket.
+
+    Buckets are groups of images of similar aspect ratio padded to one rectangular shape, see
+    `BaseDataset.set_batch_shapes`, so rectangular training can shuffle without mixing shapes within a batch. Every
+    epoch the images of each bucket are shuffled and split into batches, the last batch of a bucket is filled with its
+    first images, and the batches of all buckets are shuffled. With several replicas each rank takes a contiguous block
+    of the batch order, so all batches of all ranks are rectangular.
+
+    Attributes:
+        buckets (np.ndarray): Bucket of each dataset image.
+        batch_size (int): Number of images per batch.
+        shuffle (bool): Whether to shuffle, batches are returned in bucket order otherwise.
+        seed (int): Random seed, identical on all ranks.
+        epoch (int): Epoch of the next order, advanced on every iteration and set by `set_epoch`.
+        num_replicas (int): Number of distributed ranks.
+        rank (int): Rank of this process.
+
+    Examples:
+        >>> dataset.set_batch_shapes(4 * batch_size)  # buckets of 4 batches
+        >>> sampler = AspectRatioSampler(dataset.batch, batch_size)
+        >>> loader = build_dataloader(dataset, batch_size, workers=8)  # uses this sampler for rect datasets
+    """
+
+    def __init__(self, buckets, batch_size, shuffle=True, seed=0, num_replicas=1, rank=0):
+        """
+        Initialize the sampler.
+
+        Args:
+            buckets (np.ndarray): Bucket of each dataset image, consecutive integers from 0.
+            batch_size (int): Number of images per batch.
+            shuffle (bool): Whether to shuffle.
+            seed (int): Random seed, identical on all ranks.
+            num_replicas (int): Number of distributed ranks.
+            rank (int): Rank of this process.
+        """
+        self.buckets = np.asarray(buckets)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+        self.num_replicas = num_replicas
+        self.rank = rank
+        nb = sum(math.ceil(n / batch_size) for n in np.bincount(self.buckets))  # batches of all ranks
+        self.num_batches = math.ceil(nb / num_replicas)  # batches per rank
+
+    def __len__(self):
+        """Return the number of images per rank and epoch, a multiple of the batch size."""
+        return self.num_batches * self.batch_size
+
+    def set_epoch(self, epoch):
+        """Set the epoch of the next order, i.e. the same on all distributed ranks."""
+        self.epoch = epoch
+
+    def __iter__(self):
+        """Yield the image indices of the batches of this rank for one epoch."""
+        rng = np.random.default_rng(self.seed + self.epoch)
+        self.epoch += 1
+        batches = []
+        for bucket in range(len(np.bincount(self.buckets))):
+            i = np.flatnonzero(self.buckets == bucket)
+            if self.shuffle:
+                i = rng.permutation(i)
+            n = math.ceil(len(i) / self.batch_size) * self.batch_size
+            batches.extend(np.resize(i, n).reshape(-1, self.batch_size))  # fill the last batch of the bucket
+        order = rng.permutation(len(batches)) if self.shuffle else np.arange(len(batches))
+        k = self.num_batches
+        order = np.resize(order, k * self.num_replicas)  # pad by repeating the first batches
+        return iter([i for j in order[self.rank * k : (self.rank + 1) * k] for i in batches[j].tolist()])
+
+
 def seed_worker(worker_id):  # noqa
     """Set dataloader worker seed https://pytorch.org/docs/stable/notes/randomness.html#dataloader."""
     worker_seed = torch.initial_seed() % 2**32
@@ -83,7 +255,12 @@ def seed_worker(worker_id):  # noqa
 
 def build_yolo_dataset(cfg, img_path, batch, data, mode="train", rect=False, stride=32, multi_modal=False):
     """Build YOLO Dataset."""
-    dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
+    if is_shard_url(img_path) or (is_shard_dir(img_path) and cfg.stream_shards):  # read shards front to back
+        dataset = YOLOStreamDataset
+    elif is_shard_dir(img_path):  # dataset YAML split packed with `pack_shards`
+        dataset = YOLOShardDataset
+    else:
+        dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
     return dataset(
         img_path=img_path,
         imgsz=cfg.imgsz,
@@ -124,12 +301,22 @@ def build_grounding(cfg, img_path, json_file, batch, mode="train", rect=False, s
     )
 
 
-def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
-    """Return an InfiniteDataLoader or DataLoader for training or validation set."""
+def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1, prefetch=2):
+    """Return an InfiniteDataLoader for training or validation set, loading `prefetch` batches ahead per worker."""
     batch = min(batch, len(dataset))
     nd = torch.cuda.device_count()  # number of CUDA devices
     nw = min(os.cpu_count() // max(nd, 1), workers)  # number of workers
-    sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
+    world, r = (1, 0) if rank == -1 else (torch.distributed.get_world_size(), torch.distributed.get_rank())
+    if isinstance(dataset, YOLOStreamDataset):  # the dataset shuffles and splits the streamed samples itself
+        dataset.distribute(batch, nw, shuffle, num_replicas=world, rank=r)
+        sampler, shuffle = None, False
+    elif shuffle and getattr(dataset, "rect", False):  # shuffled rectangular batches of similar aspect ratio images
+        dataset.set_batch_shapes(batch * math.ceil(len(dataset) / (batch * 16)))  # up to 16 aspect ratio buckets
+        sampler = AspectRatioSampler(dataset.batch, batch, num_replicas=world, rank=r)
+    elif shuffle and isinstance(dataset, YOLOShardDataset):  # shuffle shards and images within shards
+        sampler = ShardSampler(dataset.shards.index[dataset.labels.rows, 0], num_replicas=world, rank=r)
+    else:
+        sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
     generator = torch.Generator()
     generator.manual_seed(6148914691236517205 + RANK)
     return InfiniteDataLoader(
@@ -137,6 +324,7 @@ def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
         batch_size=batch,
         shuffle=shuffle and sampler is None,
         num_workers=nw,
+        prefetch_factor=prefetch if nw > 0 else None,
         sampler=sampler,
         pin_memory=PIN_MEMORY,
         collate_fn=getattr(dataset, "collate_fn", None),
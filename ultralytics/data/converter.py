@@ -608,13 +608,14 @@ def yolo_bbox2segment(im_dir, save_dir=None, sam_model="sam_b.pt", device=None):
 
     # NOTE: add placeholder to pass class index check
     dataset = YOLODataset(im_dir, data=dict(names=list(range(1000))))
-    if len(dataset.labels[0]["segments"]) > 0:  # if it's segment data
+    labels = list(dataset.labels)  # label dicts updated below, the label store returns new dicts on every access
+    if len(labels[0]["segments"]) > 0:  # if it's segment data
         LOGGER.info("Segmentation labels detected, no need to generate new ones!")
         return
 
     LOGGER.info("Detection labels detected, generating segment labels by SAM model!")
     sam_model = SAM(sam_model)
-    for label in TQDM(dataset.labels, total=len(dataset.labels), desc="Generating segment labels"):
+    for label in TQDM(labels, total=len(labels), desc="Generating segment labels"):
         h, w = label["shape"]
         boxes = label["bboxes"]
         if len(boxes) == 0:  # skip empty labels
@@ -627,7 +628,7 @@ def yolo_bbox2segment(im_dir, save_dir=None, sam_model="sam_b.pt", device=None):
 
     save_dir = Path(save_dir) if save_dir else Path(im_dir).parent / "labels-segment"
     save_dir.mkdir(parents=True, exist_ok=True)
-    for label in dataset.labels:
+    for label in labels:
         texts = []
         lb_name = Path(label["im_file"]).with_suffix(".txt").name
         txt_file = save_dir / lb_name
@@ -635,7 +636,7 @@ def yolo_bbox2segment(im_dir, save_dir=None, sam_model="sam_b.pt", device=None):
         for i, s in enumerate(label["segments"]):
             if len(s) == 0:
                 continue
-            line = (int(cls[i]), *s.reshape(-1))
+            line = (int(cls[i, 0]), *s.reshape(-1))
             texts.append(("%g " * len(line)).rstrip() % line)
         with open(txt_file, "a") as f:
             f.writelines(text + "\n" for text in texts)
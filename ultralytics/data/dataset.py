@@ -1,18 +1,19 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import itertools
 import json
+import math
 from collections import defaultdict
 from itertools import repeat
-from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 import cv2
 import numpy as np
 import torch
 from PIL import Image
-from torch.utils.data import ConcatDataset
+from torch.utils.data import ConcatDataset, IterableDataset, get_worker_info
 
-from ultralytics.utils import LOCAL_RANK, NUM_THREADS, TQDM, colorstr
+from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, TQDM, colorstr
 from ultralytics.utils.ops import resample_segments
 from ultralytics.utils.torch_utils import TORCHVISION_0_18
 
@@ -27,10 +28,14 @@ from .augment import (
     v8_transforms,
 )
 from .base import BaseDataset
+from .labels import LabelStore
+from .shards import ShardReader, ShardStream, shuffle_buffer
 from .utils import (
     HELP_URL,
     LOGGER,
+    file_fingerprints,
     get_hash,
+    imap_verify,
     img2label_paths,
     load_dataset_cache_file,
     save_dataset_cache_file,
@@ -38,8 +43,8 @@ from .utils import (
     verify_image_label,
 )
 
-# Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8
-DATASET_CACHE_VERSION = "1.0.3"
+# Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8, >= 2.0.0 for columnar memory-mapped label caches
+DATASET_CACHE_VERSION = "2.1.0"
 
 
 class YOLODataset(BaseDataset):
@@ -63,47 +68,80 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, **kwargs)
 
-    def cache_labels(self, path=Path("./labels.cache")):
+    def cache_labels(self, path=Path("./labels.cache"), fingerprints=None, cache=None):
         """
         Cache dataset labels, check images and read shapes.
 
+        The labels are saved as a columnar `LabelStore` in the cache directory, loaded as memory maps next time. Given
+        the previous cache, only new images and images whose image or label file changed in size or modification time
+        are verified again, labels of removed images are dropped and all other labels are reused, so growing datasets
+        are not rescanned from scratch.
+
         Args:
-            path (Path): Path where to save the cache file. Default is Path('./labels.cache').
+            path (Path): Path of the cache directory. Default is Path('./labels.cache').
+            fingerprints (np.ndarray, optional): Size and modification time of each image and label file of shape
+                (N, 4), read from the file system if not given.
+            cache (dict, optional): Previous cache as loaded by `get_labels`.
 
         Returns:
-            (dict): labels.
+            (dict): Cache with the 'labels' store, 'results', 'msgs' and 'corrupt' images, the given cache itself if
+                no file changed.
         """
-        x = {"labels": []}
-        nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
-        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
-        total = len(self.im_files)
+        if fingerprints is None:
+            fingerprints = np.hstack([file_fingerprints(self.im_files), file_fingerprints(self.label_files)])
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
             raise ValueError(
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
-        with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(
+
+        # Match images to the previous cache, images with identical fingerprints are not verified again
+        old = cache["labels"] if cache else None
+        corrupt = cache["corrupt"] if cache else {}  # fingerprints of corrupt images
+        row = {f: i for i, f in enumerate(old.im_files)} if old is not None else {}
+        rows = np.array([row.get(f, -1) for f in self.im_files], dtype=np.int64)
+        keep = rows >= 0
+        keep[keep] = (old.fingerprints[rows[keep]] == fingerprints[keep]).all(1) if keep.any() else False
+        known = np.array([f in corrupt for f in self.im_files], dtype=bool)
+        skip = keep | np.array([corrupt.get(f) == fp.tolist() for f, fp in zip(self.im_files, fingerprints)], bool)
+        todo = np.nonzero(~skip)[0]
+        removed = (len(old) if cache else 0) + len(corrupt) - (rows >= 0).sum() - known.sum()
+        if cache and not len(todo) and not removed:
+            return cache  # no new, changed or removed images
+        if cache:
+            LOGGER.info(f"{self.prefix}Updating {path}: {len(todo)} new or changed, {removed} removed")
+        kept = {self.im_files[i] for i in np.nonzero(skip)[0]}
+        corrupt = {f: fp for f, fp in corrupt.items() if f in kept}
+        msgs = {f: m for f, m in cache["msgs"].items() if f in kept} if cache else {}
+
+        labels, found = [], []  # labels and indices of the verified images
+        nm, nf, ne, nc, new_msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
+        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
+        if len(todo):
+            results = imap_verify(
                 func=verify_image_label,
                 iterable=zip(
-                    self.im_files,
-                    self.label_files,
+                    [self.im_files[i] for i in todo],
+                    [self.label_files[i] for i in todo],
                     repeat(self.prefix),
                     repeat(self.use_keypoints),
                     repeat(len(self.data["names"])),
                     repeat(nkpt),
                     repeat(ndim),
+                    repeat(self.verify_decode),
                 ),
+                total=len(todo),
             )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
+            pbar = TQDM(results, desc=desc, total=len(todo))
+            for (im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg), i in zip(pbar, todo):
                 nm += nm_f
                 nf += nf_f
                 ne += ne_f
                 nc += nc_f
                 if im_file:
-                    x["labels"].append(
+                    found.append(i)
+                    labels.append(
                         {
                             "im_file": im_file,
                             "shape": shape,
@@ -115,31 +153,48 @@ class YOLODataset(BaseDataset):
                             "bbox_format": "xywh",
                         }
                     )
+                else:
+                    corrupt[self.im_files[i]] = fingerprints[i].tolist()
                 if msg:
-                    msgs.append(msg)
+                    msgs[self.im_files[i]] = msg
+                    new_msgs.append(msg)
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             pbar.close()
-
-        if msgs:
-            LOGGER.info("\n".join(msgs))
+        if new_msgs:
+            LOGGER.info("\n".join(new_msgs))
+
+        # Merge the reused and verified labels in image order
+        labels = LabelStore.from_labels(labels)
+        index = np.concatenate([np.nonzero(keep)[0], found]).astype(np.int64)
+        if keep.any():
+            labels = LabelStore.concat([old.select(rows[keep]), labels])
+        labels.fingerprints = fingerprints[index]
+        if np.any(np.diff(index) < 0):
+            labels = labels.select(np.argsort(index))
+
+        missing = labels.fingerprints[:, 2] < 0
+        empty = ~missing & (np.diff(labels.offsets) == 0)
+        nm, nf, ne, nc = int(missing.sum()), int((~missing).sum()), int(empty.sum()), len(corrupt)
         if nf == 0:
             LOGGER.warning(f"{self.prefix}WARNING ⚠️ No labels found in {path}. {HELP_URL}")
-        x["hash"] = get_hash(self.label_files + self.im_files)
-        x["results"] = nf, nm, ne, nc, len(self.im_files)
-        x["msgs"] = msgs  # warnings
-        save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
+        x = {"labels": labels, "results": (nf, nm, ne, nc, len(self.im_files)), "msgs": msgs, "corrupt": corrupt}
+        x["version"] = DATASET_CACHE_VERSION
+        labels.save(path, {k: x[k] for k in ("version", "results", "msgs", "corrupt")}, self.prefix)
         return x
 
     def get_labels(self):
         """Returns dictionary of labels for YOLO training."""
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
+        fingerprints = np.hstack([file_fingerprints(self.im_files), file_fingerprints(self.label_files)])
         try:
-            cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
+            store, cache = LabelStore.load(cache_path)  # attempt to load a *.cache directory as memory maps
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
-        except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            cache["labels"] = store
+        except (FileNotFoundError, NotADirectoryError, AssertionError, KeyError, ValueError):
+            cache = None
+        x = self.cache_labels(cache_path, fingerprints, cache)  # verify new and changed images only
+        exists, cache = x is cache, x
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -147,26 +202,25 @@ class YOLODataset(BaseDataset):
             d = f"Scanning {cache_path}... {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             TQDM(None, desc=self.prefix + d, total=n, initial=n)  # display results
             if cache["msgs"]:
-                LOGGER.info("\n".join(cache["msgs"]))  # display warnings
+                LOGGER.info("\n".join(cache["msgs"].values()))  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
+        [cache.pop(k) for k in ("version", "msgs", "corrupt")]  # remove items
         labels = cache["labels"]
         if not labels:
             LOGGER.warning(f"WARNING ⚠️ No images found in {cache_path}, training may not work correctly. {HELP_URL}")
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+        self.im_files = labels.im_files  # update im_files
 
         # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        len_cls = len_boxes = len(labels.cls)
+        len_segments = 0 if labels.segments is None else int((np.diff(labels.segment_offsets) > 0).sum())
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"WARNING ⚠️ Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
+            labels.drop_segments()
         if len_cls == 0:
             LOGGER.warning(f"WARNING ⚠️ No labels found in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
@@ -278,6 +332,231 @@ class YOLOMultiModalDataset(YOLODataset):
         return transforms
 
 
+class YOLOShardDataset(YOLODataset):
+    """
+    YOLO dataset reading images and labels from a shard directory written by `pack_shards`.
+
+    Images are read from a few large memory-mapped shard files instead of opening one file per image, which removes the
+    per-file latency of network storage, and raw shards need no image decoding. Labels are loaded from the packed
+    `LabelStore` without any scan. Shard directories are used in place of image directories in dataset YAMLs.
+
+    Attributes:
+        shards (ShardReader): Reader of the packed images.
+
+    Examples:
+        >>> pack_shards("path/to/images/train", data, "path/to/shards/train", imgsz=640)
+        >>> dataset = YOLOShardDataset(img_path="path/to/shards/train", data=data)
+    """
+
+    def get_img_files(self, img_path):
+        """Open the shards and return the original paths of the packed images as image names."""
+        self.shards = ShardReader(img_path)
+        im_files = LabelStore.load(self.shards.path / "labels")[0].im_files
+        if self.fraction < 1:
+            im_files = im_files[: round(len(im_files) * self.fraction)]  # retain a fraction of the dataset
+        return im_files
+
+    def get_labels(self):
+        """Load the packed labels as memory maps."""
+        labels, _ = LabelStore.load(self.shards.path / "labels")
+        if len(self.im_files) < len(labels):
+            labels = labels.subset(np.arange(len(self.im_files)))
+        if self.use_keypoints and labels.keypoints is None:
+            raise ValueError(f"{self.prefix}Shards {self.shards.path} have no keypoints, pack them with task='pose'.")
+        return labels
+
+    def read_image(self, i, factor=1):
+        """Reads the packed BGR image of dataset index 'i', encoded JPEGs downscaled by 'factor' while decoding."""
+        return self.shards.read(self.labels.rows[i], factor)
+
+    def decode_factor(self, i, shape0, rect_mode=True):
+        """Returns the JPEG decode downscale factor of encoded shards, 1 for raw shards that are downscaled already."""
+        return 1 if self.shards.meta["format"] == "raw" else super().decode_factor(i, shape0, rect_mode)
+
+    def check_cache_disk(self, safety_margin=0.5):
+        """Disables disk caching, shards are read sequentially already."""
+        LOGGER.info(f"{self.prefix}Skipping caching images to disk, images are read from shards ⚠️")
+        self.cache = None
+        return False
+
+
+class YOLOStreamDataset(YOLOShardDataset, IterableDataset):
+    """
+    YOLO dataset streaming images from the shards of a local shard directory or its URL, i.e. an object store.
+
+    Shards are read front to back without random access or local copies, so datasets larger than local disk are trained
+    directly from remote storage. Every epoch the shards are shuffled with the same seed on all ranks and dealt to the
+    DataLoader workers of all ranks, and each worker yields its images through a shuffle buffer. Mosaic, MixUp and
+    CopyPaste draw their extra images from the rolling buffer of recently streamed images. In shuffled training each
+    worker yields the same number of full batches per epoch, repeating images of its shards as needed, so
+    `InfiniteDataLoader` epochs end on epoch boundaries. Otherwise, i.e. for validation, each image is yielded exactly
+    once per epoch and the last batch of each worker may be partial. Images are not cached and batches are never
+    rectangular.
+
+    Attributes:
+        stream (ShardStream): Sequential reader of the shards.
+        shuffle_buffer (int): Number of images each worker draws its next sample from at random.
+        seed (int): Random seed of the shard and sample order, identical on all ranks.
+        epoch (int): Epoch of the next iteration, advanced by every epoch of an `InfiniteDataLoader`.
+        pending (Dict[int, bytes]): Bytes of the streamed images not decoded yet by dataset index.
+        batch (int): Batch size of the DataLoader.
+        workers (int): Number of DataLoader workers.
+        shuffle (bool): Whether to shuffle the shards and samples.
+        exact (bool): Whether each image is yielded exactly once per epoch instead of padding workers to full batches.
+        num_replicas (int): Number of distributed ranks.
+        rank (int): Rank of this process.
+
+    Methods:
+        distribute: Sets the batch size, workers, shuffling and ranks the samples are split across.
+        num_batches: Returns the number of batches of one epoch of this rank.
+        deal: Returns the shards of a DataLoader worker of a rank in an epoch.
+
+    Examples:
+        >>> dataset = YOLOStreamDataset(img_path="https://example.com/datasets/coco/shards/train", data=data)
+        >>> loader = build_dataloader(dataset, batch=16, workers=8)
+    """
+
+    streaming = True
+
+    def __init__(self, *args, shuffle_buffer=256, **kwargs):
+        """
+        Initialize the dataset from the metadata and labels of the shards, rect is not supported.
+
+        Args:
+            *args (Any): Positional arguments of `YOLODataset`.
+            shuffle_buffer (int): Number of images each worker draws its next sample from at random.
+            **kwargs (Any): Keyword arguments of `YOLODataset`.
+        """
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = getattr(kwargs.get("hyp", DEFAULT_CFG), "seed", 0)
+        self.epoch = 0
+        self.pending = {}
+        super().__init__(*args, **{**kwargs, "rect": False})
+        self.distribute(self.batch_size or 1, 0, shuffle=self.augment)
+
+    def get_img_files(self, img_path):
+        """Open the shard stream and return the original paths of the packed images as image names."""
+        self.stream = ShardStream(img_path)
+        return super().get_img_files(self.stream.path)
+
+    def distribute(self, batch, workers, shuffle=True, num_replicas=1, rank=0):
+        """
+        Set how the samples of an epoch are batched and split, called by `build_dataloader`.
+
+        Args:
+            batch (int): Batch size of the DataLoader.
+            workers (int): Number of DataLoader workers, 0 for loading in the main process.
+            shuffle (bool): Whether to shuffle the shards and samples.
+            num_replicas (int): Number of distributed ranks.
+            rank (int): Rank of this process.
+        """
+        self.batch, self.workers, self.shuffle = batch, workers, shuffle
+        self.exact = not (shuffle and self.augment)  # no repeated images outside of shuffled training
+        self.num_replicas, self.rank = num_replicas, rank
+
+    def num_batches(self):
+        """Returns the number of batches of one epoch of this rank, the same number from each worker unless exact."""
+        w = max(self.workers, 1)
+        if not self.exact:
+            return math.ceil(math.ceil(self.ni / self.num_replicas) / (self.batch * w)) * w
+        index, n = self.stream_index(), 0
+        for slot in range(self.rank * w, (self.rank + 1) * w):
+            shards, stride, offset = self.deal(self.epoch, slot, w * self.num_replicas)
+            rows = [self.stream.rows[s] for s in shards]
+            k = np.concatenate(rows)[offset::stride] if rows else np.zeros(0, dtype=np.int64)
+            n += math.ceil((index[k] >= 0).sum() / self.batch)  # batches of each worker, the last one partial
+        return n
+
+    def deal(self, epoch, slot, slots):
+        """
+        Deal the shards, shuffled per epoch, to the DataLoader workers of all ranks, or their images if too few.
+
+        Args:
+            epoch (int): Epoch of the shard order.
+            slot (int): Worker of all ranks, `rank * workers + worker`.
+            slots (int): Number of workers of all ranks.
+
+        Returns:
+            shards (np.ndarray): Shards streamed by the worker, in order.
+            stride (int): Stride over the images of the shards.
+            offset (int): First image of the shards streamed by the worker.
+        """
+        n = len(self.stream.rows)
+        order = np.random.default_rng([self.seed, epoch]).permutation(n) if self.shuffle else np.arange(n)
+        return (order[slot::slots], 1, 0) if n >= slots else (order, slots, slot)
+
+    def stream_index(self):
+        """Returns the dataset index of each row of the shard index, -1 for images not in the dataset."""
+        index = np.full(len(self.stream.index), -1)
+        index[self.labels.rows] = np.arange(self.ni)
+        return index
+
+    def __iter__(self):
+        """Yield the transformed samples of this rank and DataLoader worker, one epoch after another."""
+        info = get_worker_info()
+        worker, workers = (info.id, info.num_workers) if info is not None else (0, 1)
+        slots, slot = workers * self.num_replicas, self.rank * workers + worker
+        epoch = self.epoch
+        while True:
+            shards, stride, offset = self.deal(epoch, slot, slots)
+            rng = np.random.default_rng([self.seed, epoch, slot])
+            if self.exact:  # a single pass, InfiniteDataLoader starts new workers for the next epoch
+                samples = self.samples(shards, stride, offset, rng, repeat=False)
+            else:
+                quota = self.num_batches() // max(self.workers, 1) * self.batch  # samples per worker and epoch
+                samples = itertools.islice(self.samples(shards, stride, offset, rng), quota)
+            for i, buf in samples:
+                self.pending[i] = buf
+                yield self[i]
+                self.pending.pop(i, None)  # not decoded if still in the image buffer
+            if self.exact:
+                return
+            epoch += 1
+
+    def samples(self, shards, stride=1, offset=0, rng=None, repeat=True):
+        """
+        Stream every stride-th image of some shards endlessly, repeating the shards as needed, or once.
+
+        Args:
+            shards (Iterable[int]): Shards to read, in order.
+            stride (int): Stride over the streamed images, i.e. to split a few shards across many workers.
+            offset (int): First streamed image.
+            rng (np.random.Generator, optional): Generator shuffling each pass over the shards in a shuffle buffer.
+            repeat (bool): Whether to repeat the shards, the images are streamed once otherwise.
+
+        Yields:
+            (Tuple[int, bytes]): Dataset index and bytes of each image.
+        """
+        index = self.stream_index()
+        size = self.shuffle_buffer if self.shuffle and rng is not None else 0
+        while True:
+            found = False
+            images = self.stream.images(shards)
+            images = (
+                (int(index[k]), buf) for j, (k, buf) in enumerate(images) if j % stride == offset and index[k] >= 0
+            )
+            for x in shuffle_buffer(images, size, rng):
+                found = True
+                yield x
+            if not repeat:
+                return
+            if not found:
+                if stride == 1:  # no images
+                    return
+                stride, offset = 1, 0  # fewer images than workers, repeat the images of other workers
+
+    def read_image(self, i, factor=1):
+        """Decodes the streamed image of dataset index 'i', only available while it is the current sample."""
+        h, w = self.shards.index[self.labels.rows[i], 3:].tolist()
+        return self.shards.decode(self.pending.pop(i), h, w, factor)
+
+    def check_cache_ram(self, safety_margin=0.5):
+        """Disables caching images in RAM, images are streamed."""
+        LOGGER.info(f"{self.prefix}Skipping caching images to RAM, images are streamed from shards ⚠️")
+        self.cache = None
+        return False
+
+
 class GroundingDataset(YOLODataset):
     """Handles object detection tasks by loading annotations from a specified JSON file, supporting YOLO format."""
 
@@ -398,6 +677,7 @@ class ClassificationDataset:
         cache_disk (bool): Indicates if caching on disk is enabled.
         samples (list): A list of tuples, each containing the path to an image, its class index, path to its .npy cache
                         file (if caching on disk), and optionally the loaded image array (if caching in RAM).
+        verify_decode (bool): Whether image verification fully decodes images instead of reading image headers only.
         torch_transforms (callable): PyTorch transforms to be applied to the images.
     """
 
@@ -437,6 +717,7 @@ class ClassificationDataset:
             )
             self.cache_ram = False
         self.cache_disk = str(args.cache).lower() == "disk"  # cache images on hard drive as uncompressed *.npy files
+        self.verify_decode = getattr(args, "verify_decode", False)  # fully decode images in verify_images()
         self.samples = self.verify_images()  # filter out bad images
         self.samples = [list(x) + [Path(x[0]).with_suffix(".npy"), None] for x in self.samples]  # file, index, npy, im
         scale = (1.0 - args.scale, 1.0)  # (0.08, 1.0)
@@ -497,18 +778,18 @@ class ClassificationDataset:
         except (FileNotFoundError, AssertionError, AttributeError):
             # Run scan if *.cache retrieval failed
             nf, nc, msgs, samples, x = 0, 0, [], [], {}
-            with ThreadPool(NUM_THREADS) as pool:
-                results = pool.imap(func=verify_image, iterable=zip(self.samples, repeat(self.prefix)))
-                pbar = TQDM(results, desc=desc, total=len(self.samples))
-                for sample, nf_f, nc_f, msg in pbar:
-                    if nf_f:
-                        samples.append(sample)
-                    if msg:
-                        msgs.append(msg)
-                    nf += nf_f
-                    nc += nc_f
-                    pbar.desc = f"{desc} {nf} images, {nc} corrupt"
-                pbar.close()
+            args = zip(self.samples, repeat(self.prefix), repeat(self.verify_decode))
+            results = imap_verify(verify_image, args, len(self.samples))
+            pbar = TQDM(results, desc=desc, total=len(self.samples))
+            for sample, nf_f, nc_f, msg in pbar:
+                if nf_f:
+                    samples.append(sample)
+                if msg:
+                    msgs.append(msg)
+                nf += nf_f
+                nc += nc_f
+                pbar.desc = f"{desc} {nf} images, {nc} corrupt"
+            pbar.close()
             if msgs:
                 LOGGER.info("\n".join(msgs))
             x["hash"] = get_hash([x[0] for x in self.samples])
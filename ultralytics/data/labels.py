@@ -0,0 +1,336 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from ultralytics.utils import LOGGER, is_dir_writeable
+
+
+def _ranges(starts, counts):
+    """Return the concatenated ranges [start, start + count) of all starts and counts as one index array."""
+    counts = np.asarray(counts, dtype=np.int64)
+    ends = np.cumsum(counts)
+    total = ends[-1] if len(ends) else 0
+    return np.repeat(np.asarray(starts, dtype=np.int64) - (ends - counts), counts) + np.arange(total)
+
+
+class LabelStore:
+    """
+    Columnar store of the labels of a YOLO dataset, saved as memory-mapped `.npy` files.
+
+    The labels of all images are kept in flat arrays, i.e. `cls` of shape (M, 1) and `bboxes` of shape (M, 4) for the M
+    instances of the dataset, with `offsets` of shape (N + 1,) giving the instances of each of the N images. Segment
+    points are concatenated the same way with `segment_offsets` per instance. A saved store is loaded as read-only
+    memory maps, so opening a large dataset does not unpickle millions of dictionaries and DataLoader workers share the
+    pages instead of copying an object graph on access. Indexing returns the familiar per-image label dictionary built
+    from slices of the columns.
+
+    Attributes:
+        im_files (List[str]): Image file of each image, in dataset order.
+        rows (np.ndarray): Row of each image in the columns, reordered by `subset`.
+        shapes (np.ndarray): Image shapes (h, w) of shape (N, 2) in int32, in column order.
+        offsets (np.ndarray): Instance offsets of each image of shape (N + 1,) in int64.
+        cls (np.ndarray): Class index of each instance of shape (M, 1) in float32.
+        bboxes (np.ndarray): Normalized xywh boxes of shape (M, 4) in float32.
+        segments (np.ndarray | None): Concatenated normalized segment points of shape (P, 2) in float32.
+        segment_offsets (np.ndarray | None): Point offsets of each instance of shape (M + 1,) in int64.
+        keypoints (np.ndarray | None): Normalized keypoints of shape (M, K, 3) in float32.
+        fingerprints (np.ndarray | None): Size and modification time of each image and label file of shape (N, 4) in
+            int64, used to re-verify only changed files.
+
+    Methods:
+        from_labels: Builds a store from per-image label dictionaries.
+        concat: Concatenates stores.
+        load: Loads a saved store as memory maps.
+        save: Saves the store as `.npy` files.
+        subset: Returns a store of the given images sharing the columns.
+        select: Returns a store of the given images with their columns gathered into new arrays.
+        filter_classes: Keeps only the instances of the given classes.
+        drop_segments: Removes all segments.
+
+    Examples:
+        >>> store, meta = LabelStore.load("datasets/coco8/labels/train.cache")
+        >>> label = store[0]  # dict with 'im_file', 'shape', 'cls', 'bboxes', 'segments', 'keypoints', ...
+        >>> boxes = store.bboxes  # all boxes of the dataset without iterating over images
+    """
+
+    COLUMNS = "shapes", "offsets", "cls", "bboxes", "segments", "segment_offsets", "keypoints", "fingerprints"
+
+    def __init__(
+        self,
+        im_files,
+        shapes,
+        offsets,
+        cls,
+        bboxes,
+        segments=None,
+        segment_offsets=None,
+        keypoints=None,
+        fingerprints=None,
+        rows=None,
+    ):
+        """
+        Initialize the store from its columns.
+
+        Args:
+            im_files (List[str]): Image file of each image.
+            shapes (np.ndarray): Image shapes (h, w) of shape (N, 2).
+            offsets (np.ndarray): Instance offsets of each image of shape (N + 1,).
+            cls (np.ndarray): Class index of each instance of shape (M, 1).
+            bboxes (np.ndarray): Normalized xywh boxes of shape (M, 4).
+            segments (np.ndarray, optional): Concatenated segment points of shape (P, 2).
+            segment_offsets (np.ndarray, optional): Point offsets of each instance of shape (M + 1,).
+            keypoints (np.ndarray, optional): Keypoints of shape (M, K, 3).
+            fingerprints (np.ndarray, optional): Image and label file fingerprints of shape (N, 4).
+            rows (np.ndarray, optional): Row of each image in the columns, defaults to all rows in order.
+        """
+        self.im_files = list(im_files)
+        self.shapes = shapes
+        self.offsets = offsets
+        self.cls = cls
+        self.bboxes = bboxes
+        self.segments = segments
+        self.segment_offsets = segment_offsets
+        self.keypoints = keypoints
+        self.fingerprints = fingerprints
+        self.rows = np.arange(len(self.im_files)) if rows is None else rows
+
+    @classmethod
+    def from_labels(cls, labels):
+        """
+        Build a store from per-image label dictionaries, i.e. as returned by `verify_image_label`.
+
+        Args:
+            labels (List[Dict]): Labels with keys 'im_file', 'shape', 'cls', 'bboxes', 'segments' and 'keypoints'.
+
+        Returns:
+            (LabelStore): The columnar store of the labels.
+        """
+        counts = [len(lb["cls"]) for lb in labels]
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        segments = segment_offsets = keypoints = None
+        if any(len(lb["segments"]) for lb in labels):
+            # Images without segments get empty segments, so segment and instance counts match as in `get_labels`
+            segs = [s for lb in labels for s in (lb["segments"] or [np.zeros((0, 2))] * len(lb["cls"]))]
+            segment_offsets = np.zeros(len(segs) + 1, dtype=np.int64)
+            np.cumsum([len(s) for s in segs], out=segment_offsets[1:])
+            segments = np.concatenate(segs, 0).astype(np.float32).reshape(-1, 2)
+        if labels and labels[0]["keypoints"] is not None:
+            keypoints = np.concatenate([lb["keypoints"] for lb in labels], 0).astype(np.float32)
+        return cls(
+            [lb["im_file"] for lb in labels],
+            np.array([lb["shape"] for lb in labels], dtype=np.int32).reshape(-1, 2),
+            offsets,
+            np.concatenate([lb["cls"] for lb in labels], 0).astype(np.float32) if labels else np.zeros((0, 1), "f4"),
+            np.concatenate([lb["bboxes"] for lb in labels], 0).astype(np.float32) if labels else np.zeros((0, 4), "f4"),
+            segments,
+            segment_offsets,
+            keypoints,
+        )
+
+    @classmethod
+    def concat(cls, stores):
+        """
+        Concatenate stores with their rows in column order, i.e. as returned by `select` or `from_labels`.
+
+        Args:
+            stores (List[LabelStore]): Stores to concatenate.
+
+        Returns:
+            (LabelStore): Store of the images of all stores in the given order.
+        """
+        offsets = [np.zeros(1, dtype=np.int64)]
+        for s in stores:
+            offsets.append(s.offsets[1:] + offsets[-1][-1])
+        columns = {"offsets": np.concatenate(offsets)}
+        for k in "shapes", "cls", "bboxes", "fingerprints":
+            if all(getattr(s, k) is not None for s in stores):
+                columns[k] = np.concatenate([getattr(s, k) for s in stores])
+        if any(s.segments is not None for s in stores):  # stores without segments get empty segments
+            segments = [s.segments if s.segments is not None else np.zeros((0, 2), np.float32) for s in stores]
+            lengths = [
+                np.diff(s.segment_offsets) if s.segments is not None else np.zeros(len(s.cls), int) for s in stores
+            ]
+            columns["segments"] = np.concatenate(segments)
+            columns["segment_offsets"] = np.concatenate([[0], np.cumsum(np.concatenate(lengths))]).astype(np.int64)
+        keypoints = [s.keypoints for s in stores if s.keypoints is not None]
+        if keypoints:
+            shape = keypoints[0].shape[1:]
+            columns["keypoints"] = np.concatenate(
+                [s.keypoints if s.keypoints is not None else np.zeros((len(s.cls), *shape), np.float32) for s in stores]
+            )
+        return cls([f for s in stores for f in s.im_files], **columns)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a saved store with its columns as read-only memory maps.
+
+        Args:
+            path (str | Path): Cache directory written by `save`.
+
+        Returns:
+            store (LabelStore): The loaded store.
+            meta (Dict): Metadata saved with the store, i.e. 'version' and 'results'.
+        """
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        columns = {k: np.load(path / f"{k}.npy", mmap_mode="r") for k in cls.COLUMNS if (path / f"{k}.npy").exists()}
+        im_files = np.load(path / "im_files.npy").tobytes().decode().split("\0") if len(columns["shapes"]) else []
+        return cls(im_files, **columns), meta
+
+    def save(self, path, meta, prefix=""):
+        """
+        Save the columns as `.npy` files with metadata in a cache directory, replacing any existing cache.
+
+        Args:
+            path (str | Path): Cache directory, i.e. 'labels/train.cache'.
+            meta (Dict): JSON-serializable metadata, i.e. 'version' and scan results.
+            prefix (str): Prefix of log messages.
+        """
+        path = Path(path)
+        if not is_dir_writeable(path.parent):
+            LOGGER.warning(f"{prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, cache not saved.")
+            return
+        tmp = path.with_name(f"{path.name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        im_files = [self.im_files[i] for i in np.argsort(self.rows)]  # column order
+        np.save(tmp / "im_files.npy", np.frombuffer("\0".join(im_files).encode(), dtype=np.uint8))
+        for k in self.COLUMNS:
+            if getattr(self, k) is not None:
+                np.save(tmp / f"{k}.npy", np.ascontiguousarray(getattr(self, k)))
+        (tmp / "meta.json").write_text(json.dumps(meta))
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()  # remove a pickled *.cache file of an older version
+        tmp.rename(path)
+        LOGGER.info(f"{prefix}New cache created: {path}")
+
+    def __len__(self):
+        """Return the number of images."""
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        """
+        Return the label dictionary of an image with copies of its column slices, safe to modify by transforms.
+
+        Args:
+            index (int): Image index.
+
+        Returns:
+            (Dict): Label with keys 'im_file', 'shape', 'cls', 'bboxes', 'segments', 'keypoints', 'normalized' and
+                'bbox_format'.
+        """
+        r = self.rows[index]
+        a, b = self.offsets[r], self.offsets[r + 1]
+        if self.segments is not None:
+            so = self.segment_offsets[a : b + 1]
+            segments = [np.array(self.segments[s:e]) for s, e in zip(so[:-1], so[1:])]
+        else:
+            segments = []
+        return {
+            "im_file": self.im_files[index],
+            "shape": tuple(self.shapes[r].tolist()),
+            "cls": np.array(self.cls[a:b]),
+            "bboxes": np.array(self.bboxes[a:b]),
+            "segments": segments,
+            "keypoints": None if self.keypoints is None else np.array(self.keypoints[a:b]),
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def __iter__(self):
+        """Iterate over the label dictionaries of all images."""
+        return (self[i] for i in range(len(self)))
+
+    def subset(self, index):
+        """
+        Return a store of the given images in the given order, sharing the columns.
+
+        Args:
+            index (np.ndarray): Image indices, i.e. a permutation sorting images by aspect ratio.
+
+        Returns:
+            (LabelStore): Store of the selected images.
+        """
+        columns = {k: getattr(self, k) for k in self.COLUMNS}
+        return LabelStore([self.im_files[i] for i in index], rows=self.rows[index], **columns)
+
+    def select(self, index):
+        """
+        Return a store of the given images in the given order with their columns gathered into new arrays.
+
+        Args:
+            index (np.ndarray): Image indices.
+
+        Returns:
+            (LabelStore): Store of the selected images with rows in column order.
+        """
+        r = self.rows[np.asarray(index, dtype=np.int64)]
+        starts, counts = self.offsets[r], self.offsets[r + 1] - self.offsets[r]
+        instances = _ranges(starts, counts)
+        columns = {
+            "shapes": self.shapes[r],
+            "offsets": np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            "cls": self.cls[instances],
+            "bboxes": self.bboxes[instances],
+        }
+        if self.segments is not None:
+            so = self.segment_offsets
+            lengths = so[instances + 1] - so[instances]
+            columns["segments"] = self.segments[_ranges(so[instances], lengths)]
+            columns["segment_offsets"] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        if self.keypoints is not None:
+            columns["keypoints"] = self.keypoints[instances]
+        if self.fingerprints is not None:
+            columns["fingerprints"] = self.fingerprints[r]
+        return LabelStore([self.im_files[i] for i in index], **columns)
+
+    def filter_classes(self, include_class=None, single_cls=False):
+        """
+        Keep only the instances of the given classes and optionally merge all classes into class 0.
+
+        The filtered columns are held in memory, the saved cache keeps all instances.
+
+        Args:
+            include_class (List[int], optional): Classes to keep, all classes if None.
+            single_cls (bool): Whether to set the class of all instances to 0.
+        """
+        if include_class is not None:
+            keep = np.isin(self.cls[:, 0], include_class)
+            kept = np.concatenate([[0], np.cumsum(keep)])
+            self.offsets = kept[self.offsets]
+            if self.segments is not None:
+                lengths = np.diff(self.segment_offsets)
+                self.segments = self.segments[np.repeat(keep, lengths)]
+                self.segment_offsets = np.concatenate([[0], np.cumsum(lengths[keep])])
+            self.cls, self.bboxes = self.cls[keep], self.bboxes[keep]
+            if self.keypoints is not None:
+                self.keypoints = self.keypoints[keep]
+        if single_cls:
+            self.cls = np.zeros_like(self.cls)
+
+    def drop_segments(self):
+        """Remove all segments, i.e. for datasets mixing box and segment labels."""
+        self.segments = self.segment_offsets = None
+
+    def __getstate__(self):
+        """Return the state for pickling, with memory-mapped columns replaced by their file paths."""
+        state = self.__dict__.copy()
+        for k, v in state.items():
+            if isinstance(v, np.memmap) and v.filename:
+                state[k] = ("mmap", v.filename)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state, memory-mapping the columns again, i.e. in spawned DataLoader workers."""
+        for k, v in state.items():
+            if isinstance(v, tuple) and v[:1] == ("mmap",):
+                state[k] = np.load(v[1], mmap_mode="r")
+        self.__dict__.update(state)
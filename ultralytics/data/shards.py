@@ -0,0 +1,424 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import urllib.error
+import urllib.request
+from multiprocessing.pool import ThreadPool
+from pathlib import Path
+
+import cv2
+import numpy as np
+from torch.utils.data import Sampler
+
+from ultralytics.data.labels import LabelStore
+from ultralytics.data.utils import REDUCED_DECODE_FLAGS
+from ultralytics.utils import LOGGER, NUM_THREADS, TQDM
+
+SHARDS_VERSION = "1.0.0"  # version of the shard directory layout
+SHARD_FILE = "shard-{:05d}.bin"  # name of the shard files
+
+
+def is_shard_dir(path):
+    """Check whether a dataset path is a directory of shards written by `pack_shards`."""
+    return isinstance(path, (str, Path)) and (Path(path) / "shards.json").is_file()
+
+
+def is_shard_url(path):
+    """Check whether a dataset path is the URL of a shard directory, i.e. 'https://' or 'file://', which is streamed."""
+    return isinstance(path, str) and "://" in path
+
+
+def shuffle_buffer(items, size, rng):
+    """
+    Yield items in a random order by drawing them from a buffer of the next `size` items.
+
+    Args:
+        items (Iterable): Items in their original order, may be endless.
+        size (int): Number of buffered items, items are yielded in their original order if below 2.
+        rng (np.random.Generator): Random number generator.
+
+    Yields:
+        (Any): The shuffled items.
+    """
+    if size < 2:
+        yield from items
+        return
+    buffer = []
+    for x in items:
+        if len(buffer) < size:
+            buffer.append(x)
+            continue
+        j = rng.integers(size)
+        yield buffer[j]
+        buffer[j] = x
+    yield from (buffer[j] for j in rng.permutation(len(buffer)))
+
+
+def pack_shards(img_path, data, save_dir, task="detect", imgsz=None, shard_size=1024):
+    """
+    Pack the images and labels of a YOLO dataset into a few large shard files that are read sequentially.
+
+    Images are appended to shard files of about `shard_size` MB, either as their original encoded bytes or, with
+    `imgsz`, downscaled to a long side of `imgsz` as `BaseDataset.load_image` would and stored as raw BGR pixels that
+    need no decoding at the cost of larger shards. Labels are verified as for `YOLODataset` and saved as a `LabelStore`
+    in the 'labels' subdirectory. The shard directory replaces the image directory of a split in the dataset YAML,
+    i.e. 'train: shards/train'.
+
+    Args:
+        img_path (str | List[str]): Image directory or image list file, i.e. the 'train' path of a dataset.
+        data (Dict): Dataset dictionary with 'names', and 'kpt_shape' for pose datasets.
+        save_dir (str | Path): Shard directory to write.
+        task (str): Dataset task, 'segment' and 'pose' pack segments or keypoints.
+        imgsz (int, optional): Long side of raw images, images are stored with their original encoding if None.
+        shard_size (int): Approximate size of each shard file in MB.
+
+    Returns:
+        (Path): The shard directory.
+
+    Examples:
+        >>> from ultralytics.data.utils import check_det_dataset
+        >>> data = check_det_dataset("coco8.yaml")
+        >>> pack_shards(data["train"], data, "../datasets/coco8/shards/train", imgsz=640)
+    """
+    from ultralytics.data.dataset import YOLODataset
+
+    labels = YOLODataset(img_path=img_path, data=data, task=task, augment=False).labels
+    save_dir = Path(save_dir)
+
+    def load(i):
+        """Return the bytes and shape (h, w) of the stored version of image i."""
+        if imgsz is None:
+            return Path(labels.im_files[i]).read_bytes(), labels.shapes[labels.rows[i]]
+        im = cv2.imread(labels.im_files[i])  # BGR
+        if im is None:  # passed the header-only scan of the labels, but cannot be decoded
+            raise FileNotFoundError(f"Image Not Found {labels.im_files[i]}")
+        h0, w0 = im.shape[:2]
+        r = imgsz / max(h0, w0)
+        if r < 1:  # downscale only, smaller images are resized when loaded
+            w, h = min(math.ceil(w0 * r), imgsz), min(math.ceil(h0 * r), imgsz)
+            im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        return im.tobytes(), im.shape[:2]
+
+    n = len(labels)
+    writer = ShardWriter(save_dir, shard_size)
+    try:
+        with ThreadPool(NUM_THREADS) as pool:  # image reads overlap, shard writes stay sequential
+            for buf, shape in TQDM(pool.imap(load, range(n)), total=n, desc=f"Packing {n} images to {save_dir}"):
+                writer.write(buf, shape)
+        labels.save(save_dir / "labels", {"version": SHARDS_VERSION})
+        writer.close("encoded" if imgsz is None else "raw", imgsz=imgsz)
+    finally:
+        writer.file.close()  # no-op if closed, an interrupted directory has no metadata and is never read
+    LOGGER.info(f"Packed {n} images into {writer.shard + 1} shards in {save_dir}")
+    return save_dir
+
+
+class ShardWriter:
+    """
+    Write images one after another into the shard files of a new shard directory.
+
+    The metadata file is written last by `close`, so an interrupted write never leaves a directory that `is_shard_dir`
+    accepts.
+
+    Attributes:
+        path (Path): Shard directory.
+        limit (int): Approximate size of each shard file in bytes, a new shard is started when it would be exceeded.
+        index (List[Tuple[int, int, int, int, int]]): Shard, byte offset, byte size, height and width of each image.
+        shard (int): Index of the shard written to.
+        offset (int): Size of the shard written to in bytes.
+
+    Methods:
+        write: Appends an image to the current shard.
+        close: Writes the index and metadata that complete the shard directory.
+
+    Examples:
+        >>> writer = ShardWriter("path/to/shards")
+        >>> writer.write(cv2.imencode(".png", im)[1].tobytes(), im.shape)
+        >>> writer.close("encoded")
+    """
+
+    def __init__(self, path, shard_size=1024):
+        """
+        Create the shard directory and its first shard file.
+
+        Args:
+            path (str | Path): Shard directory, created if it does not exist.
+            shard_size (int): Approximate size of each shard file in MB.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / "shards.json").unlink(missing_ok=True)
+        self.limit = shard_size << 20
+        self.index = []
+        self.shard, self.offset = 0, 0
+        self.file = open(self.path / SHARD_FILE.format(self.shard), "wb")
+
+    def write(self, buf, shape):
+        """
+        Append an image to the current shard, starting a new shard if the current one is full.
+
+        Args:
+            buf (bytes): Encoded image, or raw BGR pixels of shape (h, w, 3).
+            shape (Tuple[int, int]): Image shape (h, w).
+        """
+        if self.offset and self.offset + len(buf) > self.limit:
+            self.file.close()
+            self.shard, self.offset = self.shard + 1, 0
+            self.file = open(self.path / SHARD_FILE.format(self.shard), "wb")
+        self.file.write(buf)
+        self.index.append((self.shard, self.offset, len(buf), *shape[:2]))
+        self.offset += len(buf)
+
+    def close(self, fmt, **meta):
+        """
+        Close the last shard and write the index and metadata.
+
+        Args:
+            fmt (str): Image format, 'encoded' for images decoded by `cv2.imdecode` or 'raw' for BGR pixels.
+            **meta (Any): Additional JSON-serializable metadata, i.e. 'imgsz'.
+        """
+        self.file.close()
+        np.save(self.path / "index.npy", np.array(self.index, dtype=np.int64).reshape(-1, 5))
+        meta = {"version": SHARDS_VERSION, "format": fmt, **meta, "shards": self.shard + 1, "images": len(self.index)}
+        (self.path / "shards.json").write_text(json.dumps(meta))
+
+
+class ShardReader:
+    """
+    Read packed images from shard files through memory maps.
+
+    Shards are mapped on first access and at most `max_open` stay mapped, which bounds the open file handles of each
+    DataLoader worker. Maps are not pickled, so workers map the shards they read themselves.
+
+    Attributes:
+        path (Path): Shard directory.
+        meta (Dict): Shard metadata with the 'format', 'encoded' or 'raw', and the 'imgsz' of raw images.
+        index (np.ndarray): Shard, byte offset, byte size, height and width of each image of shape (N, 5) in int64.
+        max_open (int): Maximum number of mapped shards.
+
+    Methods:
+        read: Returns a packed image as a BGR array.
+        decode: Returns the BGR array of the bytes of a packed image.
+        open: Maps all shards.
+
+    Examples:
+        >>> reader = ShardReader("../datasets/coco8/shards/train")
+        >>> im = reader.read(0)
+    """
+
+    def __init__(self, path, max_open=64):
+        """
+        Load the shard metadata and index.
+
+        Args:
+            path (str | Path): Shard directory written by a `ShardWriter`, i.e. by `pack_shards`.
+            max_open (int): Maximum number of mapped shards.
+        """
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "shards.json").read_text())
+        if self.meta["version"] != SHARDS_VERSION:
+            raise ValueError(f"Shards in {self.path} are version {self.meta['version']}, please pack them again.")
+        self.index = np.load(self.path / "index.npy")
+        self.max_open = max_open
+        self._maps = {}
+
+    def read(self, k, factor=1):
+        """
+        Read a packed image.
+
+        Args:
+            k (int): Index of the image in the shards.
+            factor (int): Factor 1, 2, 4 or 8 to downscale encoded JPEGs by while decoding, ignored for raw images.
+
+        Returns:
+            (np.ndarray): The BGR image of shape (H, W, 3).
+        """
+        shard, offset, size, h, w = self.index[k]
+        return self.decode(self.map(shard)[offset : offset + size], h, w, factor)
+
+    def decode(self, buf, h, w, factor=1):
+        """
+        Decode the bytes of a packed image.
+
+        Args:
+            buf (bytes | np.ndarray): Encoded image or raw BGR pixels.
+            h (int): Image height.
+            w (int): Image width.
+            factor (int): Factor 1, 2, 4 or 8 to downscale encoded JPEGs by while decoding, ignored for raw images.
+
+        Returns:
+            (np.ndarray): The BGR image of shape (H, W, 3).
+        """
+        buf = np.frombuffer(buf, dtype=np.uint8)
+        if self.meta["format"] == "raw":
+            return buf.reshape(h, w, 3).copy()  # augmentations modify images in place
+        return cv2.imdecode(buf, REDUCED_DECODE_FLAGS[factor])
+
+    def map(self, shard):
+        """Return the read-only memory map of a shard, mapping it if needed."""
+        if shard not in self._maps:
+            if len(self._maps) >= self.max_open:
+                self._maps.pop(next(iter(self._maps)))  # unmap the least recently mapped shard
+            self._maps[shard] = np.memmap(self.path / SHARD_FILE.format(shard), dtype=np.uint8, mode="r")
+        return self._maps[shard]
+
+    def open(self):
+        """Map up to `max_open` shards now, i.e. before forking DataLoader workers that then share the maps."""
+        for shard in range(min(self.meta["shards"], self.max_open)):
+            self.map(shard)
+
+    def __getstate__(self):
+        """Return the state for pickling without the shard memory maps."""
+        return {**self.__dict__, "_maps": {}}
+
+
+class ShardStream:
+    """
+    Read the images of shards front to back from a local shard directory or its URL, i.e. an object store.
+
+    Shard files are read as sequential streams one image after another, so datasets larger than local disk are read
+    without random access or local copies of the shards. Only the metadata, index and labels of a URL are downloaded,
+    to a temporary directory. Any URL `urllib` opens is supported, i.e. 'https://' or 'file://' as a local stand-in.
+
+    Attributes:
+        source (str): Shard directory or its URL.
+        url (bool): Whether the source is a URL.
+        path (Path): Local directory with the metadata, index and labels, the shard directory itself if local.
+        index (np.ndarray): Shard, byte offset, byte size, height and width of each image of shape (N, 5) in int64.
+        rows (List[np.ndarray]): Index rows of each shard in file order.
+
+    Methods:
+        open: Opens a file of the shard directory for sequential reading.
+        images: Yields the index row and bytes of every image of some shards.
+
+    Examples:
+        >>> stream = ShardStream("https://example.com/datasets/coco/shards/train")
+        >>> reader = ShardReader(stream.path)
+        >>> for k, buf in stream.images([3, 0]):
+        ...     im = reader.decode(buf, *stream.index[k, 3:])
+    """
+
+    def __init__(self, source):
+        """
+        Open a shard directory, downloading the metadata, index and labels of a URL.
+
+        Args:
+            source (str | Path): Shard directory written by `pack_shards`, or its URL.
+        """
+        self.source = str(source).rstrip("/")
+        self.url = is_shard_url(self.source)
+        if self.url:
+            self.path = (
+                Path(tempfile.gettempdir()) / f"ultralytics-{hashlib.sha256(self.source.encode()).hexdigest()[:16]}"
+            )
+            required = ["shards.json", "index.npy", "labels/meta.json", "labels/im_files.npy", "labels/shapes.npy"]
+            optional = [f"labels/{k}.npy" for k in LabelStore.COLUMNS if k != "shapes"]
+            for name in required + optional:
+                try:
+                    self.download(name)
+                except (FileNotFoundError, urllib.error.URLError):
+                    if name in required:
+                        raise
+        else:
+            self.path = Path(source)
+        self.index = np.load(self.path / "index.npy")
+        order = np.lexsort((self.index[:, 1], self.index[:, 0]))  # by shard, then offset
+        self.rows = np.split(order, np.cumsum(np.bincount(self.index[:, 0]))[:-1]) if len(order) else []
+
+    def open(self, name):
+        """Open a file of the shard directory for sequential reading."""
+        return urllib.request.urlopen(f"{self.source}/{name}") if self.url else open(self.path / name, "rb")
+
+    def download(self, name):
+        """Download a file of the shard directory of a URL to the same relative path in the local directory."""
+        f = self.path / name
+        f.parent.mkdir(parents=True, exist_ok=True)
+        tmp = f.with_name(f"{f.name}.tmp{os.getpid()}")
+        with self.open(name) as r:
+            tmp.write_bytes(r.read())
+        os.replace(tmp, f)  # atomic, other ranks may download the same files
+
+    def images(self, shards):
+        """
+        Read the images of some shards, one shard after another and each shard front to back.
+
+        Args:
+            shards (Iterable[int]): Shards to read, in order.
+
+        Yields:
+            (Tuple[int, bytes]): Index row and bytes of each image.
+        """
+        for shard in shards:
+            with self.open(SHARD_FILE.format(shard)) as f:
+                pos = 0
+                for k in self.rows[shard]:
+                    offset, size = self.index[k, 1:3].tolist()
+                    f.read(offset - pos)  # skip unindexed bytes, none in shards written by ShardWriter
+                    yield k, f.read(size)
+                    pos = offset + size
+
+
+class ShardSampler(Sampler):
+    """
+    Sampler shuffling the order of the shards and the order of the images within each shard.
+
+    Images are read shard by shard, so each worker reads from a few shards at a time instead of seeking across the
+    whole dataset, while every epoch still visits the images in a new order. With several replicas each rank takes a
+    contiguous block of the order, so ranks read different shards.
+
+    Attributes:
+        shards (np.ndarray): Shard of each dataset image.
+        shuffle (bool): Whether to shuffle, images are returned in dataset order otherwise.
+        seed (int): Random seed, identical on all ranks.
+        epoch (int): Epoch of the next order, advanced on every iteration and set by `set_epoch`.
+        num_replicas (int): Number of distributed ranks.
+        rank (int): Rank of this process.
+
+    Examples:
+        >>> sampler = ShardSampler(dataset.shards.index[dataset.labels.rows, 0])
+        >>> order = list(sampler)
+    """
+
+    def __init__(self, shards, shuffle=True, seed=0, num_replicas=1, rank=0):
+        """
+        Initialize the sampler.
+
+        Args:
+            shards (np.ndarray): Shard of each dataset image.
+            shuffle (bool): Whether to shuffle.
+            seed (int): Random seed, identical on all ranks.
+            num_replicas (int): Number of distributed ranks.
+            rank (int): Rank of this process.
+        """
+        self.shards = np.asarray(shards)
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+        self.num_replicas = num_replicas
+        self.rank = rank
+
+    def __len__(self):
+        """Return the number of images per rank and epoch."""
+        return math.ceil(len(self.shards) / self.num_replicas)
+
+    def set_epoch(self, epoch):
+        """Set the epoch of the next order, i.e. the same on all distributed ranks."""
+        self.epoch = epoch
+
+    def __iter__(self):
+        """Yield the image indices of this rank for one epoch."""
+        n = len(self.shards)
+        if self.shuffle:
+            rng = np.random.default_rng(self.seed + self.epoch)
+            shard_order = rng.permutation(self.shards.max() + 1 if n else 0)
+            order = np.lexsort((rng.random(n), shard_order[self.shards]))  # by shuffled shard, then randomly
+        else:
+            order = np.arange(n)
+        self.epoch += 1
+        k = len(self)
+        order = np.resize(order, k * self.num_replicas)  # pad by repeating the first images
+        return iter(order[self.rank * k : (self.rank + 1) * k].tolist())
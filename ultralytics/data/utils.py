@@ -7,7 +7,7 @@ import random
 import subprocess
 import time
 import zipfile
-from multiprocessing.pool import ThreadPool
+from multiprocessing.pool import Pool, ThreadPool
 from pathlib import Path
 from tarfile import is_tarfile
 
@@ -37,6 +37,12 @@ from ultralytics.utils.ops import segments2boxes
 HELP_URL = "See https://docs.ultralytics.com/datasets for dataset formatting guidance."
 IMG_FORMATS = {"bmp", "dng", "jpeg", "jpg", "mpo", "png", "tif", "tiff", "webp", "pfm", "heic"}  # image suffixes
 VID_FORMATS = {"asf", "avi", "gif", "m4v", "mkv", "mov", "mp4", "mpeg", "mpg", "ts", "wmv", "webm"}  # video suffixes
+REDUCED_DECODE_FLAGS = {  # cv2.imread flags decoding JPEGs downscaled by 1, 2, 4 or 8 in the DCT domain
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
 PIN_MEMORY = str(os.getenv("PIN_MEMORY", True)).lower() == "true"  # global pin_memory for dataloaders
 FORMATS_HELP_MSG = f"Supported formats are:\nimages: {IMG_FORMATS}\nvideos: {VID_FORMATS}"
 
@@ -55,6 +61,33 @@ def get_hash(paths):
     return h.hexdigest()  # return hash
 
 
+def file_fingerprints(files):
+    """
+    Return the size and modification time of files as cheap change fingerprints, read with parallel `os.stat` calls.
+
+    Args:
+        files (List[str]): File paths.
+
+    Returns:
+        (np.ndarray): Size in bytes and modification time in nanoseconds of each file of shape (N, 2) in int64, -1 for
+            missing files.
+
+    Examples:
+        >>> fingerprints = file_fingerprints(["images/im0.jpg", "labels/im0.txt"])
+    """
+
+    def stat(f):
+        """Return the size and modification time of a file, -1 if it does not exist."""
+        try:
+            s = os.stat(f)
+            return s.st_size, s.st_mtime_ns
+        except OSError:
+            return -1, -1
+
+    with ThreadPool(NUM_THREADS) as pool:  # stat calls release the GIL, threads hide file system latency
+        return np.array(pool.map(stat, files, chunksize=256), dtype=np.int64).reshape(-1, 2)
+
+
 def exif_size(img: Image.Image):
     """Returns exif-corrected PIL size."""
     s = img.size  # (width, height)
@@ -70,24 +103,80 @@ def exif_size(img: Image.Image):
     return s
 
 
+def probe_image(im_file, prefix="", decode=False):
+    """
+    Check an image and read its shape, by default from the image header only.
+
+    Opening an image with PIL only parses its header, so the default check reads the format, size and EXIF orientation
+    without decoding pixel data, which keeps dataset scans fast on network file systems. With `decode`, every image is
+    fully decoded to detect corrupt image data, and JPEG images missing their end-of-image marker are restored.
+
+    Args:
+        im_file (str): Image file path.
+        prefix (str): Prefix of warning messages.
+        decode (bool): Whether to fully decode the image and restore truncated JPEG images.
+
+    Returns:
+        shape (Tuple[int, int]): EXIF-corrected image shape (height, width).
+        msg (str): Warning message, empty if there is nothing to report.
+
+    Raises:
+        (AssertionError): If the image is smaller than 10 pixels or its format is not supported.
+        (OSError): If the image cannot be opened or decoded.
+    """
+    msg = ""
+    with Image.open(im_file) as im:
+        shape = exif_size(im)  # image size
+        shape = (shape[1], shape[0])  # hw
+        assert (shape[0] > 9) & (shape[1] > 9), f"image size {shape} <10 pixels"
+        assert im.format.lower() in IMG_FORMATS, f"invalid image format {im.format}. {FORMATS_HELP_MSG}"
+        if decode:
+            if im.format.lower() in {"jpg", "jpeg"}:
+                with open(im_file, "rb") as f:
+                    f.seek(-2, 2)
+                    if f.read() != b"\xff\xd9":  # corrupt JPEG
+                        ImageOps.exif_transpose(im).save(im_file, "JPEG", subsampling=0, quality=100)
+                        msg = f"{prefix}WARNING ⚠️ {im_file}: corrupt JPEG restored and saved"
+            im.load()  # decode pixel data
+    return shape, msg
+
+
+def imap_verify(func, iterable, total, workers=NUM_THREADS):
+    """
+    Apply a dataset verification function to all items in a process pool, yielding the results in order.
+
+    Items are sent to the workers in chunks of up to 64, enough to amortize inter-process communication, while keeping
+    at least 4 chunks per worker so results stream back steadily for progress bars and workers stay balanced. Small
+    jobs run in the calling process to skip the pool startup.
+
+    Args:
+        func (callable): Top-level verification function taking one item, i.e. `verify_image_label`.
+        iterable (Iterable): Items to verify.
+        total (int): Number of items.
+        workers (int): Maximum number of worker processes.
+
+    Yields:
+        (Any): Result of `func` for each item, in the order of `iterable`.
+
+    Examples:
+        >>> for result in imap_verify(verify_image, zip(samples, repeat(""), repeat(False)), len(samples)):
+        ...     pass
+    """
+    workers = min(workers, total // 16)  # 16 items per worker at least
+    if workers < 2:
+        yield from map(func, iterable)
+        return
+    with Pool(workers) as pool:  # verification is GIL-bound, processes scale with CPU cores
+        yield from pool.imap(func, iterable, chunksize=max(1, min(64, total // (4 * workers))))
+
+
 def verify_image(args):
     """Verify one image."""
-    (im_file, cls), prefix = args
+    (im_file, cls), prefix, decode = args
     # Number (found, corrupt), message
     nf, nc, msg = 0, 0, ""
     try:
-        im = Image.open(im_file)
-        im.verify()  # PIL verify
-        shape = exif_size(im)  # image size
-        shape = (shape[1], shape[0])  # hw
-        assert (shape[0] > 9) & (shape[1] > 9), f"image size {shape} <10 pixels"
-        assert im.format.lower() in IMG_FORMATS, f"Invalid image format {im.format}. {FORMATS_HELP_MSG}"
-        if im.format.lower() in {"jpg", "jpeg"}:
-            with open(im_file, "rb") as f:
-                f.seek(-2, 2)
-                if f.read() != b"\xff\xd9":  # corrupt JPEG
-                    ImageOps.exif_transpose(Image.open(im_file)).save(im_file, "JPEG", subsampling=0, quality=100)
-                    msg = f"{prefix}WARNING ⚠️ {im_file}: corrupt JPEG restored and saved"
+        _, msg = probe_image(im_file, prefix, decode)
         nf = 1
     except Exception as e:
         nc = 1
@@ -97,23 +186,12 @@ def verify_image(args):
 
 def verify_image_label(args):
     """Verify one image-label pair."""
-    im_file, lb_file, prefix, keypoint, num_cls, nkpt, ndim = args
+    im_file, lb_file, prefix, keypoint, num_cls, nkpt, ndim, decode = args
     # Number (missing, found, empty, corrupt), message, segments, keypoints
     nm, nf, ne, nc, msg, segments, keypoints = 0, 0, 0, 0, "", [], None
     try:
         # Verify images
-        im = Image.open(im_file)
-        im.verify()  # PIL verify
-        shape = exif_size(im)  # image size
-        shape = (shape[1], shape[0])  # hw
-        assert (shape[0] > 9) & (shape[1] > 9), f"image size {shape} <10 pixels"
-        assert im.format.lower() in IMG_FORMATS, f"invalid image format {im.format}. {FORMATS_HELP_MSG}"
-        if im.format.lower() in {"jpg", "jpeg"}:
-            with open(im_file, "rb") as f:
-                f.seek(-2, 2)
-                if f.read() != b"\xff\xd9":  # corrupt JPEG
-                    ImageOps.exif_transpose(Image.open(im_file)).save(im_file, "JPEG", subsampling=0, quality=100)
-                    msg = f"{prefix}WARNING ⚠️ {im_file}: corrupt JPEG restored and saved"
+        shape, msg = probe_image(im_file, prefix, decode)
 
         # Verify labels
         if os.path.isfile(lb_file):
@@ -308,6 +386,8 @@ def check_det_dataset(dataset, autodownload=True):
     for k in "train", "val", "test", "minival":
         if data.get(k):  # prepend path
             if isinstance(data[k], str):
+                if "://" in data[k]:  # URL of streamed shards
+                    continue
                 x = (path / data[k]).resolve()
                 if not x.exists() and data[k].startswith("../"):
                     x = (path / data[k][3:]).resolve()
@@ -318,7 +398,7 @@ def check_det_dataset(dataset, autodownload=True):
     # Parse YAML
     val, s = (data.get(x) for x in ("val", "download"))
     if val:
-        val = [Path(x).resolve() for x in (val if isinstance(val, list) else [val])]  # val path
+        val = [Path(x).resolve() for x in (val if isinstance(val, list) else [val]) if "://" not in x]  # val path
         if not all(x.exists() for x in val):
             name = clean_url(dataset)  # dataset name with URL auth stripped
             m = f"\nDataset '{name}' images not found ⚠️, missing path '{[x for x in val if not x.exists()][0]}'"
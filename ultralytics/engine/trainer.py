@@ -22,6 +22,7 @@ from torch import distributed as dist
 from torch import nn, optim
 
 from ultralytics.cfg import get_cfg, get_save_dir
+from ultralytics.data.build import DevicePrefetcher
 from ultralytics.data.utils import check_cls_dataset, check_det_dataset
 from ultralytics.nn.tasks import attempt_load_one_weight, attempt_load_weights
 from ultralytics.utils import (
@@ -183,9 +184,6 @@ class BaseTrainer:
         # Run subprocess if DDP training, else train normally
         if world_size > 1 and "LOCAL_RANK" not in os.environ:
             # Argument checks
-            if self.args.rect:
-                LOGGER.warning("WARNING ⚠️ 'rect=True' is incompatible with Multi-GPU training, setting 'rect=False'")
-                self.args.rect = False
             if self.args.batch < 1.0:
                 LOGGER.warning(
                     "WARNING ⚠️ 'batch<1' for AutoBatch is incompatible with Multi-GPU training, setting "
@@ -347,9 +345,10 @@ class BaseTrainer:
                 self.scheduler.step()
 
             self.model.train()
-            if RANK != -1:
+            if RANK != -1 and hasattr(self.train_loader.sampler, "set_epoch"):  # streamed datasets have no sampler
                 self.train_loader.sampler.set_epoch(epoch)
-            pbar = enumerate(self.train_loader)
+            loader = DevicePrefetcher(self.train_loader, self.device)  # next batch copied to the GPU during each step
+            pbar = enumerate(loader)
             # Update dataloader attributes (optional)
             if epoch == (self.epochs - self.args.close_mosaic):
                 self._close_dataloader_mosaic()
@@ -357,7 +356,7 @@ class BaseTrainer:
 
             if RANK in {-1, 0}:
                 LOGGER.info(self.progress_string())
-                pbar = TQDM(enumerate(self.train_loader), total=nb)
+                pbar = TQDM(enumerate(loader), total=nb)
             self.tloss = None
             for i, batch in pbar:
                 self.run_callbacks("on_train_batch_start")
@@ -8,10 +8,11 @@ import numpy as np
 import torch.nn as nn
 
 from ultralytics.data import build_dataloader, build_yolo_dataset
+from ultralytics.data.labels import LabelStore
 from ultralytics.engine.trainer import BaseTrainer
 from ultralytics.models import yolo
 from ultralytics.nn.tasks import DetectionModel
-from ultralytics.utils import LOGGER, RANK
+from ultralytics.utils import RANK
 from ultralytics.utils.plotting import plot_images, plot_labels, plot_results
 from ultralytics.utils.torch_utils import de_parallel, torch_distributed_zero_first
 
@@ -47,12 +48,9 @@ class DetectionTrainer(BaseTrainer):
         assert mode in {"train", "val"}, f"Mode must be 'train' or 'val', not {mode}."
         with torch_distributed_zero_first(rank):  # init dataset *.cache only once if DDP
             dataset = self.build_dataset(dataset_path, mode, batch_size)
-        shuffle = mode == "train"
-        if getattr(dataset, "rect", False) and shuffle:
-            LOGGER.warning("WARNING ⚠️ 'rect=True' is incompatible with DataLoader shuffle, setting shuffle=False")
-            shuffle = False
+        shuffle = mode == "train"  # rect datasets are shuffled in aspect ratio buckets
         workers = self.args.workers if mode == "train" else self.args.workers * 2
-        return build_dataloader(dataset, batch_size, workers, shuffle, rank)  # return dataloader
+        return build_dataloader(dataset, batch_size, workers, shuffle, rank, self.args.prefetch)  # return dataloader
 
     def preprocess_batch(self, batch):
         """Preprocesses a batch of images by scaling and converting to float."""
@@ -138,13 +136,21 @@ class DetectionTrainer(BaseTrainer):
 
     def plot_training_labels(self):
         """Create a labeled training plot of the YOLO model."""
-        boxes = np.concatenate([lb["bboxes"] for lb in self.train_loader.dataset.labels], 0)
-        cls = np.concatenate([lb["cls"] for lb in self.train_loader.dataset.labels], 0)
+        labels = self.train_loader.dataset.labels
+        if isinstance(labels, LabelStore):  # all instances are already in flat columns
+            boxes, cls = labels.bboxes, labels.cls
+        else:
+            boxes = np.concatenate([lb["bboxes"] for lb in labels], 0)
+            cls = np.concatenate([lb["cls"] for lb in labels], 0)
         plot_labels(boxes, cls.squeeze(), names=self.data["names"], save_dir=self.save_dir, on_plot=self.on_plot)
 
     def auto_batch(self):
         """Get batch size by calculating memory occupation of model."""
         train_dataset = self.build_dataset(self.trainset, mode="train", batch=16)
         # 4 for mosaic augmentation
-        max_num_obj = max(len(l["cls"]) for l in train_dataset.labels) * 4
+        labels = train_dataset.labels
+        if isinstance(labels, LabelStore):
+            max_num_obj = int(np.diff(labels.offsets).max(initial=0)) * 4
+        else:
+            max_num_obj = max(len(lb["cls"]) for lb in labels) * 4
         return super().auto_batch(max_num_obj)
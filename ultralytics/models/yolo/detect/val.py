@@ -241,7 +241,7 @@ class DetectionValidator(BaseValidator):
     def get_dataloader(self, dataset_path, batch_size):
         """Construct and return dataloader."""
         dataset = self.build_dataset(dataset_path, batch=batch_size, mode="val")
-        return build_dataloader(dataset, batch_size, self.args.workers, shuffle=False, rank=-1)  # return dataloader
+        return build_dataloader(dataset, batch_size, self.args.workers, False, -1, self.args.prefetch)
 
     def plot_val_samples(self, batch, ni):
         """Plot validation image samples."""
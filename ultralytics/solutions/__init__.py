@@ -8,6 +8,7 @@ from .object_counter import ObjectCounter
 from .parking_management import ParkingManagement, ParkingPtsSelection
 from .queue_management import QueueManager
 from .region_counter import RegionCounter
+from .runner import SolutionRunner
 from .speed_estimation import SpeedEstimator
 from .streamlit_inference import inference
 
@@ -23,4 +24,5 @@ __all__ = (
     "Analytics",
     "inference",
     "RegionCounter",
+    "SolutionRunner",
 )
@@ -63,7 +63,8 @@ class AIGym(BaseSolution):
             im0 (ndarray): Input image for processing.
 
         Returns:
-            (ndarray): Processed image with annotations for workout monitoring.
+            (ndarray | SolutionResults): Processed image with annotations for workout monitoring, or the counts,
+                angles and stages of each person if `render=False`.
 
         Examples:
             >>> gym = AIGym()
@@ -71,7 +72,8 @@ class AIGym(BaseSolution):
             >>> processed_image = gym.monitor(image)
         """
         # Extract tracks
-        tracks = self.model.track(source=im0, persist=True, classes=self.CFG["classes"])[0]
+        self.extract_tracks(im0)
+        tracks = self.tracks[0]
 
         if tracks.boxes.id is not None:
             # Extract and check keypoints
@@ -82,14 +84,14 @@ class AIGym(BaseSolution):
                 self.stage += ["-"] * new_human
 
             # Initialize annotator
-            self.annotator = Annotator(im0, line_width=self.line_width)
+            if self.render:
+                self.annotator = Annotator(im0, line_width=self.line_width)
 
             # Enumerate over keypoints
             for ind, k in enumerate(reversed(tracks.keypoints.data)):
                 # Get keypoints and estimate the angle
                 kpts = [k[int(self.kpts[i])].cpu() for i in range(3)]
-                self.angle[ind] = self.annotator.estimate_pose_angle(*kpts)
-                im0 = self.annotator.draw_specific_points(k, self.kpts, radius=self.line_width * 3)
+                self.angle[ind] = Annotator.estimate_pose_angle(*kpts)
 
                 # Determine stage and count logic based on angle thresholds
                 if self.angle[ind] < self.down_angle:
@@ -99,13 +101,15 @@ class AIGym(BaseSolution):
                 elif self.angle[ind] > self.up_angle:
                     self.stage[ind] = "up"
 
-                # Display angle, count, and stage text
-                self.annotator.plot_angle_and_count_and_stage(
-                    angle_text=self.angle[ind],  # angle text for display
-                    count_text=self.count[ind],  # count text for workouts
-                    stage_text=self.stage[ind],  # stage position text
-                    center_kpt=k[int(self.kpts[1])],  # center keypoint for display
-                )
+                if self.render:
+                    im0 = self.annotator.draw_specific_points(k, self.kpts, radius=self.line_width * 3)
 
-        self.display_output(im0)  # Display output image, if environment support display
-        return im0  # return an image for writing or further usage
+                    # Display angle, count, and stage text
+                    self.annotator.plot_angle_and_count_and_stage(
+                        angle_text=self.angle[ind],  # angle text for display
+                        count_text=self.count[ind],  # count text for workouts
+                        stage_text=self.stage[ind],  # stage position text
+                        center_kpt=k[int(self.kpts[1])],  # center keypoint for display
+                    )
+
+        return self.output(im0, workout_count=self.count, workout_angle=self.angle, workout_stage=self.stage)
@@ -3,20 +3,284 @@
 from itertools import cycle
 
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 from ultralytics.solutions.solutions import BaseSolution  # Import a parent class
 
 
+def hex2bgr(h):
+    """Convert a hex color code, i.e. '#DD00BA', to a BGR tuple for OpenCV drawing."""
+    return tuple(int(h.lstrip("#")[i : i + 2], 16) for i in (4, 2, 0))
+
+
+class SeriesBuffer:
+    """
+    Fixed-size ring buffer of time series sharing one x-axis, i.e. per-class counts per frame.
+
+    Appending a data point writes one column of preallocated arrays, so the cost does not grow with the history length
+    and no arrays are reallocated per frame.
+
+    Attributes:
+        size (int): Maximum number of data points kept per series.
+        x (np.ndarray): Ring buffer of x values, i.e. frame numbers.
+        y (Dict[str, np.ndarray]): Ring buffer of y values per series name.
+        head (int): Index the next data point is written to.
+        count (int): Number of stored data points.
+
+    Methods:
+        append: Appends one data point to all series.
+        data: Returns the stored data points in chronological order.
+
+    Examples:
+        >>> series = SeriesBuffer(size=3)
+        >>> for frame in range(5):
+        ...     series.append(frame, {"person": frame})
+        >>> series.data()
+        (array([2., 3., 4.]), {'person': array([2., 3., 4.])})
+    """
+
+    def __init__(self, size=45):
+        """
+        Initialize an empty ring buffer.
+
+        Args:
+            size (int): Maximum number of data points kept per series.
+        """
+        self.size = size
+        self.x = np.zeros(size)
+        self.y = {}
+        self.head = 0
+        self.count = 0
+
+    def append(self, x, values):
+        """
+        Append one data point to all series, series missing from `values` get 0 and new series start at 0.
+
+        Args:
+            x (float): x value of the data point, i.e. the frame number.
+            values (Dict[str, float]): y value of each series.
+        """
+        for key in values:
+            if key not in self.y:
+                self.y[key] = np.zeros(self.size)
+        self.x[self.head] = x
+        for key, y in self.y.items():
+            y[self.head] = values.get(key, 0)
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def data(self):
+        """
+        Return the stored data points in chronological order.
+
+        Returns:
+            x (np.ndarray): x values of shape (N,).
+            y (Dict[str, np.ndarray]): y values of shape (N,) per series name.
+        """
+        idx = (self.head - self.count + np.arange(self.count)) % self.size
+        return self.x[idx], {key: y[idx] for key, y in self.y.items()}
+
+
+class ChartRenderer:
+    """
+    Lightweight line, area, bar and pie chart renderer drawing directly with OpenCV.
+
+    The static parts of the chart, i.e. background, title and axis labels, are drawn once and cached, so each update
+    only copies the cached frame and draws the data and axis ticks instead of re-rendering a Matplotlib figure.
+
+    Attributes:
+        type (str): Chart type, one of 'line', 'area', 'bar' or 'pie'.
+        size (Tuple[int, int]): Output image width and height.
+        fg_color (Tuple[int, int, int]): BGR color of text and axes.
+        line_width (int): Width of plotted lines.
+        plot_box (Tuple[int, int, int, int]): Plot area (x0, y0, x1, y1) in pixels.
+        background (np.ndarray): Cached chart image with all static elements.
+
+    Methods:
+        render: Draws the chart for the given data and returns the image.
+
+    Examples:
+        >>> renderer = ChartRenderer("line", title="Ultralytics Solutions", x_label="Frame#", y_label="Total Counts")
+        >>> im = renderer.render(x=np.arange(10), series={"Counts": np.arange(10)}, colors={"Counts": (104, 0, 123)})
+    """
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+
+    def __init__(
+        self,
+        type="line",
+        size=(1920, 1080),
+        title="",
+        x_label="",
+        y_label="",
+        bg_color="#F3F3F3",
+        fg_color="#111E68",
+        line_width=2,
+        fontsize=25,
+    ):
+        """
+        Initialize the renderer and draw the static chart elements.
+
+        Args:
+            type (str): Chart type, one of 'line', 'area', 'bar' or 'pie'.
+            size (Tuple[int, int]): Output image width and height.
+            title (str): Chart title.
+            x_label (str): x-axis label.
+            y_label (str): y-axis label.
+            bg_color (str): Hex background color.
+            fg_color (str): Hex color of text and axes.
+            line_width (int): Width of plotted lines.
+            fontsize (int): Font size, text is scaled relative to the default size of 25.
+        """
+        self.type = type
+        self.size = size
+        self.fg_color = hex2bgr(fg_color)
+        self.line_width = line_width
+        self.scale = fontsize / 25  # font scale relative to the default font size
+        w, h = size
+        self.plot_box = (int(w * 0.08), int(h * 0.1), int(w * 0.96), int(h * 0.88))
+
+        self.background = np.full((h, w, 3), hex2bgr(bg_color), dtype=np.uint8)
+        self._text(self.background, title, (w // 2, int(h * 0.06)), 1.4 * self.scale, 2, align="center")
+        if type != "pie":
+            x0, y0, x1, y1 = self.plot_box
+            cv2.rectangle(self.background, (x0, y0), (x1, y1), hex2bgr("#F0F0F0"), -1)
+            cv2.rectangle(self.background, (x0, y0), (x1, y1), self.fg_color, 1)
+            self._text(self.background, x_label, ((x0 + x1) // 2, int(h * 0.97)), 1.1 * self.scale, 2, align="center")
+            (tw, th), _ = cv2.getTextSize(y_label, self.font, 1.1 * self.scale, 2)
+            label = np.zeros((th + 10, tw + 4, 3), dtype=np.uint8)
+            cv2.putText(label, y_label, (2, th + 2), self.font, 1.1 * self.scale, (255, 255, 255), 2, cv2.LINE_AA)
+            label = cv2.rotate(label, cv2.ROTATE_90_COUNTERCLOCKWISE)  # vertical y-axis label
+            ly, lx = ((y0 + y1) - label.shape[0]) // 2, int(w * 0.01)
+            roi = self.background[ly : ly + label.shape[0], lx : lx + label.shape[1]]
+            roi[label[..., 0] > 127] = self.fg_color
+
+    def _text(self, im, text, org, scale=0.8, thickness=2, align="left"):
+        """Draw text with its baseline at `org`, starting at, centered on or ending at its x coordinate by `align`."""
+        if align != "left":
+            (tw, _), _ = cv2.getTextSize(text, self.font, scale, thickness)
+            org = (org[0] - (tw // 2 if align == "center" else tw), org[1])
+        cv2.putText(im, text, org, self.font, scale, self.fg_color, thickness, cv2.LINE_AA)
+
+    def _legend(self, im, labels, colors, org):
+        """Draw a legend of colored squares and labels starting at `org`."""
+        x, y = org
+        for label, color in zip(labels, colors):
+            cv2.rectangle(im, (x, y), (x + 24, y + 24), color, -1)
+            self._text(im, label, (x + 34, y + 20), 0.7 * self.scale, 2)
+            y += 36
+
+    @staticmethod
+    def _ticks(vmax, n=5):
+        """Return about `n` evenly spaced ticks with a round step from 0 to at least `vmax`."""
+        vmax = max(vmax, 1)
+        magnitude = 10 ** np.floor(np.log10(vmax / n))
+        step = magnitude * next(s for s in (1, 2, 2.5, 5, 10) if s * magnitude >= vmax / n)
+        return np.arange(0, vmax + step, step)
+
+    def render(self, x=None, series=None, colors=None, counts=None):
+        """
+        Draw the chart for the given data onto a copy of the cached background.
+
+        Args:
+            x (np.ndarray, optional): x values of line and area charts, i.e. frame numbers.
+            series (Dict[str, np.ndarray], optional): y values per series name for line and area charts.
+            colors (Dict[str, Tuple[int, int, int]]): BGR color per series or class name.
+            counts (Dict[str, int], optional): Current value per class name for bar and pie charts.
+
+        Returns:
+            (np.ndarray): Chart image of shape (height, width, 3).
+        """
+        im = self.background.copy()
+        if self.type in {"line", "area"}:
+            self._draw_series(im, x, series, colors)
+        elif self.type == "bar":
+            self._draw_bars(im, counts, colors)
+        elif self.type == "pie":
+            self._draw_pie(im, counts, colors)
+        return im
+
+    def _y_axis(self, im, vmax):
+        """Draw y-axis ticks and grid lines and return the y-axis maximum."""
+        x0, y0, x1, y1 = self.plot_box
+        ticks = self._ticks(vmax)
+        for t in ticks:
+            y = int(y1 - t / ticks[-1] * (y1 - y0))
+            cv2.line(im, (x0, y), (x1, y), (220, 220, 220), 1)
+            self._text(im, f"{t:g}", (x0 - 12, y + 8), 0.6 * self.scale, 1, align="right")
+        return ticks[-1]
+
+    def _draw_series(self, im, x, series, colors):
+        """Draw line or area series with shared x values."""
+        if x is None or not len(x):
+            return
+        x0, y0, x1, y1 = self.plot_box
+        ymax = self._y_axis(im, max((float(y.max()) for y in series.values()), default=1))
+        xmin, xmax = float(x[0]), float(x[-1])
+        px = (x0 + (x - xmin) / max(xmax - xmin, 1) * (x1 - x0)).astype(np.int32)
+        for t in np.linspace(xmin, xmax, min(len(x), 10)):  # x-axis ticks
+            xt = int(x0 + (t - xmin) / max(xmax - xmin, 1) * (x1 - x0))
+            self._text(im, f"{t:.0f}", (xt, y1 + int(30 * self.scale)), 0.6 * self.scale, 1, align="center")
+
+        lines = {k: np.stack([px, (y1 - y / ymax * (y1 - y0)).astype(np.int32)], 1) for k, y in series.items()}
+        if self.type == "area":  # fill all areas on an overlay of the plot area and blend once
+            roi = im[y0 : y1 + 1, x0 : x1 + 1]
+            overlay = roi.copy()
+            for k, pts in lines.items():
+                area = np.concatenate([pts, [[px[-1], y1], [px[0], y1]]]) - (x0, y0)
+                cv2.fillPoly(overlay, [area.astype(np.int32)], colors[k])
+            roi[:] = cv2.addWeighted(overlay, 0.7, roi, 0.3, 0)
+        marker = self.line_width * 3
+        for k, pts in lines.items():
+            cv2.polylines(im, [pts.reshape(-1, 1, 2)], False, colors[k], self.line_width, cv2.LINE_AA)
+            for p in pts:
+                cv2.circle(im, tuple(p.tolist()), marker, colors[k], -1, cv2.LINE_AA)
+        self._legend(
+            im,
+            [f"{k} Data Points" if self.type == "area" else k for k in lines],
+            list(colors.values()),
+            (x0 + 20, y0 + 20),
+        )
+
+    def _draw_bars(self, im, counts, colors):
+        """Draw one bar per class with its count on top."""
+        x0, y0, x1, y1 = self.plot_box
+        ymax = self._y_axis(im, max(counts.values(), default=1))
+        n = max(len(counts), 1)
+        slot = (x1 - x0) / n
+        for i, (label, count) in enumerate(counts.items()):
+            bx0, bx1 = int(x0 + slot * (i + 0.2)), int(x0 + slot * (i + 0.8))
+            by = int(y1 - count / ymax * (y1 - y0))
+            cv2.rectangle(im, (bx0, by), (bx1, y1), colors[label], -1)
+            self._text(im, str(count), ((bx0 + bx1) // 2, by - 10), 0.8 * self.scale, 2, align="center")
+            self._text(im, label, ((bx0 + bx1) // 2, y1 + int(30 * self.scale)), 0.7 * self.scale, 2, align="center")
+        self._legend(im, list(counts), [colors[k] for k in counts], (x0 + 20, y0 + 20))
+
+    def _draw_pie(self, im, counts, colors):
+        """Draw a pie chart starting at the top, counterclockwise, with a legend of class percentages."""
+        total = sum(counts.values())
+        if not total:
+            return
+        w, h = self.size
+        center, radius = (int(w * 0.4), int(h * 0.52)), int(h * 0.36)
+        start = 0.0
+        for label, count in counts.items():
+            end = start + count / total * 360
+            cv2.ellipse(im, center, (radius, radius), 0, -90 - end, -90 - start, colors[label], -1, cv2.LINE_AA)
+            start = end
+        labels = [f"{k} ({v / total * 100:.1f}%)" for k, v in counts.items()]
+        self._text(im, "Classes", (int(w * 0.75), int(h * 0.3)), 0.8 * self.scale, 2)
+        self._legend(im, labels, [colors[k] for k in counts], (int(w * 0.75), int(h * 0.33)))
+
+
 class Analytics(BaseSolution):
     """
     A class for creating and updating various types of charts for visual analytics.
 
     This class extends BaseSolution to provide functionality for generating line, bar, pie, and area charts
-    based on object detection and tracking data.
+    based on object detection and tracking data. Counts are kept in a fixed-size ring buffer and charts are drawn
+    directly with OpenCV, so analytics keep up with the stream frame rate. In headless mode (`render=False`) no charts
+    are drawn and the per-frame counts and buffered series are returned instead.
 
     Attributes:
         type (str): The type of analytics chart to generate ('line', 'bar', 'pie', or 'area').
@@ -28,15 +292,15 @@ class Analytics(BaseSolution):
         max_points (int): Maximum number of data points to display on the chart.
         fontsize (int): Font size for text display.
         color_cycle (cycle): Cyclic iterator for chart colors.
+        color_mapping (Dict[str, Tuple[int, int, int]]): BGR chart color of each series or class.
         total_counts (int): Total count of detected objects (used for line charts).
         clswise_count (Dict[str, int]): Dictionary for class-wise object counts.
-        fig (Figure): Matplotlib figure object for the chart.
-        ax (Axes): Matplotlib axes object for the chart.
-        canvas (FigureCanvas): Canvas for rendering the chart.
+        series (SeriesBuffer): Ring buffer of the counts of the last `max_points` frames.
+        chart (ChartRenderer | None): Renderer drawing the chart, None in headless mode.
 
     Methods:
         process_data: Processes image data and updates the chart.
-        update_graph: Updates the chart with new data points.
+        update_graph: Draws the chart with the current data.
 
     Examples:
         >>> analytics = Analytics(analytics_type="line")
@@ -59,29 +323,29 @@ class Analytics(BaseSolution):
         self.title = "Ultralytics Solutions"  # window name
         self.max_points = 45  # maximum points to be drawn on window
         self.fontsize = 25  # text font size for display
-        figsize = (19.2, 10.8)  # Set output image size 1920 * 1080
         self.color_cycle = cycle(["#DD00BA", "#042AFF", "#FF4447", "#7D24FF", "#BD00FF"])
+        self.color_mapping = {"Counts": hex2bgr("#7b0068")}  # Pink color for the single line chart
 
         self.total_counts = 0  # count variable for storing total counts i.e. for line
         self.clswise_count = {}  # dictionary for class-wise counts
-
-        # Ensure line and area chart
-        if self.type in {"line", "area"}:
-            self.lines = {}
-            self.fig = Figure(facecolor=self.bg_color, figsize=figsize)
-            self.canvas = FigureCanvas(self.fig)  # Set common axis properties
-            self.ax = self.fig.add_subplot(111, facecolor=self.bg_color)
-            if self.type == "line":
-                (self.line,) = self.ax.plot([], [], color="cyan", linewidth=self.line_width)
-        elif self.type in {"bar", "pie"}:
-            # Initialize bar or pie plot
-            self.fig, self.ax = plt.subplots(figsize=figsize, facecolor=self.bg_color)
-            self.canvas = FigureCanvas(self.fig)  # Set common axis properties
-            self.ax.set_facecolor(self.bg_color)
-            self.color_mapping = {}
-
-            if self.type == "pie":  # Ensure pie chart is circular
-                self.ax.axis("equal")
+        self.series = SeriesBuffer(self.max_points)
+
+        # Ensure charts are only created when rendering, with a fixed output image size 1920 * 1080
+        self.chart = None
+        if self.render:
+            if self.type not in {"line", "area", "bar", "pie"}:
+                raise ModuleNotFoundError(f"{self.type} chart is not supported ❌")
+            self.chart = ChartRenderer(
+                self.type,
+                size=(1920, 1080),
+                title=self.title,
+                x_label=self.x_label,
+                y_label=self.y_label,
+                bg_color=self.bg_color,
+                fg_color=self.fg_color,
+                line_width=self.line_width,
+                fontsize=self.fontsize,
+            )
 
     def process_data(self, im0, frame_number):
         """
@@ -92,7 +356,8 @@ class Analytics(BaseSolution):
             frame_number (int): Video frame number for plotting the data.
 
         Returns:
-            (np.ndarray): Processed image with updated analytics chart.
+            (np.ndarray | SolutionResults): Processed image with updated analytics chart, or the counts of the frame
+                and the buffered count series if `render=False`.
 
         Raises:
             ModuleNotFoundError: If an unsupported chart type is specified.
@@ -105,143 +370,55 @@ class Analytics(BaseSolution):
         self.extract_tracks(im0)  # Extract tracks
 
         if self.type == "line":
-            for _ in self.boxes:
-                self.total_counts += 1
-            im0 = self.update_graph(frame_number=frame_number)
-            self.total_counts = 0
+            self.total_counts = len(self.boxes)
+            counts = {"Counts": self.total_counts}
         elif self.type in {"pie", "bar", "area"}:
             self.clswise_count = {}
-            for box, cls in zip(self.boxes, self.clss):
-                if self.names[int(cls)] in self.clswise_count:
-                    self.clswise_count[self.names[int(cls)]] += 1
-                else:
-                    self.clswise_count[self.names[int(cls)]] = 1
-            im0 = self.update_graph(frame_number=frame_number, count_dict=self.clswise_count, plot=self.type)
+            for cls in self.clss:
+                name = self.names[int(cls)]
+                self.clswise_count[name] = self.clswise_count.get(name, 0) + 1
+            counts = self.clswise_count
         else:
             raise ModuleNotFoundError(f"{self.type} chart is not supported ❌")
-        return im0
+
+        if self.render:
+            return self.update_graph(frame_number=frame_number, count_dict=counts, plot=self.type)
+        self.series.append(frame_number, counts)
+        x, y = self.series.data()
+        return self.output(
+            im0, analytics=counts, analytics_series={"frame": x.tolist(), **{k: v.tolist() for k, v in y.items()}}
+        )
 
     def update_graph(self, frame_number, count_dict=None, plot="line"):
         """
-        Updates the graph with new data for single or multiple classes.
+        Appends the counts of a frame to the series and draws the chart, line and area charts plot the buffered series.
 
         Args:
-            frame_number (int): The current frame number.
+            frame_number (int): The current frame number, the x value of the appended counts.
             count_dict (Dict[str, int] | None): Dictionary with class names as keys and counts as values for multiple
-                classes. If None, updates a single line graph.
+                classes. If None, appends the total counts to the single line graph.
             plot (str): Type of the plot. Options are 'line', 'bar', 'pie', or 'area'.
 
         Returns:
             (np.ndarray): Updated image containing the graph.
 
         Examples:
-            >>> analytics = Analytics()
+            >>> analytics = Analytics(analytics_type="bar")
             >>> frame_number = 10
             >>> count_dict = {"person": 5, "car": 3}
             >>> updated_image = analytics.update_graph(frame_number, count_dict, plot="bar")
         """
-        if count_dict is None:
-            # Single line update
-            x_data = np.append(self.line.get_xdata(), float(frame_number))
-            y_data = np.append(self.line.get_ydata(), float(self.total_counts))
-
-            if len(x_data) > self.max_points:
-                x_data, y_data = x_data[-self.max_points :], y_data[-self.max_points :]
-
-            self.line.set_data(x_data, y_data)
-            self.line.set_label("Counts")
-            self.line.set_color("#7b0068")  # Pink color
-            self.line.set_marker("*")
-            self.line.set_markersize(self.line_width * 5)
+        self.series.append(frame_number, {"Counts": self.total_counts} if count_dict is None else count_dict)
+        for label in count_dict or {}:  # Map labels to colors
+            if label not in self.color_mapping:
+                self.color_mapping[label] = hex2bgr(next(self.color_cycle))
+        if plot in {"line", "area"}:
+            x, series = self.series.data()
+            if plot == "line":
+                series = {"Counts": series.get("Counts", np.zeros_like(x))}
+            im0 = self.chart.render(x=x, series=series, colors={k: self.color_mapping[k] for k in series})
         else:
-            labels = list(count_dict.keys())
-            counts = list(count_dict.values())
-            if plot == "area":
-                color_cycle = cycle(["#DD00BA", "#042AFF", "#FF4447", "#7D24FF", "#BD00FF"])
-                # Multiple lines or area update
-                x_data = self.ax.lines[0].get_xdata() if self.ax.lines else np.array([])
-                y_data_dict = {key: np.array([]) for key in count_dict.keys()}
-                if self.ax.lines:
-                    for line, key in zip(self.ax.lines, count_dict.keys()):
-                        y_data_dict[key] = line.get_ydata()
-
-                x_data = np.append(x_data, float(frame_number))
-                max_length = len(x_data)
-                for key in count_dict.keys():
-                    y_data_dict[key] = np.append(y_data_dict[key], float(count_dict[key]))
-                    if len(y_data_dict[key]) < max_length:
-                        y_data_dict[key] = np.pad(y_data_dict[key], (0, max_length - len(y_data_dict[key])), "constant")
-                if len(x_data) > self.max_points:
-                    x_data = x_data[1:]
-                    for key in count_dict.keys():
-                        y_data_dict[key] = y_data_dict[key][1:]
-
-                self.ax.clear()
-                for key, y_data in y_data_dict.items():
-                    color = next(color_cycle)
-                    self.ax.fill_between(x_data, y_data, color=color, alpha=0.7)
-                    self.ax.plot(
-                        x_data,
-                        y_data,
-                        color=color,
-                        linewidth=self.line_width,
-                        marker="o",
-                        markersize=self.line_width * 5,
-                        label=f"{key} Data Points",
-                    )
-            if plot == "bar":
-                self.ax.clear()  # clear bar data
-                for label in labels:  # Map labels to colors
-                    if label not in self.color_mapping:
-                        self.color_mapping[label] = next(self.color_cycle)
-                colors = [self.color_mapping[label] for label in labels]
-                bars = self.ax.bar(labels, counts, color=colors)
-                for bar, count in zip(bars, counts):
-                    self.ax.text(
-                        bar.get_x() + bar.get_width() / 2,
-                        bar.get_height(),
-                        str(count),
-                        ha="center",
-                        va="bottom",
-                        color=self.fg_color,
-                    )
-                # Create the legend using labels from the bars
-                for bar, label in zip(bars, labels):
-                    bar.set_label(label)  # Assign label to each bar
-                self.ax.legend(loc="upper left", fontsize=13, facecolor=self.fg_color, edgecolor=self.fg_color)
-            if plot == "pie":
-                total = sum(counts)
-                percentages = [size / total * 100 for size in counts]
-                start_angle = 90
-                self.ax.clear()
-
-                # Create pie chart and create legend labels with percentages
-                wedges, autotexts = self.ax.pie(
-                    counts, labels=labels, startangle=start_angle, textprops={"color": self.fg_color}, autopct=None
-                )
-                legend_labels = [f"{label} ({percentage:.1f}%)" for label, percentage in zip(labels, percentages)]
-
-                # Assign the legend using the wedges and manually created labels
-                self.ax.legend(wedges, legend_labels, title="Classes", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-                self.fig.subplots_adjust(left=0.1, right=0.75)  # Adjust layout to fit the legend
-
-        # Common plot settings
-        self.ax.set_facecolor("#f0f0f0")  # Set to light gray or any other color you like
-        self.ax.set_title(self.title, color=self.fg_color, fontsize=self.fontsize)
-        self.ax.set_xlabel(self.x_label, color=self.fg_color, fontsize=self.fontsize - 3)
-        self.ax.set_ylabel(self.y_label, color=self.fg_color, fontsize=self.fontsize - 3)
-
-        # Add and format legend
-        legend = self.ax.legend(loc="upper left", fontsize=13, facecolor=self.bg_color, edgecolor=self.bg_color)
-        for text in legend.get_texts():
-            text.set_color(self.fg_color)
-
-        # Redraw graph, update view, capture, and display the updated plot
-        self.ax.relim()
-        self.ax.autoscale_view()
-        self.canvas.draw()
-        im0 = np.array(self.canvas.renderer.buffer_rgba())
-        im0 = cv2.cvtColor(im0[:, :, :3], cv2.COLOR_RGBA2BGR)
+            im0 = self.chart.render(counts=count_dict or {}, colors=self.color_mapping)
         self.display_output(im0)
 
         return im0  # Return the image
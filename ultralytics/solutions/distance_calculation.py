@@ -82,7 +82,8 @@ class DistanceCalculation(BaseSolution):
             im0 (numpy.ndarray): The input image frame to process.
 
         Returns:
-            (numpy.ndarray): The processed image frame with annotations and distance calculations.
+            (numpy.ndarray | SolutionResults): The processed image frame with annotations and distance calculations,
+                or the distance between the selected objects if `render=False`.
 
         Examples:
             >>> import numpy as np
@@ -91,18 +92,21 @@ class DistanceCalculation(BaseSolution):
             >>> frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
             >>> processed_frame = dc.calculate(frame)
         """
-        self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
         self.extract_tracks(im0)  # Extract tracks
+        if self.render:
+            self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
 
         # Iterate over bounding boxes, track ids and classes index
         for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
-            self.annotator.box_label(box, color=colors(int(cls), True), label=self.names[int(cls)])
+            if self.render:
+                self.annotator.box_label(box, color=colors(int(cls), True), label=self.names[int(cls)])
 
             if len(self.selected_boxes) == 2:
                 for trk_id in self.selected_boxes.keys():
                     if trk_id == track_id:
                         self.selected_boxes[track_id] = box
 
+        pixels_distance = 0.0
         if len(self.selected_boxes) == 2:
             # Store user selected boxes in centroids list
             self.centroids.extend(
@@ -112,11 +116,12 @@ class DistanceCalculation(BaseSolution):
             pixels_distance = math.sqrt(
                 (self.centroids[0][0] - self.centroids[1][0]) ** 2 + (self.centroids[0][1] - self.centroids[1][1]) ** 2
             )
-            self.annotator.plot_distance_and_line(pixels_distance, self.centroids)
+            if self.render:
+                self.annotator.plot_distance_and_line(pixels_distance, self.centroids)
 
         self.centroids = []
 
-        self.display_output(im0)  # display output with base class function
-        cv2.setMouseCallback("Ultralytics Solutions", self.mouse_event_for_distance)
-
-        return im0  # return output image for more usage
+        results = self.output(im0, pixels_distance=pixels_distance)  # display output with base class function
+        if self.render:
+            cv2.setMouseCallback("Ultralytics Solutions", self.mouse_event_for_distance)
+        return results  # return output image for more usage
@@ -0,0 +1,301 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import json
+import socket
+from pathlib import Path
+from queue import Queue
+
+from ultralytics.utils import LOGGER
+from ultralytics.utils.checks import check_requirements
+
+EVENT_TYPES = "line_crossing", "region_enter", "region_exit", "dwell", "speed"
+EVENT_FIELDS = "type", "stream", "frame", "track_id", "cls", "region", "direction", "value"  # fields of every event
+
+
+class EventSink:
+    """
+    Base class of the sinks Ultralytics Solutions emit events to, buffering events and writing them in batches.
+
+    Events are dictionaries with the keys listed in `EVENT_FIELDS`, unused fields are None. Solutions only append events
+    to the buffer per frame, the actual write happens once `batch` events have accumulated or on `flush()`, so sinks
+    with per-write overhead like files and sockets add almost nothing to the per-frame solution cost. Subclasses
+    implement `_write`.
+
+    Attributes:
+        batch (int): Number of buffered events that triggers a write.
+        buffer (List[Dict]): Events not yet written.
+
+    Methods:
+        write: Buffers events and writes them once a batch is full.
+        flush: Writes all buffered events.
+        close: Flushes the buffer and releases the resources of the sink.
+
+    Examples:
+        >>> with JSONLSink("events.jsonl", batch=256) as sink:
+        ...     counter = ObjectCounter(region=[(20, 400), (1080, 400)], event_sink=sink)
+        ...     for frame in frames:
+        ...         counter.count(frame)
+    """
+
+    def __init__(self, batch=64):
+        """
+        Initialize an empty event buffer.
+
+        Args:
+            batch (int): Number of buffered events that triggers a write.
+        """
+        self.batch = batch
+        self.buffer = []
+
+    def write(self, events):
+        """
+        Buffer events and write them once at least `batch` events are buffered.
+
+        Args:
+            events (List[Dict]): Events to write.
+        """
+        self.buffer.extend(events)
+        if len(self.buffer) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered events."""
+        if self.buffer:
+            events, self.buffer = self.buffer, []
+            self._write(events)
+
+    def _write(self, events):
+        """Write a batch of events, implemented by subclasses."""
+        raise NotImplementedError
+
+    def close(self):
+        """Flush the buffered events and release the resources of the sink."""
+        self.flush()
+
+    def __enter__(self):
+        """Return the sink for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the sink when leaving the context."""
+        self.close()
+
+
+class QueueSink(EventSink):
+    """
+    Event sink putting batches of events on an in-process queue, i.e. for an aggregation thread.
+
+    Attributes:
+        queue (queue.Queue): Queue receiving one list of events per batch, may also be a `multiprocessing.Queue`.
+
+    Examples:
+        >>> sink = QueueSink(batch=32)
+        >>> counter = ObjectCounter(event_sink=sink)
+        >>> events = sink.queue.get()  # list of up to 32 events
+    """
+
+    def __init__(self, queue=None, batch=64):
+        """
+        Initialize the sink with an existing queue or a new unbounded queue.
+
+        Args:
+            queue (queue.Queue, optional): Queue receiving the batches, a new `queue.Queue` if not given.
+            batch (int): Number of buffered events that triggers a write.
+        """
+        super().__init__(batch)
+        self.queue = Queue() if queue is None else queue
+
+    def _write(self, events):
+        """Put a batch of events on the queue."""
+        self.queue.put(events)
+
+
+class JSONLSink(EventSink):
+    """
+    Event sink appending events to a JSON Lines file, one compact JSON object per line.
+
+    Attributes:
+        path (Path): Path of the JSON Lines file, created with its parent directories on the first write.
+
+    Examples:
+        >>> sink = JSONLSink("runs/events/cam0.jsonl")
+    """
+
+    def __init__(self, path, batch=64):
+        """
+        Initialize the sink, the file is opened on the first write.
+
+        Args:
+            path (str | Path): Path of the JSON Lines file, appended to if it exists.
+            batch (int): Number of buffered events that triggers a write.
+        """
+        super().__init__(batch)
+        self.path = Path(path)
+        self.file = None
+
+    def _write(self, events):
+        """Append a batch of events to the file."""
+        if self.file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events))
+        self.file.flush()
+
+    def close(self):
+        """Flush the buffered events and close the file."""
+        super().close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ParquetSink(EventSink):
+    """
+    Event sink writing events to a Parquet file, one row group per batch.
+
+    The file is only complete once the sink is closed. Larger batches give larger row groups and better compression.
+
+    Attributes:
+        path (Path): Path of the Parquet file, overwritten if it exists.
+
+    Examples:
+        >>> with ParquetSink("events.parquet", batch=4096) as sink:
+        ...     speed = SpeedEstimator(event_sink=sink)
+    """
+
+    def __init__(self, path, batch=4096):
+        """
+        Initialize the sink, the file is created on the first write.
+
+        Args:
+            path (str | Path): Path of the Parquet file.
+            batch (int): Number of buffered events that triggers a write.
+        """
+        check_requirements("pyarrow")
+        import pyarrow as pa
+
+        super().__init__(batch)
+        self.path = Path(path)
+        self.writer = None
+        self.schema = pa.schema(
+            [
+                ("type", pa.string()),
+                ("stream", pa.string()),
+                ("frame", pa.int64()),
+                ("track_id", pa.int64()),
+                ("cls", pa.int64()),
+                ("region", pa.string()),
+                ("direction", pa.string()),
+                ("value", pa.float64()),
+            ]
+        )
+
+    def _write(self, events):
+        """Write a batch of events as one row group."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(pa.Table.from_pylist(events, schema=self.schema))
+
+    def close(self):
+        """Flush the buffered events and finalize the file."""
+        super().close()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class SocketSink(EventSink):
+    """
+    Event sink streaming events as JSON Lines over a local socket to a separate aggregation process.
+
+    The connection is opened on the first write and reopened after errors. Batches that cannot be sent are dropped with
+    a warning, so an unavailable aggregator never stalls the video pipeline.
+
+    Attributes:
+        address (str | Tuple[str, int]): Unix socket path, or host and port of a TCP socket.
+
+    Examples:
+        >>> sink = SocketSink("unix:///tmp/solutions.sock")
+        >>> sink = SocketSink("tcp://127.0.0.1:9000")
+    """
+
+    def __init__(self, address, batch=64):
+        """
+        Initialize the sink for a socket address.
+
+        Args:
+            address (str): Socket address as 'unix://<path>' or 'tcp://<host>:<port>'.
+            batch (int): Number of buffered events that triggers a write.
+        """
+        super().__init__(batch)
+        scheme, _, target = address.partition("://")
+        if scheme == "unix":
+            self.family, self.address = socket.AF_UNIX, target
+        elif scheme == "tcp":
+            host, _, port = target.rpartition(":")
+            self.family, self.address = socket.AF_INET, (host, int(port))
+        else:
+            raise ValueError(f"Invalid socket address '{address}', use 'unix://<path>' or 'tcp://<host>:<port>'.")
+        self.sock = None
+
+    def _write(self, events):
+        """Send a batch of events, dropping it if the socket is unavailable."""
+        data = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events).encode()
+        try:
+            if self.sock is None:
+                self.sock = socket.socket(self.family, socket.SOCK_STREAM)
+                self.sock.connect(self.address)
+            self.sock.sendall(data)
+        except OSError as e:
+            LOGGER.warning(f"WARNING ⚠️ dropped {len(events)} events, socket {self.address} unavailable: {e}")
+            self.close_socket()
+
+    def close_socket(self):
+        """Close the socket connection, reopened on the next write."""
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def close(self):
+        """Flush the buffered events and close the socket."""
+        super().close()
+        self.close_socket()
+
+
+def build_sink(sink, batch=64):
+    """
+    Build the event sink of a solution from its `event_sink` argument.
+
+    Args:
+        sink (str | EventSink | queue.Queue | None): An event sink, a queue, 'queue' for a new in-process queue, a
+            '.jsonl' or '.parquet' file path, or a 'unix://<path>' or 'tcp://<host>:<port>' socket address. None
+            disables events.
+        batch (int): Number of buffered events that triggers a write.
+
+    Returns:
+        (EventSink | None): The event sink, None if events are disabled.
+
+    Examples:
+        >>> sink = build_sink("runs/events/cam0.jsonl", batch=128)
+    """
+    if sink is None or isinstance(sink, EventSink):
+        return sink
+    if hasattr(sink, "put"):  # queue.Queue or multiprocessing.Queue
+        return QueueSink(sink, batch)
+    sink = str(sink)
+    if sink == "queue":
+        return QueueSink(batch=batch)
+    if sink.startswith(("unix://", "tcp://")):
+        return SocketSink(sink, batch)
+    suffix = Path(sink).suffix
+    if suffix == ".jsonl":
+        return JSONLSink(sink, batch)
+    if suffix == ".parquet":
+        return ParquetSink(sink, batch)
+    raise ValueError(
+        f"Invalid event_sink '{sink}', use 'queue', a .jsonl or .parquet file, or a unix:// or tcp:// socket address."
+    )
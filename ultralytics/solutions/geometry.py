@@ -0,0 +1,228 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import cv2
+import numpy as np
+
+
+def _cross(o, a, b):
+    """Return the z-component of the cross product (a - o) x (b - o), broadcasting over leading dimensions."""
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def _on_segment(s, e, p):
+    """Check whether point p lies within the bounding box of segment s-e, for points already known to be collinear."""
+    return ((np.minimum(s, e) <= p) & (p <= np.maximum(s, e))).all(-1)
+
+
+class Region:
+    """
+    Vectorized point-in-polygon, segment-crossing and direction tests for a solutions counting line or polygon.
+
+    The region edge table is built once, so each test runs for all tracks of a frame in a single NumPy call instead of
+    constructing and testing shapely geometries per track. Results match shapely's `Polygon.contains`,
+    `LineString.intersects` and `Polygon.intersects`, including boundary and collinear cases.
+
+    Attributes:
+        points (np.ndarray): Region vertices of shape (N, 2) in float64.
+        is_line (bool): Whether the region is a line segment (2 points) rather than a polygon.
+        edges (Tuple[np.ndarray, np.ndarray]): Start and end points of the region edges, each of shape (E, 2).
+        bounds (Tuple[float, float, float, float]): Region bounds as (min x, min y, max x, max y).
+        vertical (bool): Whether the region is taller than wide, motion is classified along x if so and y otherwise.
+
+    Methods:
+        contains: Checks which points lie strictly inside the polygon.
+        intersects: Checks which segments intersect the region.
+        inward: Classifies motion between two positions as inward or outward.
+
+    Examples:
+        >>> region = Region([(20, 400), (1080, 400), (1080, 360), (20, 360)])
+        >>> region.contains([(100, 380), (100, 100)])
+        array([ True, False])
+        >>> Region([(0, 0), (0, 10)]).intersects([(-1, 5), (1, 5)], [(1, 5), (2, 5)])
+        array([ True, False])
+    """
+
+    def __init__(self, points):
+        """
+        Initialize the region and precompute its edge table.
+
+        Args:
+            points (List[Tuple[float, float]]): Two points defining a line or three or more defining a polygon.
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.is_line = len(self.points) < 3
+        if self.is_line:
+            self.edges = self.points[:1], self.points[1:2]
+        else:
+            self.edges = self.points, np.roll(self.points, -1, 0)
+        a, b = self.edges
+        dy = b[:, 1] - a[:, 1]
+        self._inv_slope = np.divide(b[:, 0] - a[:, 0], dy, out=np.zeros_like(dy), where=dy != 0)
+        mn, mx = self.points.min(0), self.points.max(0)
+        self.bounds = (*mn.tolist(), *mx.tolist())
+        self.vertical = bool(mx[0] - mn[0] < mx[1] - mn[1])
+
+    def on_boundary(self, points):
+        """
+        Check which points lie on the region edges.
+
+        Args:
+            points (np.ndarray): Points of shape (N, 2).
+
+        Returns:
+            (np.ndarray): Boolean array of shape (N,).
+        """
+        p = np.asarray(points, dtype=np.float64).reshape(-1, 1, 2)
+        a, b = self.edges
+        return ((_cross(a, b, p) == 0) & _on_segment(a, b, p)).any(1)
+
+    def contains(self, points):
+        """
+        Check which points lie strictly inside the polygon, points on the boundary are not contained.
+
+        Uses the crossing number test against the precomputed edge table. A line has no interior, so no points are
+        contained in a line region.
+
+        Args:
+            points (np.ndarray): Points of shape (N, 2).
+
+        Returns:
+            (np.ndarray): Boolean array of shape (N,).
+        """
+        p = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if self.is_line or not len(p):
+            return np.zeros(len(p), dtype=bool)
+        a, b = self.edges
+        x, y = p[:, :1], p[:, 1:]
+        straddle = (a[:, 1] > y) != (b[:, 1] > y)  # (N, E) edges crossing the horizontal ray through each point
+        x_cross = a[:, 0] + (y - a[:, 1]) * self._inv_slope
+        inside = (straddle & (x < x_cross)).sum(1) % 2 == 1
+        return inside & ~self.on_boundary(p)
+
+    def intersects(self, starts, ends):
+        """
+        Check which segments, i.e. track motion from one frame to the next, intersect the region.
+
+        A segment intersects a line region if the two cross or touch, and a polygon region if it crosses or touches the
+        boundary or lies inside the polygon.
+
+        Args:
+            starts (np.ndarray): Segment start points of shape (N, 2).
+            ends (np.ndarray): Segment end points of shape (N, 2).
+
+        Returns:
+            (np.ndarray): Boolean array of shape (N,).
+        """
+        p = np.asarray(starts, dtype=np.float64).reshape(-1, 1, 2)
+        q = np.asarray(ends, dtype=np.float64).reshape(-1, 1, 2)
+        if not len(p):
+            return np.zeros(0, dtype=bool)
+        a, b = self.edges[0][None], self.edges[1][None]
+        d1, d2 = np.sign(_cross(a, b, p)), np.sign(_cross(a, b, q))
+        d3, d4 = np.sign(_cross(p, q, a)), np.sign(_cross(p, q, b))
+        hits = (
+            ((d1 * d2 < 0) & (d3 * d4 < 0))
+            | ((d1 == 0) & _on_segment(a, b, p))
+            | ((d2 == 0) & _on_segment(a, b, q))
+            | ((d3 == 0) & _on_segment(p, q, a))
+            | ((d4 == 0) & _on_segment(p, q, b))
+        ).any(1)
+        if not self.is_line:
+            hits |= self.contains(p[:, 0])  # segments entirely inside the polygon
+        return hits
+
+    def inward(self, starts, ends):
+        """
+        Classify motion as inward, i.e. rightward for vertical regions and downward otherwise, or outward.
+
+        Args:
+            starts (np.ndarray): Previous positions of shape (N, 2).
+            ends (np.ndarray): Current positions of shape (N, 2).
+
+        Returns:
+            (np.ndarray): Boolean array of shape (N,), True for inward motion.
+        """
+        i = 0 if self.vertical else 1
+        return np.asarray(ends, dtype=np.float64).reshape(-1, 2)[:, i] > np.asarray(starts).reshape(-1, 2)[:, i]
+
+
+class RegionRaster:
+    """
+    Integer label rasters of a region layout for region membership lookups of many points at once.
+
+    The regions are rasterized once for a frame size. Regions that do not overlap share a layer storing the region
+    index + 1 of each pixel and 0 elsewhere, while overlapping regions are placed in additional layers. Looking up the
+    regions of all points is then a single gather per layer, independent of the number of regions. Membership is
+    resolved at pixel resolution, a point belongs to a region if its pixel is covered by the filled polygon, including
+    its boundary pixels.
+
+    Attributes:
+        shape (Tuple[int, int]): Frame height and width the rasters were built for.
+        num_regions (int): Number of regions.
+        layers (np.ndarray): Label rasters of shape (L, H, W) in int32, one per layer of non-overlapping regions.
+
+    Methods:
+        labels: Returns the indices of the regions containing each point.
+        counts: Counts the points inside each region.
+
+    Examples:
+        >>> raster = RegionRaster([[(0, 0), (10, 0), (10, 10), (0, 10)], [(5, 5), (20, 5), (20, 20)]], (480, 640))
+        >>> raster.counts([(7, 6), (2, 2), (100, 100)])
+        array([2, 1])
+    """
+
+    def __init__(self, polygons, shape):
+        """
+        Rasterize the regions into label layers.
+
+        Args:
+            polygons (List[List[Tuple[float, float]]]): Vertices of each region polygon in pixel coordinates.
+            shape (Tuple[int, int]): Frame height and width.
+        """
+        h, w = self.shape = tuple(shape[:2])
+        self.num_regions = len(polygons)
+        layers = []
+        for i, polygon in enumerate(polygons):
+            pts = np.round(np.asarray(polygon, dtype=np.float64)).astype(np.int32).reshape(-1, 2)
+            x0, y0 = np.clip(pts.min(0), 0, (w, h))  # fill only the bounding box of the polygon within the frame
+            x1, y1 = np.clip(pts.max(0) + 1, 0, (w, h))
+            mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+            cv2.fillPoly(mask, [(pts - (x0, y0)).reshape(-1, 1, 2)], 1)
+            ys, xs = np.nonzero(mask)
+            pixels = (ys + y0) * w + xs + x0
+            layer = next((layer for layer in layers if not layer.flat[pixels].any()), None)  # first layer with room
+            if layer is None:
+                layer = np.zeros((h, w), dtype=np.int32)
+                layers.append(layer)
+            layer.flat[pixels] = i + 1
+        self.layers = np.stack(layers) if layers else np.zeros((0, h, w), dtype=np.int32)
+
+    def labels(self, points):
+        """
+        Return the indices of the regions containing each point, one column per layer.
+
+        Args:
+            points (np.ndarray): Points (x, y) in pixel coordinates of shape (N, 2), i.e. box centroids.
+
+        Returns:
+            (np.ndarray): Region indices of shape (N, L), -1 where a layer has no region at the point.
+        """
+        p = np.floor(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        x, y = p[:, 0].astype(np.int64), p[:, 1].astype(np.int64)
+        inside = (x >= 0) & (x < self.shape[1]) & (y >= 0) & (y < self.shape[0])
+        labels = np.full((len(p), len(self.layers)), -1, dtype=np.int64)
+        labels[inside] = self.layers[:, y[inside], x[inside]].T - 1
+        return labels
+
+    def counts(self, points):
+        """
+        Count the points inside each region, points in overlapping regions are counted in each of them.
+
+        Args:
+            points (np.ndarray): Points (x, y) in pixel coordinates of shape (N, 2).
+
+        Returns:
+            (np.ndarray): Number of points inside each region, shape (num_regions,).
+        """
+        labels = self.labels(points)
+        return np.bincount(labels[labels >= 0], minlength=self.num_regions)
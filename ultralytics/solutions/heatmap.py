@@ -1,5 +1,8 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import math
+from collections import deque
+
 import cv2
 import numpy as np
 
@@ -12,16 +15,28 @@ class Heatmap(ObjectCounter):
     A class to draw heatmaps in real-time video streams based on object tracks.
 
     This class extends the ObjectCounter class to generate and visualize heatmaps of object movements in video
-    streams. It uses tracked object positions to create a cumulative heatmap effect over time.
+    streams. Detections are accumulated into a downscaled single-channel grid, where all boxes of a frame are splatted
+    at once using precomputed circular kernels. The grid optionally decays exponentially or covers only the most recent
+    frames, and is only colorized and upscaled when an annotated frame is returned.
 
     Attributes:
-        initialized (bool): Flag indicating whether the heatmap has been initialized.
         colormap (int): OpenCV colormap used for heatmap visualization.
-        heatmap (np.ndarray): Array storing the cumulative heatmap data.
+        scale (float): Size of the heatmap grid relative to the frame, i.e. 0.25 for a quarter of the resolution.
+        decay (float): Factor the heatmap is multiplied by every frame, 1.0 to accumulate without decay.
+        window (int): Number of most recent frames covered by the heatmap, 0 to accumulate over all frames.
+        heatmap (np.ndarray | None): Single-channel heatmap grid in float32, created on the first frame.
+        frame_shape (Tuple[int, int]): Frame height and width the heatmap grid was created for.
+        kernels (Dict[int, Tuple[np.ndarray, np.ndarray]]): Cached row offsets and half widths of the circular kernel
+            per radius.
+        splats (collections.deque): Grid boxes of the frames within the window, removed again as they expire.
         annotator (Annotator): Object for drawing annotations on the image.
 
     Methods:
-        heatmap_effect: Calculates and updates the heatmap effect for a given bounding box.
+        init_heatmap: Creates an empty heatmap grid for a frame size.
+        kernel: Returns a circular kernel as horizontal row spans.
+        splat: Adds circular kernels for boxes to the heatmap grid.
+        heatmap_effect: Updates the heatmap with the boxes of a frame.
+        colorize: Colorizes the heatmap, upscales it and blends it with a frame.
         generate_heatmap: Generates and applies the heatmap effect to each frame.
 
     Examples:
@@ -39,39 +54,127 @@ class Heatmap(ObjectCounter):
         """Initializes the Heatmap class for real-time video stream heatmap generation based on object tracks."""
         super().__init__(**kwargs)
 
-        self.initialized = False  # bool variable for heatmap initialization
         if self.region is not None:  # check if user provided the region coordinates
             self.initialize_region()
 
         # store colormap
         self.colormap = cv2.COLORMAP_PARULA if self.CFG["colormap"] is None else self.CFG["colormap"]
 
-    def heatmap_effect(self, box):
+        self.scale = self.CFG["heatmap_scale"]
+        self.decay = self.CFG["heatmap_decay"]
+        self.window = self.CFG["heatmap_window"]
+        self.heatmap = None  # created on the first frame
+        self.frame_shape = None
+        self.kernels = {}
+        self.splats = deque(maxlen=self.window or None)
+
+    def init_heatmap(self, shape):
         """
-        Efficiently calculates heatmap area and effect location for applying colormap.
+        Creates an empty heatmap grid for a frame size and clears the frames within the window.
 
         Args:
-            box (List[float]): Bounding box coordinates [x0, y0, x1, y1].
+            shape (Tuple[int, int]): Frame height and width.
+        """
+        self.frame_shape = tuple(shape)
+        self.heatmap = np.zeros((math.ceil(shape[0] * self.scale), math.ceil(shape[1] * self.scale)), np.float32)
+        self.splats.clear()
 
-        Examples:
-            >>> heatmap = Heatmap()
-            >>> box = [100, 100, 200, 200]
-            >>> heatmap.heatmap_effect(box)
+    def kernel(self, radius):
+        """
+        Returns a circular kernel as horizontal row spans, computed once per radius.
+
+        Args:
+            radius (int): Kernel radius in grid cells.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): y offsets of the kernel rows and the half width of each row.
         """
-        x0, y0, x1, y1 = map(int, box)
-        radius_squared = (min(x1 - x0, y1 - y0) // 2) ** 2
+        if radius not in self.kernels:
+            dy = np.arange(-radius, radius + 1)
+            self.kernels[radius] = dy, np.floor(np.sqrt(radius**2 - dy**2)).astype(np.int64)
+        return self.kernels[radius]
 
-        # Create a meshgrid with region of interest (ROI) for vectorized distance calculations
-        xv, yv = np.meshgrid(np.arange(x0, x1), np.arange(y0, y1))
+    def splat(self, boxes, weight=1.0):
+        """
+        Adds a circular kernel inscribed in each box to the heatmap grid, all boxes in one accumulation.
 
-        # Calculate squared distances from the center
-        dist_squared = (xv - ((x0 + x1) // 2)) ** 2 + (yv - ((y0 + y1) // 2)) ** 2
+        Each kernel row is a span of cells, marked by +1 at its start and -1 after its end in a difference grid. Boxes
+        sharing a radius are expanded together by broadcasting, all span ends are accumulated with a single
+        `np.bincount` and one cumulative sum turns them into coverage counts, so the cost grows with the
+        kernel height rather than its area and overlapping boxes accumulate correctly.
 
-        # Create a mask of points within the radius
-        within_radius = dist_squared <= radius_squared
+        Args:
+            boxes (np.ndarray): Integer boxes (x0, y0, x1, y1) in grid coordinates, shape (N, 4).
+            weight (float): Value added to each covered cell, negative to remove earlier splats.
+        """
+        if not len(boxes):
+            return
+        h, w = self.heatmap.shape
+        x0, y0, x1, y1 = boxes.T
+        cx, cy = (x0 + x1) // 2, (y0 + y1) // 2
+        radii = np.maximum(np.minimum(x1 - x0, y1 - y0) // 2, 0)
+        rows, starts, ends = [], [], []
+        for radius in np.unique(radii):
+            i = radii == radius
+            dy, hw = self.kernel(int(radius))
+            ys = cy[i, None] + dy
+            xa = np.maximum(cx[i, None] - hw, np.maximum(x0[i], 0)[:, None])  # span start, clipped to box and grid
+            xb = np.minimum(cx[i, None] + hw + 1, np.minimum(x1[i], w)[:, None])  # span end (exclusive)
+            keep = (ys >= np.maximum(y0[i], 0)[:, None]) & (ys < np.minimum(y1[i], h)[:, None]) & (xa < xb)
+            rows.append(ys[keep])
+            starts.append(xa[keep])
+            ends.append(xb[keep])
+        rows = np.concatenate(rows)
+        if not len(rows):
+            return
+        lo, hi = rows.min(), rows.max() + 1  # only the covered rows are accumulated
+        rows = (rows - lo) * (w + 1)
+        diff = np.bincount(
+            np.concatenate([rows + np.concatenate(starts), rows + np.concatenate(ends)]),
+            weights=np.repeat(np.array([weight, -weight]), len(rows)),
+            minlength=(hi - lo) * (w + 1),
+        )
+        # Spans end within their row, so a flat cumulative sum equals per-row sums and runs on contiguous memory
+        self.heatmap[lo:hi] += np.cumsum(diff.astype(np.float32)).reshape(hi - lo, w + 1)[:, :w]
+
+    def heatmap_effect(self, boxes):
+        """
+        Updates the heatmap with the boxes of a frame, applying decay and the time window.
 
-        # Update only the values within the bounding box in a single vectorized operation
-        self.heatmap[y0:y1, x0:x1][within_radius] += 2
+        Args:
+            boxes (np.ndarray | List[float]): Bounding boxes [x0, y0, x1, y1] in frame coordinates, shape (N, 4).
+
+        Examples:
+            >>> heatmap = Heatmap()
+            >>> heatmap.init_heatmap((480, 640))
+            >>> heatmap.heatmap_effect([[100, 100, 200, 200], [300, 100, 380, 260]])
+        """
+        boxes = (np.asarray(boxes, dtype=np.float32).reshape(-1, 4) * self.scale).astype(np.int64)
+        if self.decay != 1.0:
+            self.heatmap *= self.decay
+        self.splat(boxes)
+        if self.window:
+            if len(self.splats) == self.window:  # remove the frame leaving the window, decayed since it was added
+                self.splat(self.splats[0], -(self.decay**self.window))
+                np.maximum(self.heatmap, 0, out=self.heatmap)  # clear float rounding residue
+            self.splats.append(boxes)
+
+    def colorize(self, im0):
+        """
+        Colorizes the heatmap, upscales it to the frame size and blends it with the frame.
+
+        Args:
+            im0 (np.ndarray): Frame to overlay the heatmap on.
+
+        Returns:
+            (np.ndarray): Frame blended with the colorized heatmap.
+        """
+        heatmap = cv2.applyColorMap(
+            cv2.normalize(self.heatmap, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8), self.colormap
+        )
+        if heatmap.shape[:2] != im0.shape[:2]:
+            heatmap = cv2.resize(heatmap, (im0.shape[1], im0.shape[0]), interpolation=cv2.INTER_LINEAR)
+        return cv2.addWeighted(im0, 0.5, heatmap, 0.5, 0)
 
     def generate_heatmap(self, im0):
         """
@@ -81,50 +184,41 @@ class Heatmap(ObjectCounter):
             im0 (np.ndarray): Input image array for processing.
 
         Returns:
-            (np.ndarray): Processed image with heatmap overlay and object counts (if region is specified).
+            (np.ndarray | SolutionResults): Processed image with heatmap overlay and object counts (if region is
+                specified), or the counts if `render=False`, with the heatmap grid kept in `self.heatmap`.
 
         Examples:
             >>> heatmap = Heatmap()
             >>> im0 = cv2.imread("image.jpg")
             >>> result = heatmap.generate_heatmap(im0)
         """
-        if not self.initialized:
-            self.heatmap = np.zeros_like(im0, dtype=np.float32) * 0.99
-        self.initialized = True  # Initialize heatmap only once
+        if self.heatmap is None or self.frame_shape != im0.shape[:2]:
+            self.init_heatmap(im0.shape[:2])  # initialize once, and again if the frame size changes
 
-        self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
         self.extract_tracks(im0)  # Extract tracks
 
-        # Iterate over bounding boxes, track ids and classes index
-        for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
-            # Draw bounding box and counting region
-            self.heatmap_effect(box)
+        self.heatmap_effect(self.boxes)  # Splat all boxes of the frame at once
 
-            if self.region is not None:
-                self.annotator.draw_region(reg_pts=self.region, color=(104, 0, 123), thickness=self.line_width * 2)
-                self.store_tracking_history(track_id, box)  # Store track history
+        if self.region is not None:
+            for cls in self.clss:
                 self.store_classwise_counts(cls)  # store classwise counts in dict
-                current_centroid = ((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
-                # Store tracking previous position and perform object counting
-                prev_position = None
-                if len(self.track_history[track_id]) > 1:
-                    prev_position = self.track_history[track_id][-2]
-                self.count_objects(current_centroid, track_id, prev_position, cls)  # Perform object counting
+            self.update_tracking_history()  # Store track history
+            current_centroids, prev_positions = self.track_positions()
+            self.count_objects(current_centroids, self.track_ids, prev_positions, self.clss)  # Perform object counting
 
-        if self.region is not None:
-            self.display_counts(im0)  # Display the counts on the frame
-
-        # Normalize, apply colormap to heatmap and combine with original image
-        if self.track_data.id is not None:
-            im0 = cv2.addWeighted(
-                im0,
-                0.5,
-                cv2.applyColorMap(
-                    cv2.normalize(self.heatmap, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8), self.colormap
-                ),
-                0.5,
-                0,
-            )
-
-        self.display_output(im0)  # display output with base class function
-        return im0  # return output image for more usage
+        if self.render:
+            if self.region is not None:
+                self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
+                self.annotator.draw_region(reg_pts=self.region, color=(104, 0, 123), thickness=self.line_width * 2)
+                self.display_counts(im0)  # Display the counts on the frame
+
+            # Normalize, apply colormap to heatmap and combine with original image
+            if self.track_data.id is not None:
+                im0 = self.colorize(im0)
+
+        return self.output(
+            im0,
+            in_count=self.in_count,
+            out_count=self.out_count,
+            classwise_count=self.classwise_counts,
+        )
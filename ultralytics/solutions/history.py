@@ -0,0 +1,196 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import numpy as np
+
+
+class TrackHistory:
+    """
+    Bounded centroid history of tracked objects stored in preallocated ring buffers.
+
+    Each track owns one slot of a (capacity, maxlen, 2) array, so appending a point is a constant-time write that never
+    shifts or reallocates per-track lists. Tracks not updated for `ttl` frames are evicted and their slots reused, which
+    keeps memory bounded on long-running streams where the tracker keeps assigning new IDs.
+
+    Attributes:
+        maxlen (int): Maximum number of points kept per track.
+        ttl (int): Number of frames without updates after which a track is evicted.
+        frame (int): Number of frames processed, advanced by `update`.
+        points (np.ndarray): Ring buffers of track centroids of shape (capacity, maxlen, 2) in float32.
+        times (np.ndarray): Ring buffers of the timestamps of the points of shape (capacity, maxlen) in float64.
+        lengths (np.ndarray): Number of stored points of each slot.
+        heads (np.ndarray): Ring buffer index the next point of each slot is written to.
+        last_seen (np.ndarray): Frame in which each slot was last updated.
+        slots (Dict[int, int]): Slot index of each active track ID.
+
+    Methods:
+        append: Appends one point to each of the given tracks.
+        update: Advances one frame, appends the points of the current tracks and evicts expired tracks.
+        evict: Removes tracks not updated for `ttl` frames.
+        last: Returns the k-th most recent point of each of the given tracks.
+        span: Returns the first and last point and timestamp of the recent history of each of the given tracks.
+
+    Examples:
+        >>> history = TrackHistory(maxlen=30, ttl=90)
+        >>> evicted = history.update([1, 2], np.array([[10, 20], [30, 40]]))
+        >>> history[1]  # points of track 1 in chronological order
+        array([[10., 20.]], dtype=float32)
+    """
+
+    def __init__(self, maxlen=30, ttl=90, capacity=64):
+        """
+        Initialize empty ring buffers.
+
+        Args:
+            maxlen (int): Maximum number of points kept per track.
+            ttl (int): Number of frames without updates after which a track is evicted.
+            capacity (int): Initial number of track slots, grown by doubling when all are in use.
+        """
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self.frame = 0
+        self.points = np.zeros((capacity, maxlen, 2), dtype=np.float32)
+        self.times = np.zeros((capacity, maxlen), dtype=np.float64)
+        self.lengths = np.zeros(capacity, dtype=np.int64)
+        self.heads = np.zeros(capacity, dtype=np.int64)
+        self.last_seen = np.zeros(capacity, dtype=np.int64)
+        self.slots = {}
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        """Return the number of active tracks."""
+        return len(self.slots)
+
+    def __contains__(self, track_id):
+        """Check whether a track is active."""
+        return track_id in self.slots
+
+    def __iter__(self):
+        """Iterate over the active track IDs."""
+        return iter(self.slots)
+
+    def __getitem__(self, track_id):
+        """Return the stored points of a track in chronological order, an empty (0, 2) array for unknown tracks."""
+        s = self.slots.get(track_id)
+        if s is None:
+            return np.zeros((0, 2), dtype=np.float32)
+        n = self.lengths[s]
+        return self.points[s, (self.heads[s] - n + np.arange(n)) % self.maxlen]
+
+    def _grow(self):
+        """Double the number of track slots."""
+        n = len(self.points)
+        self.points = np.concatenate([self.points, np.zeros_like(self.points)])
+        self.times = np.concatenate([self.times, np.zeros_like(self.times)])
+        for name in "lengths", "heads", "last_seen":
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(n, dtype=np.int64)]))
+        self._free.extend(range(2 * n - 1, n - 1, -1))
+
+    def _slots(self, track_ids):
+        """Return the slot indices of the given tracks, allocating empty slots for new tracks."""
+        for track_id in track_ids:
+            if track_id not in self.slots:
+                if not self._free:
+                    self._grow()
+                s = self.slots[track_id] = self._free.pop()
+                self.lengths[s] = self.heads[s] = 0
+        return np.fromiter((self.slots[t] for t in track_ids), dtype=np.int64, count=len(track_ids))
+
+    def append(self, track_ids, points, t=None):
+        """
+        Append one point to each of the given tracks in the current frame.
+
+        Args:
+            track_ids (List[int]): Unique track IDs.
+            points (np.ndarray): Points (x, y) of the tracks, shape (N, 2).
+            t (float, optional): Timestamp of the points, i.e. in seconds, defaults to the frame number.
+        """
+        if not len(track_ids):
+            return
+        s = self._slots(track_ids)
+        self.points[s, self.heads[s]] = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.times[s, self.heads[s]] = self.frame if t is None else t
+        self.heads[s] = (self.heads[s] + 1) % self.maxlen
+        self.lengths[s] = np.minimum(self.lengths[s] + 1, self.maxlen)
+        self.last_seen[s] = self.frame
+
+    def update(self, track_ids, points, t=None):
+        """
+        Advance one frame, append the points of the current tracks and evict expired tracks.
+
+        Args:
+            track_ids (List[int]): Unique IDs of the tracks in the frame.
+            points (np.ndarray): Points (x, y) of the tracks, shape (N, 2).
+            t (float, optional): Timestamp of the frame, i.e. in seconds, defaults to the frame number.
+
+        Returns:
+            (List[int]): IDs of the evicted tracks.
+        """
+        self.frame += 1
+        self.append(track_ids, points, t)
+        return self.evict()
+
+    def evict(self):
+        """
+        Remove tracks that have not been updated for `ttl` frames and free their slots.
+
+        Returns:
+            (List[int]): IDs of the evicted tracks.
+        """
+        if not self.slots:
+            return []
+        ids = list(self.slots)
+        s = np.fromiter(self.slots.values(), dtype=np.int64, count=len(ids))
+        expired = [ids[i] for i in np.nonzero(self.frame - self.last_seen[s] >= self.ttl)[0]]
+        for track_id in expired:
+            self._free.append(self.slots.pop(track_id))
+        return expired
+
+    def last(self, track_ids, k=0):
+        """
+        Return the k-th most recent point of each of the given tracks.
+
+        Args:
+            track_ids (List[int]): Track IDs.
+            k (int): Offset from the most recent point, 0 for the latest and 1 for the one before.
+
+        Returns:
+            (np.ndarray): Points of shape (N, 2) in float64, NaN for unknown tracks or tracks with fewer than k + 1
+                points.
+        """
+        out = np.full((len(track_ids), 2), np.nan)
+        known = np.array([t in self.slots for t in track_ids], dtype=bool)
+        if known.any():
+            s = np.fromiter((self.slots[t] for t in track_ids if t in self.slots), dtype=np.int64)
+            valid = self.lengths[s] > k
+            i = np.nonzero(known)[0][valid]
+            s = s[valid]
+            out[i] = self.points[s, (self.heads[s] - 1 - k) % self.maxlen]
+        return out
+
+    def span(self, track_ids, k):
+        """
+        Return the first and last point and timestamp of the k most recent steps of each of the given tracks.
+
+        Tracks with fewer than k + 1 points span their whole history, so the start equals the end for tracks with a
+        single point.
+
+        Args:
+            track_ids (List[int]): Track IDs.
+            k (int): Number of steps back from the most recent point.
+
+        Returns:
+            start (np.ndarray): Start points of shape (N, 2) in float64, NaN for unknown tracks.
+            t_start (np.ndarray): Start timestamps of shape (N,), NaN for unknown tracks.
+            end (np.ndarray): Most recent points of shape (N, 2) in float64, NaN for unknown tracks.
+            t_end (np.ndarray): Most recent timestamps of shape (N,), NaN for unknown tracks.
+        """
+        start, end = np.full((2, len(track_ids), 2), np.nan)
+        t_start, t_end = np.full((2, len(track_ids)), np.nan)
+        known = np.array([t in self.slots for t in track_ids], dtype=bool)
+        if known.any():
+            s = np.fromiter((self.slots[t] for t in track_ids if t in self.slots), dtype=np.int64)
+            i0 = (self.heads[s] - 1 - np.minimum(k, self.lengths[s] - 1)) % self.maxlen
+            i1 = (self.heads[s] - 1) % self.maxlen
+            start[known], t_start[known] = self.points[s, i0], self.times[s, i0]
+            end[known], t_end[known] = self.points[s, i1], self.times[s, i1]
+        return start, t_start, end, t_end
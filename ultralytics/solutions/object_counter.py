@@ -1,5 +1,7 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import numpy as np
+
 from ultralytics.solutions.solutions import BaseSolution
 from ultralytics.utils.plotting import Annotator, colors
 
@@ -14,14 +16,15 @@ class ObjectCounter(BaseSolution):
     Attributes:
         in_count (int): Counter for objects moving inward.
         out_count (int): Counter for objects moving outward.
-        counted_ids (List[int]): List of IDs of objects that have been counted.
+        counted_ids (Set[int]): IDs of objects that have been counted.
         classwise_counts (Dict[str, Dict[str, int]]): Dictionary for counts, categorized by object class.
         region_initialized (bool): Flag indicating whether the counting region has been initialized.
         show_in (bool): Flag to control display of inward count.
         show_out (bool): Flag to control display of outward count.
 
     Methods:
-        count_objects: Counts objects within a polygonal or linear region.
+        count_objects: Counts objects crossing a line or entering a polygonal region.
+        evict_tracks: Forgets the counted state of evicted tracks.
         store_classwise_counts: Initializes class-wise counts if not already present.
         display_counts: Displays object counts on the frame.
         count: Processes input data (frames or object tracks) and updates counts.
@@ -39,75 +42,60 @@ class ObjectCounter(BaseSolution):
 
         self.in_count = 0  # Counter for objects moving inward
         self.out_count = 0  # Counter for objects moving outward
-        self.counted_ids = []  # List of IDs of objects that have been counted
+        self.counted_ids = set()  # IDs of objects that have been counted
         self.classwise_counts = {}  # Dictionary for counts, categorized by object class
         self.region_initialized = False  # Bool variable for region initialization
 
         self.show_in = self.CFG["show_in"]
         self.show_out = self.CFG["show_out"]
 
-    def count_objects(self, current_centroid, track_id, prev_position, cls):
+    def count_objects(self, current_centroids, track_ids, prev_positions, clss):
         """
-        Counts objects within a polygonal or linear region based on their tracks.
+        Counts objects crossing a line or entering a polygonal region for all tracks of a frame in one vectorized call.
+
+        Each counted object emits a 'line_crossing' event for line regions or a 'region_enter' event for polygons.
 
         Args:
-            current_centroid (Tuple[float, float]): Current centroid values in the current frame.
-            track_id (int): Unique identifier for the tracked object.
-            prev_position (Tuple[float, float]): Last frame position coordinates (x, y) of the track.
-            cls (int): Class index for classwise count updates.
+            current_centroids (np.ndarray): Current centroids (x, y) of the tracks, shape (N, 2).
+            track_ids (List[int]): Unique identifiers of the tracked objects.
+            prev_positions (np.ndarray): Last frame positions (x, y) of the tracks, shape (N, 2), NaN for new tracks.
+            clss (List[int]): Class indices for classwise count updates.
 
         Examples:
             >>> counter = ObjectCounter()
-            >>> track_line = {1: [100, 200], 2: [110, 210], 3: [120, 220]}
-            >>> box = [130, 230, 150, 250]
-            >>> track_id = 1
-            >>> prev_position = (120, 220)
-            >>> cls = 0
-            >>> counter.count_objects(current_centroid, track_id, prev_position, cls)
+            >>> current_centroids = np.array([[130, 240], [200, 300]])
+            >>> prev_positions = np.array([[120, 220], [np.nan, np.nan]])
+            >>> counter.count_objects(current_centroids, [1, 2], prev_positions, [0, 0])
         """
-        if prev_position is None or track_id in self.counted_ids:
+        if not len(track_ids):
             return
+        counted = np.array([t in self.counted_ids for t in track_ids], dtype=bool)
+        new = ~np.isnan(prev_positions).any(1) & ~counted
+        if self.r_s.is_line:  # Linear region, count tracks whose trajectory intersects the line
+            hits = new & self.r_s.intersects(prev_positions, current_centroids)
+        else:  # Polygonal region, count tracks whose centroid is inside the polygon
+            hits = new & self.r_s.contains(current_centroids)
+        inward = self.r_s.inward(prev_positions, current_centroids)  # right for vertical regions, down otherwise
+        event_type = "line_crossing" if self.r_s.is_line else "region_enter"
+
+        for i in np.nonzero(hits)[0]:
+            direction = "IN" if inward[i] else "OUT"
+            if inward[i]:
+                self.in_count += 1
+            else:
+                self.out_count += 1
+            self.classwise_counts[self.names[clss[i]]][direction] += 1
+            self.counted_ids.add(track_ids[i])
+            self.emit(event_type, track_ids[i], cls=clss[i], direction=direction)
+
+    def evict_tracks(self, track_ids):
+        """
+        Forgets the counted state of tracks evicted from the tracking history.
 
-        if len(self.region) == 2:  # Linear region (defined as a line segment)
-            line = self.LineString(self.region)  # Check if the line intersects the trajectory of the object
-            if line.intersects(self.LineString([prev_position, current_centroid])):
-                # Determine orientation of the region (vertical or horizontal)
-                if abs(self.region[0][0] - self.region[1][0]) < abs(self.region[0][1] - self.region[1][1]):
-                    # Vertical region: Compare x-coordinates to determine direction
-                    if current_centroid[0] > prev_position[0]:  # Moving right
-                        self.in_count += 1
-                        self.classwise_counts[self.names[cls]]["IN"] += 1
-                    else:  # Moving left
-                        self.out_count += 1
-                        self.classwise_counts[self.names[cls]]["OUT"] += 1
-                # Horizontal region: Compare y-coordinates to determine direction
-                elif current_centroid[1] > prev_position[1]:  # Moving downward
-                    self.in_count += 1
-                    self.classwise_counts[self.names[cls]]["IN"] += 1
-                else:  # Moving upward
-                    self.out_count += 1
-                    self.classwise_counts[self.names[cls]]["OUT"] += 1
-                self.counted_ids.append(track_id)
-
-        elif len(self.region) > 2:  # Polygonal region
-            polygon = self.Polygon(self.region)
-            if polygon.contains(self.Point(current_centroid)):
-                # Determine motion direction for vertical or horizontal polygons
-                region_width = max(p[0] for p in self.region) - min(p[0] for p in self.region)
-                region_height = max(p[1] for p in self.region) - min(p[1] for p in self.region)
-
-                if (
-                    region_width < region_height
-                    and current_centroid[0] > prev_position[0]
-                    or region_width >= region_height
-                    and current_centroid[1] > prev_position[1]
-                ):  # Moving right
-                    self.in_count += 1
-                    self.classwise_counts[self.names[cls]]["IN"] += 1
-                else:  # Moving left
-                    self.out_count += 1
-                    self.classwise_counts[self.names[cls]]["OUT"] += 1
-                self.counted_ids.append(track_id)
+        Args:
+            track_ids (List[int]): IDs of the evicted tracks.
+        """
+        self.counted_ids.difference_update(track_ids)
 
     def store_classwise_counts(self, cls):
         """
@@ -155,13 +143,15 @@ class ObjectCounter(BaseSolution):
         Processes input data (frames or object tracks) and updates object counts.
 
         This method initializes the counting region, extracts tracks, draws bounding boxes and regions, updates
-        object counts, and displays the results on the input image.
+        object counts, and displays the results on the input image. In headless mode (`render=False`) nothing is
+        drawn and the counts are returned instead.
 
         Args:
             im0 (numpy.ndarray): The input image or frame to be processed.
 
         Returns:
-            (numpy.ndarray): The processed image with annotations and count information.
+            (numpy.ndarray | SolutionResults): The processed image with annotations and count information, or the
+                counts and counting events of the frame if `render=False`.
 
         Examples:
             >>> counter = ObjectCounter()
@@ -172,32 +162,32 @@ class ObjectCounter(BaseSolution):
             self.initialize_region()
             self.region_initialized = True
 
-        self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
         self.extract_tracks(im0)  # Extract tracks
-
-        self.annotator.draw_region(
-            reg_pts=self.region, color=(104, 0, 123), thickness=self.line_width * 2
-        )  # Draw region
-
-        # Iterate over bounding boxes, track ids and classes index
-        for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
-            # Draw bounding box and counting region
-            self.annotator.box_label(box, label=self.names[cls], color=colors(cls, True))
-            self.store_tracking_history(track_id, box)  # Store track history
+        self.update_tracking_history()  # Store track history
+        for cls in self.clss:
             self.store_classwise_counts(cls)  # store classwise counts in dict
 
-            # Draw tracks of objects
-            self.annotator.draw_centroid_and_tracks(
-                self.track_line, color=colors(int(cls), True), track_thickness=self.line_width
-            )
-            current_centroid = ((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
-            # store previous position of track for object counting
-            prev_position = None
-            if len(self.track_history[track_id]) > 1:
-                prev_position = self.track_history[track_id][-2]
-            self.count_objects(current_centroid, track_id, prev_position, cls)  # Perform object counting
-
-        self.display_counts(im0)  # Display the counts on the frame
-        self.display_output(im0)  # display output with base class function
-
-        return im0  # return output image for more usage
+        current_centroids, prev_positions = self.track_positions()
+        self.count_objects(current_centroids, self.track_ids, prev_positions, self.clss)  # Perform object counting
+
+        if self.render:
+            self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
+            self.annotator.draw_region(
+                reg_pts=self.region, color=(104, 0, 123), thickness=self.line_width * 2
+            )  # Draw region
+
+            # Iterate over bounding boxes, track ids and classes index
+            for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
+                # Draw bounding box and tracks of objects
+                self.annotator.box_label(box, label=self.names[cls], color=colors(cls, True))
+                self.annotator.draw_centroid_and_tracks(
+                    self.track_history[track_id], color=colors(int(cls), True), track_thickness=self.line_width
+                )
+            self.display_counts(im0)  # Display the counts on the frame
+
+        return self.output(
+            im0,
+            in_count=self.in_count,
+            out_count=self.out_count,
+            classwise_count=self.classwise_counts,
+        )
@@ -5,7 +5,10 @@ import json
 import cv2
 import numpy as np
 
-from ultralytics.solutions.solutions import LOGGER, BaseSolution, check_requirements
+from ultralytics.solutions.geometry import RegionRaster
+from ultralytics.solutions.solutions import BaseSolution
+from ultralytics.utils import LOGGER
+from ultralytics.utils.checks import check_requirements
 from ultralytics.utils.plotting import Annotator
 
 
@@ -161,6 +164,8 @@ class ParkingManagement(BaseSolution):
         arc (Tuple[int, int, int]): RGB color tuple for available region visualization.
         occ (Tuple[int, int, int]): RGB color tuple for occupied region visualization.
         dc (Tuple[int, int, int]): RGB color tuple for centroid visualization of detected objects.
+        raster (RegionRaster | None): Label rasters of the parking regions, built on the first frame and again when
+            the frame size changes.
 
     Methods:
         process_data: Processes model data for parking lot management and visualization.
@@ -189,6 +194,7 @@ class ParkingManagement(BaseSolution):
         self.arc = (0, 0, 255)  # available region color
         self.occ = (0, 255, 0)  # occupied region color
         self.dc = (255, 0, 189)  # centroid color for each box
+        self.raster = None  # parking region label rasters, built for the frame size
 
     def process_data(self, im0):
         """
@@ -201,35 +207,42 @@ class ParkingManagement(BaseSolution):
         Args:
             im0 (np.ndarray): The input inference image.
 
+        Returns:
+            (np.ndarray | SolutionResults): The image annotated with parking regions and occupancy, or the number of
+                filled and available slots if `render=False`.
+
         Examples:
             >>> parking_manager = ParkingManagement(json_file="parking_regions.json")
             >>> image = cv2.imread("parking_lot.jpg")
             >>> parking_manager.process_data(image)
         """
         self.extract_tracks(im0)  # extract tracks from im0
-        es, fs = len(self.json), 0  # empty slots, filled slots
-        annotator = Annotator(im0, self.line_width)  # init annotator
-
-        for region in self.json:
-            # Convert points to a NumPy array with the correct dtype and reshape properly
-            pts_array = np.array(region["points"], dtype=np.int32).reshape((-1, 1, 2))
-            rg_occupied = False  # occupied region initialization
-            for box, cls in zip(self.boxes, self.clss):
-                xc, yc = int((box[0] + box[2]) / 2), int((box[1] + box[3]) / 2)
-                dist = cv2.pointPolygonTest(pts_array, (xc, yc), False)
-                if dist >= 0:
-                    # cv2.circle(im0, (xc, yc), radius=self.line_width * 4, color=self.dc, thickness=-1)
+        if self.raster is None or self.raster.shape != im0.shape[:2]:
+            self.raster = RegionRaster([region["points"] for region in self.json], im0.shape[:2])
+
+        # Find the first box centroid inside each region with one label raster lookup of all centroids
+        boxes = np.asarray(self.boxes, dtype=np.float64).reshape(-1, 4)
+        centroids = ((boxes[:, :2] + boxes[:, 2:]) / 2).astype(np.int32)
+        labels = self.raster.labels(centroids)[::-1]  # reversed so the first box of a region is assigned last
+        first = np.full(len(self.json), -1)
+        order = np.arange(len(labels))[::-1]
+        for layer in labels.T:
+            first[layer[layer >= 0]] = order[layer >= 0]
+        fs = int((first >= 0).sum())  # filled slots
+        es = len(self.json) - fs  # empty slots
+        self.pr_info["Occupancy"], self.pr_info["Available"] = fs, es
+
+        if self.render:
+            annotator = Annotator(im0, self.line_width)  # init annotator
+            for region, i in zip(self.json, first.tolist()):
+                pts_array = np.array(region["points"], dtype=np.int32).reshape((-1, 1, 2))
+                if i >= 0:
+                    xc, yc = centroids[i].tolist()
                     annotator.display_objects_labels(
-                        im0, self.model.names[int(cls)], (104, 31, 17), (255, 255, 255), xc, yc, 10
+                        im0, self.model.names[int(self.clss[i])], (104, 31, 17), (255, 255, 255), xc, yc, 10
                     )
-                    rg_occupied = True
-                    break
-            fs, es = (fs + 1, es - 1) if rg_occupied else (fs, es)
-            # Plotting regions
-            cv2.polylines(im0, [pts_array], isClosed=True, color=self.occ if rg_occupied else self.arc, thickness=2)
-
-        self.pr_info["Occupancy"], self.pr_info["Available"] = fs, es
+                # Plotting regions
+                cv2.polylines(im0, [pts_array], isClosed=True, color=self.occ if i >= 0 else self.arc, thickness=2)
 
-        annotator.display_analytics(im0, self.pr_info, (104, 31, 17), (255, 255, 255), 10)
-        self.display_output(im0)  # display output with base class function
-        return im0  # return output image for more usage
+            annotator.display_analytics(im0, self.pr_info, (104, 31, 17), (255, 255, 255), 10)
+        return self.output(im0, filled_slots=fs, available_slots=es)
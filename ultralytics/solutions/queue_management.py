@@ -1,5 +1,7 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import numpy as np
+
 from ultralytics.solutions.solutions import BaseSolution
 from ultralytics.utils.plotting import Annotator, colors
 
@@ -9,21 +11,32 @@ class QueueManager(BaseSolution):
     Manages queue counting in real-time video streams based on object tracks.
 
     This class extends BaseSolution to provide functionality for tracking and counting objects within a specified
-    region in video frames.
+    region in video frames. The entry time of each object in the queue is kept in arrays, and the dwell times of
+    objects leaving the queue are kept in a fixed-size ring buffer, so wait statistics over many lanes and long streams
+    are updated incrementally in constant memory.
 
     Attributes:
         counts (int): The current count of objects in the queue.
+        queue_ids (np.ndarray): IDs of the tracks in the queue.
+        entry_times (np.ndarray): Time in seconds each track in the queue entered it.
+        last_times (np.ndarray): Time in seconds each track in the queue was last seen inside it.
+        dwell_times (np.ndarray): Ring buffer of the dwell times in seconds of the last `dwell_window` tracks that left.
+        num_dwells (int): Total number of tracks that left the queue.
+        dwell_percentile (float): Percentile of the dwell times reported by `dwell_stats`, i.e. 90.
         rect_color (Tuple[int, int, int]): RGB color tuple for drawing the queue region rectangle.
         region_length (int): The number of points defining the queue region.
         annotator (Annotator): An instance of the Annotator class for drawing on frames.
-        track_line (List[Tuple[int, int]]): List of track line coordinates.
-        track_history (Dict[int, List[Tuple[int, int]]]): Dictionary storing tracking history for each object.
+        track_history (TrackHistory): Bounded centroid history of each track.
 
     Methods:
         initialize_region: Initializes the queue region.
         process_queue: Processes a single frame for queue management.
+        update_dwell: Updates the queue membership and dwell times of all tracks of a frame.
+        exit_queue: Records the dwell times of tracks leaving the queue.
+        evict_tracks: Records tracks evicted from the tracking history as leaving the queue.
+        dwell_stats: Returns the mean, percentile and current longest wait.
         extract_tracks: Extracts object tracks from the current frame.
-        store_tracking_history: Stores the tracking history for an object.
+        update_tracking_history: Stores the tracking history of all current tracks.
         display_output: Displays the processed output.
 
     Examples:
@@ -41,28 +54,109 @@ class QueueManager(BaseSolution):
         self.rect_color = (255, 255, 255)  # Rectangle color
         self.region_length = len(self.region)  # Store region length for further usage
 
-    def process_queue(self, im0):
+        self.queue_ids = np.zeros(0, dtype=np.int64)
+        self.entry_times = np.zeros(0, dtype=np.float64)
+        self.last_times = np.zeros(0, dtype=np.float64)
+        self.dwell_times = np.zeros(self.CFG["dwell_window"], dtype=np.float64)
+        self.num_dwells = 0
+        self.dwell_percentile = self.CFG["dwell_percentile"]
+        self.t = 0.0  # time of the current frame in seconds
+
+    def update_dwell(self, inside_ids):
+        """
+        Updates the queue membership and dwell times from the tracks inside the queue region in the current frame.
+
+        Tracks missing from the frame stay in the queue until they reappear outside it or are evicted, so detection
+        dropouts do not split one wait into several.
+
+        Args:
+            inside_ids (np.ndarray): IDs of the tracks inside the queue region.
+        """
+        inside_ids = np.asarray(inside_ids, dtype=np.int64)
+        member = np.isin(self.queue_ids, inside_ids)
+        self.last_times[member] = self.t
+        left = ~member & np.isin(self.queue_ids, np.asarray(self.track_ids, dtype=np.int64))
+        if left.any():
+            self.exit_queue(left)
+        new = inside_ids[~np.isin(inside_ids, self.queue_ids)]
+        if len(new):
+            self.queue_ids = np.concatenate([self.queue_ids, new])
+            self.entry_times = np.concatenate([self.entry_times, np.full(len(new), self.t)])
+            self.last_times = np.concatenate([self.last_times, np.full(len(new), self.t)])
+
+    def exit_queue(self, mask):
+        """
+        Records the dwell times of tracks leaving the queue, emits 'dwell' events and removes them from the queue.
+
+        The dwell time spans from the first to the last frame a track was seen inside the queue, both included.
+
+        Args:
+            mask (np.ndarray): Boolean mask of the tracks in `queue_ids` leaving the queue.
+        """
+        dwell = self.last_times[mask] - self.entry_times[mask] + 1 / self.fps
+        for track_id, value in zip(self.queue_ids[mask].tolist(), dwell.tolist()):
+            self.emit("dwell", track_id, value=value)
+        n = len(self.dwell_times)
+        self.num_dwells += len(dwell)
+        recent = dwell[-n:]  # ring buffer slots of the newest dwell times
+        self.dwell_times[(self.num_dwells - len(recent) + np.arange(len(recent))) % n] = recent
+        self.queue_ids = self.queue_ids[~mask]
+        self.entry_times = self.entry_times[~mask]
+        self.last_times = self.last_times[~mask]
+
+    def evict_tracks(self, track_ids):
+        """
+        Records tracks evicted from the tracking history while in the queue as leaving it.
+
+        Args:
+            track_ids (List[int]): IDs of the evicted tracks.
+        """
+        mask = np.isin(self.queue_ids, np.asarray(track_ids, dtype=np.int64))
+        if mask.any():
+            self.exit_queue(mask)
+
+    def dwell_stats(self):
+        """
+        Returns the wait statistics of the queue.
+
+        Returns:
+            (Dict[str, float]): Mean and `dwell_percentile` percentile of the dwell times in seconds of the last
+                `dwell_window` tracks that left the queue, the current longest wait in seconds of the tracks in the
+                queue and the total number of tracks that left it, i.e. {'mean': 41.2, 'p90': 75.0, 'longest': 63.5,
+                'completed': 112}.
+
+        Examples:
+            >>> queue_manager = QueueManager(region=[(20, 400), (1080, 400), (1080, 360), (20, 360)], fps=30)
+            >>> stats = queue_manager.dwell_stats()
+        """
+        recent = self.dwell_times[: min(self.num_dwells, len(self.dwell_times))]
+        pct = self.dwell_percentile
+        return {
+            "mean": float(recent.mean()) if len(recent) else 0.0,
+            f"p{pct:g}": float(np.percentile(recent, pct)) if len(recent) else 0.0,
+            "longest": float(self.t - self.entry_times.min() + 1 / self.fps) if len(self.queue_ids) else 0.0,
+            "completed": self.num_dwells,
+        }
+
+    def process_queue(self, im0, timestamp=None):
         """
         Processes the queue management for a single frame of video.
 
         Args:
             im0 (numpy.ndarray): Input image for processing, typically a frame from a video stream.
+            timestamp (float, optional): Source timestamp of the frame in seconds, i.e.
+                `cap.get(cv2.CAP_PROP_POS_MSEC) / 1000`. Derived from the frame number and `fps` if not given.
 
         Returns:
-            (numpy.ndarray): Processed image with annotations, bounding boxes, and queue counts.
+            (numpy.ndarray | SolutionResults): Processed image with annotations, bounding boxes, and queue counts, or
+                the queue count and wait statistics if `render=False`.
 
         This method performs the following steps:
         1. Resets the queue count for the current frame.
-        2. Initializes an Annotator object for drawing on the image.
-        3. Extracts tracks from the image.
-        4. Draws the counting region on the image.
-        5. For each detected object:
-           - Draws bounding boxes and labels.
-           - Stores tracking history.
-           - Draws centroids and tracks.
-           - Checks if the object is inside the counting region and updates the count.
-        6. Displays the queue count on the image.
-        7. Displays the processed output.
+        2. Extracts tracks from the image and stores their tracking history.
+        3. Counts the objects inside the queue region for all tracks at once and updates their dwell times.
+        4. If rendering, draws the region, bounding boxes, labels, tracks and queue count on the image and displays
+           the processed output.
 
         Examples:
             >>> queue_manager = QueueManager()
@@ -70,40 +164,36 @@ class QueueManager(BaseSolution):
             >>> processed_frame = queue_manager.process_queue(frame)
         """
         self.counts = 0  # Reset counts every frame
-        self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
         self.extract_tracks(im0)  # Extract tracks
-
-        self.annotator.draw_region(
-            reg_pts=self.region, color=self.rect_color, thickness=self.line_width * 2
-        )  # Draw region
-
-        for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
-            # Draw bounding box and counting region
-            self.annotator.box_label(box, label=self.names[cls], color=colors(track_id, True))
-            self.store_tracking_history(track_id, box)  # Store track history
-
-            # Draw tracks of objects
-            self.annotator.draw_centroid_and_tracks(
-                self.track_line, color=colors(int(track_id), True), track_thickness=self.line_width
+        self.t = self.track_history.frame / self.fps if timestamp is None else timestamp  # first frame at t=0
+        self.update_tracking_history(self.t)  # Store track history
+
+        # Count tracks with a previous position whose current centroid is inside the queue region
+        if self.region_length >= 3:
+            current, previous = self.track_positions()
+            inside = self.r_s.contains(current) & ~np.isnan(previous).any(1)
+            self.counts = int(inside.sum())
+            self.update_dwell(np.asarray(self.track_ids, dtype=np.int64)[inside])
+
+        if self.render:
+            self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
+            self.annotator.draw_region(
+                reg_pts=self.region, color=self.rect_color, thickness=self.line_width * 2
+            )  # Draw region
+
+            for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
+                # Draw bounding box and tracks of objects
+                self.annotator.box_label(box, label=self.names[cls], color=colors(track_id, True))
+                self.annotator.draw_centroid_and_tracks(
+                    self.track_history[track_id], color=colors(int(track_id), True), track_thickness=self.line_width
+                )
+
+            # Display queue counts
+            self.annotator.queue_counts_display(
+                f"Queue Counts : {str(self.counts)}",
+                points=self.region,
+                region_color=self.rect_color,
+                txt_color=(104, 31, 17),
             )
 
-            # Cache frequently accessed attributes
-            track_history = self.track_history.get(track_id, [])
-
-            # store previous position of track and check if the object is inside the counting region
-            prev_position = None
-            if len(track_history) > 1:
-                prev_position = track_history[-2]
-            if self.region_length >= 3 and prev_position and self.r_s.contains(self.Point(self.track_line[-1])):
-                self.counts += 1
-
-        # Display queue counts
-        self.annotator.queue_counts_display(
-            f"Queue Counts : {str(self.counts)}",
-            points=self.region,
-            region_color=self.rect_color,
-            txt_color=(104, 31, 17),
-        )
-        self.display_output(im0)  # display output with base class function
-
-        return im0  # return output image for more usage
+        return self.output(im0, queue_count=self.counts, queue_dwell=self.dwell_stats())
@@ -1,5 +1,8 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
+import numpy as np
+
+from ultralytics.solutions.geometry import Region, RegionRaster
 from ultralytics.solutions.solutions import BaseSolution
 from ultralytics.utils.plotting import Annotator, colors
 
@@ -17,10 +20,17 @@ class RegionCounter(BaseSolution):
                                 the name, polygon coordinates, and display colors.
         counting_regions (list): A list storing all defined regions, where each entry is based on `region_template`
                                  and includes specific region settings like name, coordinates, and color.
+        raster (RegionRaster | None): Label rasters of all regions, built on the first frame and again when the frame
+                                      size changes.
+        occupancy (Dict[Tuple[int, int], List[int]]): Entry frame, last frame inside and class index of each track
+                                                      inside a region, keyed by track ID and region index.
 
     Methods:
         add_region: Adds a new counting region with specified attributes, such as the region's name, polygon points,
                     region color, and text color.
+        update_occupancy: Emits region enter and exit events from the regions containing each track.
+        exit_regions: Emits region exit events with dwell times.
+        evict_tracks: Emits region exit events for evicted tracks still inside a region.
         count: Processes video frames to count objects in each region, drawing regions and displaying counts
                on the frame. Handles object detection, region definition, and containment checks.
     """
@@ -30,6 +40,7 @@ class RegionCounter(BaseSolution):
         super().__init__(**kwargs)
         self.region_template = {
             "name": "Default Region",
+            "points": None,
             "polygon": None,
             "counts": 0,
             "dragging": False,
@@ -37,6 +48,8 @@ class RegionCounter(BaseSolution):
             "text_color": (0, 0, 0),
         }
         self.counting_regions = []
+        self.raster = None
+        self.occupancy = {}
 
     def add_region(self, name, polygon_points, region_color, text_color):
         """
@@ -52,13 +65,59 @@ class RegionCounter(BaseSolution):
         region.update(
             {
                 "name": name,
-                "polygon": self.Polygon(polygon_points),
+                "points": polygon_points,
+                "polygon": Region(polygon_points),
                 "region_color": region_color,
                 "text_color": text_color,
             }
         )
         self.counting_regions.append(region)
 
+    def update_occupancy(self, labels):
+        """
+        Emits 'region_enter' events for tracks entering a region and 'region_exit' events for tracks leaving one.
+
+        Tracks missing from the frame stay inside their regions until they reappear elsewhere or are evicted, so
+        detection dropouts do not split one stay into several.
+
+        Args:
+            labels (np.ndarray): Indices of the regions containing each track of the frame, shape (N, L), -1 for none.
+        """
+        frame = self.track_history.frame
+        rows, cols = np.nonzero(labels >= 0)
+        current = set(zip(np.asarray(self.track_ids, dtype=np.int64)[rows].tolist(), labels[rows, cols].tolist()))
+        clss = dict(zip(self.track_ids, self.clss))
+        for key in current:
+            if key in self.occupancy:
+                self.occupancy[key][1] = frame
+            else:
+                self.occupancy[key] = [frame, frame, clss[key[0]]]
+                self.emit("region_enter", key[0], cls=clss[key[0]], region=self.counting_regions[key[1]]["name"])
+        present = set(self.track_ids)
+        self.exit_regions([key for key in self.occupancy if key[0] in present and key not in current])
+
+    def exit_regions(self, keys):
+        """
+        Emits 'region_exit' events with the dwell time in seconds and removes the tracks from the regions.
+
+        Args:
+            keys (List[Tuple[int, int]]): Track ID and region index of each exit.
+        """
+        for track_id, idx in keys:
+            entry, last, cls = self.occupancy.pop((track_id, idx))
+            name = self.counting_regions[idx]["name"]
+            self.emit("region_exit", track_id, cls=cls, region=name, value=(last - entry + 1) / self.fps)
+
+    def evict_tracks(self, track_ids):
+        """
+        Emits region exit events for tracks evicted from the tracking history while inside a region.
+
+        Args:
+            track_ids (List[int]): IDs of the evicted tracks.
+        """
+        evicted = set(track_ids)
+        self.exit_regions([key for key in self.occupancy if key[0] in evicted])
+
     def count(self, im0):
         """
         Processes the input frame to detect and count objects within each defined region.
@@ -67,10 +126,11 @@ class RegionCounter(BaseSolution):
             im0 (numpy.ndarray): Input image frame where objects and regions are annotated.
 
         Returns:
-           im0 (numpy.ndarray): Processed image frame with annotated counting information.
+           (numpy.ndarray | SolutionResults): Processed image frame with annotated counting information, or the
+                number of objects in each region if `render=False`.
         """
-        self.annotator = Annotator(im0, line_width=self.line_width)
         self.extract_tracks(im0)
+        self.update_tracking_history()  # advances the frame and evicts expired tracks
 
         # Region initialization and conversion
         if self.region is None:
@@ -79,34 +139,38 @@ class RegionCounter(BaseSolution):
         else:
             regions = self.region if isinstance(self.region, dict) else {"Region#01": self.region}
 
-        # Draw regions and process counts for each defined area
-        for idx, (region_name, reg_pts) in enumerate(regions.items(), start=1):
-            color = colors(idx, True)
-            self.annotator.draw_region(reg_pts=reg_pts, color=color, thickness=self.line_width * 2)
-            self.add_region(region_name, reg_pts, color, self.annotator.get_txt_color())
-
-        # Prepare regions for containment check
-        for region in self.counting_regions:
-            region["prepared_polygon"] = self.prep(region["polygon"])
-
-        # Process bounding boxes and count objects within each region
-        for box, cls in zip(self.boxes, self.clss):
-            self.annotator.box_label(box, label=self.names[cls], color=colors(cls, True))
-            bbox_center = ((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
-
+        # Build regions once on the first frame
+        if self.render:
+            self.annotator = Annotator(im0, line_width=self.line_width)
+        if len(self.counting_regions) < len(regions):
+            txt_color = self.annotator.get_txt_color() if self.render else self.region_template["text_color"]
+            for idx, (region_name, reg_pts) in enumerate(regions.items(), start=1):
+                self.add_region(region_name, reg_pts, colors(idx, True), txt_color)
+
+        if self.raster is None or self.raster.shape != im0.shape[:2]:
+            self.raster = RegionRaster([region["points"] for region in self.counting_regions], im0.shape[:2])
+
+        # Count objects within each region with one label raster lookup of all box centers
+        boxes = np.asarray(self.boxes, dtype=np.float64).reshape(-1, 4)
+        labels = self.raster.labels((boxes[:, :2] + boxes[:, 2:]) / 2)
+        counts = np.bincount(labels[labels >= 0], minlength=len(self.counting_regions))
+        self.update_occupancy(labels)
+        for region, n in zip(self.counting_regions, counts.tolist()):
+            region["counts"] = n
+        region_counts = {region["name"]: region["counts"] for region in self.counting_regions}
+
+        if self.render:
+            # Draw regions, bounding boxes and counts in each region
+            for idx, reg_pts in enumerate(regions.values(), start=1):
+                self.annotator.draw_region(reg_pts=reg_pts, color=colors(idx, True), thickness=self.line_width * 2)
+            for box, cls in zip(self.boxes, self.clss):
+                self.annotator.box_label(box, label=self.names[cls], color=colors(cls, True))
             for region in self.counting_regions:
-                if region["prepared_polygon"].contains(self.Point(bbox_center)):
-                    region["counts"] += 1
-
-        # Display counts in each region
-        for region in self.counting_regions:
-            self.annotator.text_label(
-                region["polygon"].bounds,
-                label=str(region["counts"]),
-                color=region["region_color"],
-                txt_color=region["text_color"],
-            )
-            region["counts"] = 0  # Reset count for next frame
-
-        self.display_output(im0)
-        return im0
+                self.annotator.text_label(
+                    region["polygon"].bounds,
+                    label=str(region["counts"]),
+                    color=region["region_color"],
+                    txt_color=region["text_color"],
+                )
+
+        return self.output(im0, region_counts=region_counts)
@@ -0,0 +1,129 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+from ultralytics import YOLO
+from ultralytics.cfg import SOLUTION_MAP
+from ultralytics.solutions.events import build_sink
+from ultralytics.trackers.track import TRACKER_MAP, update_results
+from ultralytics.utils import DEFAULT_SOL_DICT, IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
+
+
+class SolutionRunner:
+    """
+    Run an Ultralytics Solution on many video streams with batched inference through one shared model.
+
+    The latest frames of all streams are detected together in batches, tracked by a separate tracker per stream and
+    then passed to the solution instance of each stream. Solution logic and state stay per stream, while the detector
+    runs at a larger batch size instead of one batch=1 `model.track()` call per camera.
+
+    Attributes:
+        model (YOLO): Detection model shared by all streams.
+        solution (str): Solution name, one of the `yolo solutions` names, i.e. 'count' or 'heatmap'.
+        method (str): Name of the solution method processing a frame, i.e. 'count' for ObjectCounter.
+        solutions (Dict[str, BaseSolution]): Solution instance of each stream.
+        trackers (Dict[str, BYTETracker | BOTSORT]): Tracker of each stream.
+        batch (int): Maximum number of frames per inference batch.
+        frame_counts (Dict[str, int]): Number of frames processed per stream.
+        predict_args (Dict[str, Any]): Arguments passed to `model.predict()`.
+        event_sink (EventSink | None): Sink shared by all streams, events are tagged with the stream name.
+
+    Methods:
+        __call__: Processes the latest frames of any number of streams and returns the solution output of each.
+        close: Flushes and closes the event sink.
+
+    Examples:
+        >>> from ultralytics.solutions import SolutionRunner
+        >>> runner = SolutionRunner("count", streams=["cam0", "cam1"], region=[(20, 400), (1080, 400)], render=False)
+        >>> outputs = runner({"cam0": frame0, "cam1": frame1})
+        >>> print(outputs["cam0"].in_count, outputs["cam1"].in_count)
+    """
+
+    def __init__(
+        self,
+        solution="count",
+        streams=("0",),
+        model="yolo11n.pt",
+        tracker="bytetrack.yaml",
+        batch=16,
+        frame_rate=30,
+        **kwargs,
+    ):
+        """
+        Initialize the runner with a shared model and one solution instance and tracker per stream.
+
+        Args:
+            solution (str): Solution name, one of 'count', 'heatmap', 'queue', 'speed', 'workout' or 'analytics'.
+            streams (Iterable[str]): Unique names of the video streams.
+            model (str): Path to the YOLO model shared by all streams.
+            tracker (str): Tracker YAML file, i.e. 'bytetrack.yaml' or 'botsort.yaml'.
+            batch (int): Maximum number of frames per inference batch.
+            frame_rate (int): Frame rate of the streams, used by the trackers to size their track buffers and as the
+                default `fps` of the solutions, i.e. to convert frame numbers to time for speed estimation.
+            **kwargs (Any): Solution arguments, i.e. `region` or `render`, applied to every stream. An `event_sink` is
+                built once and shared by the solutions of all streams.
+        """
+        if not SOLUTION_MAP.get(solution):
+            raise ValueError(f"Invalid solution '{solution}', valid solutions are {list(SOLUTION_MAP)[:-1]}.")
+        from ultralytics import solutions
+
+        self.solution = solution
+        cls, self.method = SOLUTION_MAP[solution]
+        self.model = YOLO(model)
+        kwargs.setdefault("fps", frame_rate)
+        batch_events = kwargs.get("event_batch", DEFAULT_SOL_DICT["event_batch"])
+        self.event_sink = build_sink(kwargs.pop("event_sink", None), batch_events)  # one sink for all streams
+        self.solutions = {}
+        for s in streams:
+            self.solutions[s] = getattr(solutions, cls)(model=self.model, event_sink=self.event_sink, **kwargs)
+            self.solutions[s].stream = s
+
+        cfg = IterableSimpleNamespace(**yaml_load(check_yaml(tracker)))
+        if cfg.tracker_type not in TRACKER_MAP:
+            raise AssertionError(f"Only 'bytetrack' and 'botsort' are supported for now, but got '{cfg.tracker_type}'")
+        self.trackers = {s: TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate) for s in self.solutions}
+        self.batch = batch
+        self.frame_counts = dict.fromkeys(self.solutions, 0)
+
+        args = next(iter(self.solutions.values())).CFG
+        self.predict_args = {
+            "conf": args["conf"] or 0.1,  # ByteTrack-based method needs low confidence predictions as input
+            "classes": args["classes"],
+            "imgsz": args["imgsz"],
+            "device": args["device"],
+            "half": args["half"],
+            "verbose": False,
+        }
+
+    def __call__(self, frames):
+        """
+        Detect the frames of all given streams in batches, track them per stream and run the solution of each stream.
+
+        Args:
+            frames (Dict[str, np.ndarray]): Latest BGR frame of each stream to process, any subset of the streams.
+
+        Returns:
+            (Dict[str, np.ndarray | SolutionResults]): Output of the solution of each stream, an annotated frame or
+                per-frame results in headless mode.
+        """
+        names = list(frames)
+        results = []
+        for i in range(0, len(names), self.batch):
+            results.extend(self.model.predict([frames[n] for n in names[i : i + self.batch]], **self.predict_args))
+
+        is_obb = self.model.task == "obb"
+        outputs = {}
+        for name, result in zip(names, results):
+            solution = self.solutions[name]
+            solution.external_tracks = [update_results(self.trackers[name], result, frames[name], is_obb)]
+            self.frame_counts[name] += 1
+            process = getattr(solution, self.method)
+            if self.solution == "analytics":
+                outputs[name] = process(frames[name], self.frame_counts[name])
+            else:
+                outputs[name] = process(frames[name])
+        return outputs
+
+    def close(self):
+        """Flush the buffered events of all streams and close the event sink."""
+        if self.event_sink is not None:
+            self.event_sink.close()
@@ -1,12 +1,18 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
-from collections import defaultdict
+import weakref
 
 import cv2
+import numpy as np
 
 from ultralytics import YOLO
+from ultralytics.engine.model import Model
 from ultralytics.utils import ASSETS_URL, DEFAULT_CFG_DICT, DEFAULT_SOL_DICT, LOGGER
-from ultralytics.utils.checks import check_imshow, check_requirements
+from ultralytics.utils.checks import check_imshow
+
+from .events import EventSink, build_sink
+from .geometry import Region
+from .history import TrackHistory
 
 
 class BaseSolution:
@@ -17,22 +23,34 @@ class BaseSolution:
     and region initialization.
 
     Attributes:
-        LineString (shapely.geometry.LineString): Class for creating line string geometries.
-        Polygon (shapely.geometry.Polygon): Class for creating polygon geometries.
-        Point (shapely.geometry.Point): Class for creating point geometries.
         CFG (Dict): Configuration dictionary loaded from a YAML file and updated with kwargs.
         region (List[Tuple[int, int]]): List of coordinate tuples defining a region of interest.
+        r_s (Region): Vectorized geometry of the region or line, set by `initialize_region`.
         line_width (int): Width of lines used in visualizations.
-        model (ultralytics.YOLO): Loaded YOLO model instance.
+        model (ultralytics.YOLO): Loaded YOLO model instance, may be shared with other solutions.
         names (Dict[int, str]): Dictionary mapping class indices to class names.
         env_check (bool): Flag indicating whether the environment supports image display.
-        track_history (collections.defaultdict): Dictionary to store tracking history for each object.
+        track_history (TrackHistory): Bounded centroid history of each track, evicting tracks unseen for `track_ttl`
+            frames.
+        external_tracks (List[Results] | None): Tracking results for the next frame provided externally, i.e. by
+            `SolutionRunner`, used instead of running the model.
+        render (bool): Whether to draw annotations and return annotated frames, or return `SolutionResults` only.
+        fps (float): Frame rate used to convert frame numbers to time, i.e. for dwell times.
+        stream (str | None): Name of the video stream, recorded in events to aggregate many cameras.
+        events (List[Dict]): Events of the current frame, see `emit`.
+        event_sink (EventSink | None): Sink the events of each frame are written to, None to only return them.
 
     Methods:
         extract_tracks: Apply object tracking and extract tracks from an input image.
+        update_tracking_history: Store the centroids of all current tracks and evict expired tracks.
         store_tracking_history: Store object tracking history for a given track ID and bounding box.
+        evict_tracks: Remove the per-track state of evicted tracks.
+        emit: Record an event of the current frame.
+        track_positions: Return current and previous centroids of all current tracks as arrays.
         initialize_region: Initialize the counting region and line segment based on configuration.
         display_output: Display the results of processing, including showing frames or saving results.
+        output: Return the annotated frame, or the per-frame results in headless mode.
+        close: Flush and close the event sink built by the solution.
 
     Examples:
         >>> solution = BaseSolution(model="yolov8n.pt", region=[(0, 0), (100, 0), (100, 100), (0, 100)])
@@ -48,14 +66,8 @@ class BaseSolution:
 
         IS_CLI (optional): Enables CLI mode if set.
         """
-        check_requirements("shapely>=2.0.0")
-        from shapely.geometry import LineString, Point, Polygon
-        from shapely.prepared import prep
-
-        self.LineString = LineString
-        self.Polygon = Polygon
-        self.Point = Point
-        self.prep = prep
+        model = kwargs.pop("model") if isinstance(kwargs.get("model"), Model) else None  # loaded model instance
+        sink = kwargs.pop("event_sink") if isinstance(kwargs.get("event_sink"), EventSink) else None  # shared sink
 
         # Load config and update with args
         DEFAULT_SOL_DICT.update(kwargs)
@@ -69,10 +81,13 @@ class BaseSolution:
         )  # Store line_width for usage
 
         # Load Model and store classes names
-        if self.CFG["model"] is None:
+        if model is not None:
+            self.CFG["model"] = str(model.model_name)
+        elif self.CFG["model"] is None:
             self.CFG["model"] = "yolo11n.pt"
-        self.model = YOLO(self.CFG["model"])
+        self.model = model or YOLO(self.CFG["model"])
         self.names = self.model.names
+        self.external_tracks = None
 
         if IS_CLI and self.CFG["source"] is None:
             d_s = "solutions_ci_demo.mp4" if "-pose" not in self.CFG["model"] else "solution_ci_pose_demo.mp4"
@@ -82,14 +97,25 @@ class BaseSolution:
             safe_download(f"{ASSETS_URL}/{d_s}")  # download source from ultralytics assets
             self.CFG["source"] = d_s  # set default source
 
-        # Initialize environment and region setup
-        self.env_check = check_imshow(warn=True)
-        self.track_history = defaultdict(list)
+        # Initialize environment and region setup, headless solutions never draw or display frames
+        self.render = self.CFG["render"]
+        self.env_check = check_imshow(warn=True) if self.render else False
+        self.track_history = TrackHistory(maxlen=30, ttl=self.CFG["track_ttl"])
+
+        # Events are collected per frame and written to the sink in batches by `output`
+        self.fps = self.CFG["fps"]
+        self.stream = None if self.CFG["source"] is None else str(self.CFG["source"])
+        self.events = []
+        self.event_sink = sink or build_sink(self.CFG["event_sink"], self.CFG["event_batch"])
+        owned = sink is None and self.event_sink is not None  # shared sinks are closed by their owner
+        self._close_sink = weakref.finalize(self, self.event_sink.close) if owned else None  # also on collection
 
     def extract_tracks(self, im0):
         """
         Applies object tracking and extracts tracks from an input image or frame.
 
+        If `external_tracks` is set, the given tracking results are used once instead of running the model.
+
         Args:
             im0 (ndarray): The input image or frame.
 
@@ -98,7 +124,10 @@ class BaseSolution:
             >>> frame = cv2.imread("path/to/image.jpg")
             >>> solution.extract_tracks(frame)
         """
-        self.tracks = self.model.track(source=im0, persist=True, classes=self.CFG["classes"])
+        if self.external_tracks is not None:
+            self.tracks, self.external_tracks = self.external_tracks, None
+        else:
+            self.tracks = self.model.track(source=im0, persist=True, classes=self.CFG["classes"])
 
         # Extract tracks for OBB or object detection
         self.track_data = self.tracks[0].obb or self.tracks[0].boxes
@@ -111,12 +140,33 @@ class BaseSolution:
             LOGGER.warning("WARNING ⚠️ no tracks found!")
             self.boxes, self.clss, self.track_ids = [], [], []
 
+    def update_tracking_history(self, t=None):
+        """
+        Stores the centroids of all current tracks in the tracking history and evicts expired tracks.
+
+        Each call advances the history by one frame. Tracks not seen for `track_ttl` frames are removed from the
+        history and passed to `evict_tracks`, so per-track state does not grow on long-running streams.
+
+        Args:
+            t (float, optional): Timestamp of the frame stored with the centroids, defaults to the frame number.
+
+        Examples:
+            >>> solution = BaseSolution()
+            >>> solution.extract_tracks(frame)
+            >>> solution.update_tracking_history()
+        """
+        boxes = np.asarray(self.boxes, dtype=np.float32).reshape(-1, 4)
+        evicted = self.track_history.update(self.track_ids, (boxes[:, :2] + boxes[:, 2:]) / 2, t)
+        if evicted:
+            self.evict_tracks(evicted)
+
     def store_tracking_history(self, track_id, box):
         """
         Stores the tracking history of an object.
 
-        This method updates the tracking history for a given object by appending the center point of its
-        bounding box to the track line. It maintains a maximum of 30 points in the tracking history.
+        This method appends the center point of the bounding box to the ring buffer of the track, which keeps a maximum
+        of 30 points. It does not advance the history by a frame, use `update_tracking_history` to store all tracks of
+        a frame at once.
 
         Args:
             track_id (int): The unique identifier for the tracked object.
@@ -126,19 +176,65 @@ class BaseSolution:
             >>> solution = BaseSolution()
             >>> solution.store_tracking_history(1, [100, 200, 300, 400])
         """
-        # Store tracking history
+        self.track_history.append([track_id], [((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)])
         self.track_line = self.track_history[track_id]
-        self.track_line.append(((box[0] + box[2]) / 2, (box[1] + box[3]) / 2))
-        if len(self.track_line) > 30:
-            self.track_line.pop(0)
+
+    def evict_tracks(self, track_ids):
+        """
+        Removes the per-track state of tracks evicted from the tracking history, extended by solutions with state.
+
+        Args:
+            track_ids (List[int]): IDs of the evicted tracks.
+        """
+
+    def emit(self, event_type, track_id, cls=None, region=None, direction=None, value=None):
+        """
+        Record an event of the current frame, written to the event sink and returned in the results by `output`.
+
+        Args:
+            event_type (str): Event type, one of `EVENT_TYPES`, i.e. 'line_crossing' or 'region_exit'.
+            track_id (int): ID of the track the event belongs to.
+            cls (int, optional): Class index of the track.
+            region (str, optional): Name of the region of region events.
+            direction (str, optional): Crossing direction, 'IN' or 'OUT'.
+            value (float, optional): Measured value, i.e. the speed in km/h or the dwell time in seconds.
+
+        Examples:
+            >>> with ObjectCounter(event_sink="events.jsonl") as counter:  # writes the last events when closed
+            ...     counter.emit("line_crossing", 7, cls=2, direction="IN")
+        """
+        self.events.append(
+            {
+                "type": event_type,
+                "stream": self.stream,
+                "frame": self.track_history.frame,
+                "track_id": int(track_id),
+                "cls": None if cls is None else int(cls),
+                "region": region,
+                "direction": direction,
+                "value": None if value is None else float(value),
+            }
+        )
+
+    def track_positions(self):
+        """
+        Return the current and previous centroids of all current tracks from the tracking history.
+
+        Returns:
+            current (np.ndarray): Current centroids of shape (N, 2).
+            previous (np.ndarray): Previous centroids of shape (N, 2), NaN for tracks without a previous position.
+
+        Examples:
+            >>> solution = BaseSolution()
+            >>> current, previous = solution.track_positions()
+        """
+        return self.track_history.last(self.track_ids), self.track_history.last(self.track_ids, 1)
 
     def initialize_region(self):
         """Initialize the counting region and line segment based on configuration settings."""
         if self.region is None:
             self.region = [(20, 400), (1080, 400), (1080, 360), (20, 360)]
-        self.r_s = (
-            self.Polygon(self.region) if len(self.region) >= 3 else self.LineString(self.region)
-        )  # region or line
+        self.r_s = Region(self.region)  # region or line
 
     def display_output(self, im0):
         """
@@ -164,3 +260,118 @@ class BaseSolution:
             cv2.imshow("Ultralytics Solutions", im0)
             if cv2.waitKey(1) & 0xFF == ord("q"):
                 return
+
+    def output(self, im0, **kwargs):
+        """
+        Return the processed frame, or the per-frame results when the solution runs headless.
+
+        The events of the frame are passed to the event sink, if any, and the event list is reset for the next frame.
+
+        Args:
+            im0 (numpy.ndarray): The processed and annotated image or frame.
+            **kwargs (Any): Per-frame results of the solution, i.e. counts, passed to `SolutionResults`.
+
+        Returns:
+            (numpy.ndarray | SolutionResults): The annotated frame if `render=True`, otherwise the per-frame results.
+
+        Examples:
+            >>> counter = ObjectCounter(render=False)
+            >>> results = counter.count(frame)
+            >>> print(results.in_count, results.out_count)
+        """
+        events, self.events = self.events, []
+        if self.event_sink is not None and events:
+            self.event_sink.write(events)
+        if self.render:
+            self.display_output(im0)  # display output with base class function
+            return im0  # return output image for more usage
+        return SolutionResults(total_tracks=len(self.track_ids), events=events, **kwargs)
+
+    def close(self):
+        """
+        Flush and close the event sink if the solution built it from `event_sink`, shared sinks are left open.
+
+        Buffered events are only written once a batch is full, and Parquet files are only complete once closed, so
+        solutions with an event sink are closed after the last frame, or used as context managers. Sinks of solutions
+        that are garbage collected or still open at interpreter exit are closed as a fallback.
+
+        Examples:
+            >>> counter = ObjectCounter(event_sink="events.parquet")
+            >>> for frame in frames:
+            ...     counter.count(frame)
+            >>> counter.close()
+        """
+        if self._close_sink is not None:
+            self._close_sink()  # runs once
+
+    def __enter__(self):
+        """Return the solution for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the event sink when leaving the context."""
+        self.close()
+
+
+class SolutionResults:
+    """
+    Per-frame results of an Ultralytics Solution in headless mode, returned instead of an annotated image.
+
+    Only the fields relevant to a solution are set, all others keep their defaults.
+
+    Attributes:
+        total_tracks (int): Number of objects tracked in the frame.
+        in_count (int): Total number of objects counted moving inward.
+        out_count (int): Total number of objects counted moving outward.
+        classwise_count (Dict[str, Dict[str, int]]): Inward and outward counts per class name.
+        events (List[Dict]): Events of the frame, i.e. line crossings or region exits, see `BaseSolution.emit`.
+        region_counts (Dict[str, int]): Number of objects inside each region.
+        queue_count (int): Number of objects in the queue region.
+        queue_dwell (Dict[str, float]): Mean, percentile and current longest wait in the queue in seconds.
+        speed_dict (Dict[int, float]): Estimated speed of each track in km/h.
+        workout_count (List[int]): Repetition count of each person.
+        workout_angle (List[float]): Current pose angle of each person.
+        workout_stage (List[str]): Current workout stage of each person.
+        pixels_distance (float): Distance in pixels between the two selected objects.
+        filled_slots (int): Number of occupied parking slots.
+        available_slots (int): Number of available parking slots.
+        analytics (Dict[str, int]): Counts plotted by the analytics chart for the frame.
+        analytics_series (Dict[str, List[float]]): Buffered frame numbers ('frame') and counts per series name.
+
+    Examples:
+        >>> counter = ObjectCounter(region=[(20, 400), (1080, 400)], render=False)
+        >>> results = counter.count(frame)
+        >>> print(results)
+        SolutionResults(total_tracks=5, in_count=2, out_count=1, classwise_count={'car': {'IN': 2, 'OUT': 1}})
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the results with default values, overridden by the given solution outputs.
+
+        Args:
+            **kwargs (Any): Solution outputs, see the class attributes for the supported fields.
+        """
+        self.total_tracks = 0
+        self.in_count = 0
+        self.out_count = 0
+        self.classwise_count = {}
+        self.events = []
+        self.region_counts = {}
+        self.queue_count = 0
+        self.queue_dwell = {}
+        self.speed_dict = {}
+        self.workout_count = []
+        self.workout_angle = []
+        self.workout_stage = []
+        self.pixels_distance = 0.0
+        self.filled_slots = 0
+        self.available_slots = 0
+        self.analytics = {}
+        self.analytics_series = {}
+        self.__dict__.update(kwargs)
+
+    def __str__(self):
+        """Return a string listing the non-empty results."""
+        attrs = ", ".join(f"{k}={v}" for k, v in self.__dict__.items() if v not in (0, 0.0, [], {}))
+        return f"{self.__class__.__name__}({attrs})"
@@ -1,7 +1,6 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
-from time import time
-
+import cv2
 import numpy as np
 
 from ultralytics.solutions.solutions import BaseSolution
@@ -13,27 +12,34 @@ class SpeedEstimator(BaseSolution):
     A class to estimate the speed of objects in a real-time video stream based on their tracks.
 
     This class extends the BaseSolution class and provides functionality for estimating object speeds using
-    tracking data in video streams.
+    tracking data in video streams. Time is taken from source timestamps or derived from the frame number and frame
+    rate, never from the wall clock, so speeds stay correct for batched, buffered or offline processing. Pixel positions
+    are mapped to ground-plane metres with a homography or a fixed scale, and speeds are averaged over the last
+    `speed_window` steps of the track history for all tracks of a frame at once.
 
     Attributes:
-        spd (Dict[int, float]): Dictionary storing speed data for tracked objects.
-        trkd_ids (List[int]): List of tracked object IDs that have already been speed-estimated.
-        trk_pt (Dict[int, float]): Dictionary storing previous timestamps for tracked objects.
-        trk_pp (Dict[int, Tuple[float, float]]): Dictionary storing previous positions for tracked objects.
+        spd (Dict[int, float]): Dictionary storing speed data for tracked objects in km/h.
+        trkd_ids (Set[int]): IDs of tracked objects that have already been speed-estimated.
+        fps (float): Frame rate used to derive timestamps from frame numbers.
+        meter_per_pixel (float): Ground distance of one pixel in metres, used without a homography.
+        homography (np.ndarray | None): 3x3 matrix mapping pixel coordinates to ground-plane metres.
+        speed_window (int): Number of track history steps speeds are averaged over.
         annotator (Annotator): Annotator object for drawing on images.
         region (List[Tuple[int, int]]): List of points defining the speed estimation region.
-        track_line (List[Tuple[float, float]]): List of points representing the object's track.
-        r_s (LineString): LineString object representing the speed estimation region.
+        r_s (Region): Vectorized geometry of the speed estimation region.
 
     Methods:
         initialize_region: Initializes the speed estimation region.
+        calibrate: Builds the pixel to metre homography from a matrix or point correspondences.
+        to_world: Maps pixel coordinates to ground-plane metres.
         estimate_speed: Estimates the speed of objects based on tracking data.
-        store_tracking_history: Stores the tracking history for an object.
+        update_tracking_history: Stores the tracking history of all current tracks.
+        evict_tracks: Removes the speed data of evicted tracks.
         extract_tracks: Extracts tracks from the current frame.
         display_output: Displays the output with annotations.
 
     Examples:
-        >>> estimator = SpeedEstimator()
+        >>> estimator = SpeedEstimator(fps=25, meter_per_pixel=0.04)
         >>> frame = cv2.imread("frame.jpg")
         >>> processed_frame = estimator.estimate_speed(frame)
         >>> cv2.imshow("Speed Estimation", processed_frame)
@@ -46,65 +52,117 @@ class SpeedEstimator(BaseSolution):
         self.initialize_region()  # Initialize speed region
 
         self.spd = {}  # set for speed data
-        self.trkd_ids = []  # list for already speed_estimated and tracked ID's
-        self.trk_pt = {}  # set for tracks previous time
-        self.trk_pp = {}  # set for tracks previous point
+        self.trkd_ids = set()  # set for already speed_estimated and tracked ID's
+        self.meter_per_pixel = self.CFG["meter_per_pixel"]
+        self.homography = self.calibrate(self.CFG["homography"])
+        self.speed_window = self.CFG["speed_window"]
 
-    def estimate_speed(self, im0):
+    @staticmethod
+    def calibrate(homography):
         """
-        Estimates the speed of objects based on tracking data.
+        Builds the homography mapping pixel coordinates to ground-plane metres.
 
         Args:
-            im0 (np.ndarray): Input image for processing. Shape is typically (H, W, C) for RGB images.
+            homography (np.ndarray | List | None): A 3x3 matrix, or 4 image points and the 4 corresponding world points
+                in metres as [[(x, y), ...], [(X, Y), ...]], i.e. the corners of a lane segment of known size.
 
         Returns:
-            (np.ndarray): Processed image with speed estimations and annotations.
+            (np.ndarray | None): The 3x3 homography, None if no calibration is given.
 
         Examples:
-            >>> estimator = SpeedEstimator()
-            >>> image = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-            >>> processed_image = estimator.estimate_speed(image)
+            >>> image_points = [(450, 300), (830, 300), (1250, 700), (30, 700)]
+            >>> world_points = [(0, 0), (7.5, 0), (7.5, 30), (0, 30)]  # two 3.75 m lanes over 30 m
+            >>> H = SpeedEstimator.calibrate([image_points, world_points])
         """
-        self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
-        self.extract_tracks(im0)  # Extract tracks
-
-        self.annotator.draw_region(
-            reg_pts=self.region, color=(104, 0, 123), thickness=self.line_width * 2
-        )  # Draw region
-
-        for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
-            self.store_tracking_history(track_id, box)  # Store track history
+        if homography is None:
+            return None
+        h = np.asarray(homography, dtype=np.float64)
+        if h.shape == (2, 4, 2):
+            return cv2.getPerspectiveTransform(h[0].astype(np.float32), h[1].astype(np.float32))
+        if h.shape != (3, 3):
+            raise ValueError(f"homography must be a 3x3 matrix or 4 image and 4 world points, but got shape {h.shape}")
+        return h
+
+    def to_world(self, points):
+        """
+        Maps pixel coordinates to ground-plane coordinates in metres.
 
-            # Check if track_id is already in self.trk_pp or trk_pt initialize if not
-            if track_id not in self.trk_pt:
-                self.trk_pt[track_id] = 0
-            if track_id not in self.trk_pp:
-                self.trk_pp[track_id] = self.track_line[-1]
+        Args:
+            points (np.ndarray): Pixel coordinates of shape (N, 2).
 
-            speed_label = f"{int(self.spd[track_id])} km/h" if track_id in self.spd else self.names[int(cls)]
-            self.annotator.box_label(box, label=speed_label, color=colors(track_id, True))  # Draw bounding box
+        Returns:
+            (np.ndarray): Ground-plane coordinates in metres of shape (N, 2).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if self.homography is None:
+            return points * self.meter_per_pixel
+        if not len(points):
+            return points
+        return cv2.perspectiveTransform(points[:, None], self.homography)[:, 0]
+
+    def evict_tracks(self, track_ids):
+        """
+        Removes the speed data of tracks evicted from the tracking history.
 
-            # Draw tracks of objects
-            self.annotator.draw_centroid_and_tracks(
-                self.track_line, color=colors(int(track_id), True), track_thickness=self.line_width
-            )
+        Args:
+            track_ids (List[int]): IDs of the evicted tracks.
+        """
+        self.trkd_ids.difference_update(track_ids)
+        for track_id in track_ids:
+            self.spd.pop(track_id, None)
 
-            # Calculate object speed and direction based on region intersection
-            if self.LineString([self.trk_pp[track_id], self.track_line[-1]]).intersects(self.r_s):
-                direction = "known"
-            else:
-                direction = "unknown"
+    def estimate_speed(self, im0, timestamp=None):
+        """
+        Estimates the speed of objects based on tracking data.
 
-            # Perform speed calculation and tracking updates if direction is valid
-            if direction == "known" and track_id not in self.trkd_ids:
-                self.trkd_ids.append(track_id)
-                time_difference = time() - self.trk_pt[track_id]
-                if time_difference > 0:
-                    self.spd[track_id] = np.abs(self.track_line[-1][1] - self.trk_pp[track_id][1]) / time_difference
+        The speed of a track is measured when it crosses the region, as the ground distance covered over the last
+        `speed_window` steps of its history divided by the time between them.
 
-            self.trk_pt[track_id] = time()
-            self.trk_pp[track_id] = self.track_line[-1]
+        Args:
+            im0 (np.ndarray): Input image for processing. Shape is typically (H, W, C) for RGB images.
+            timestamp (float, optional): Source timestamp of the frame in seconds, i.e.
+                `cap.get(cv2.CAP_PROP_POS_MSEC) / 1000`. Derived from the frame number and `fps` if not given.
 
-        self.display_output(im0)  # display output with base class function
+        Returns:
+            (np.ndarray | SolutionResults): Processed image with speed estimations and annotations, or the speeds of
+                the tracks if `render=False`.
 
-        return im0  # return output image for more usage
+        Examples:
+            >>> estimator = SpeedEstimator()
+            >>> image = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+            >>> processed_image = estimator.estimate_speed(image)
+        """
+        self.extract_tracks(im0)  # Extract tracks
+        t = self.track_history.frame / self.fps if timestamp is None else timestamp  # first frame at t=0
+        self.update_tracking_history(t)  # Store track history
+
+        # Average speeds over the recent history and check region crossings for all tracks at once
+        start, t_start, end, t_end = self.track_history.span(self.track_ids, self.speed_window)
+        dt = t_end - t_start
+        distance = np.linalg.norm(self.to_world(end) - self.to_world(start), axis=1)
+        speed = np.divide(distance, dt, out=np.zeros_like(distance), where=dt > 0) * 3.6  # m/s to km/h
+        crossed = self.r_s.intersects(self.track_history.last(self.track_ids, 1), end) & (dt > 0)
+
+        for i in np.nonzero(crossed)[0]:
+            track_id = self.track_ids[i]
+            if track_id not in self.trkd_ids:  # measure each track once, when it crosses the region
+                self.trkd_ids.add(track_id)
+                self.spd[track_id] = float(speed[i])
+                self.emit("speed", track_id, cls=self.clss[i], value=self.spd[track_id])
+
+        if self.render:
+            self.annotator = Annotator(im0, line_width=self.line_width)  # Initialize annotator
+            self.annotator.draw_region(
+                reg_pts=self.region, color=(104, 0, 123), thickness=self.line_width * 2
+            )  # Draw region
+
+            for box, track_id, cls in zip(self.boxes, self.track_ids, self.clss):
+                speed_label = f"{int(self.spd[track_id])} km/h" if track_id in self.spd else self.names[int(cls)]
+                self.annotator.box_label(box, label=speed_label, color=colors(track_id, True))  # Draw bounding box
+
+                # Draw tracks of objects
+                self.annotator.draw_centroid_and_tracks(
+                    self.track_history[track_id], color=colors(int(track_id), True), track_thickness=self.line_width
+                )
+
+        return self.output(im0, speed_dict={t: self.spd[t] for t in self.track_ids if t in self.spd})
@@ -1,6 +1,6 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
-from collections import deque
+import weakref
 
 import numpy as np
 
@@ -9,6 +9,9 @@ from .byte_tracker import BYTETracker, STrack
 from .utils import matching
 from .utils.gmc import GMC
 from .utils.kalman_filter import KalmanFilterXYWH
+from .utils.reid import ReID
+
+REID_ENCODERS = weakref.WeakValueDictionary()  # ReID encoders by (model, device), released with their trackers
 
 
 class BOTrack(STrack):
@@ -22,7 +25,8 @@ class BOTrack(STrack):
         shared_kalman (KalmanFilterXYWH): A shared Kalman filter for all instances of BOTrack.
         smooth_feat (np.ndarray): Smoothed feature vector.
         curr_feat (np.ndarray): Current feature vector.
-        features (deque): A deque to store feature vectors with a maximum length defined by `feat_history`.
+        features (np.ndarray | None): Ring array of shape (feat_history, C) storing past feature vectors.
+        feat_count (int): Total number of features written to the `features` ring array.
         alpha (float): Smoothing factor for the exponential moving average of features.
         mean (np.ndarray): The mean state of the Kalman filter.
         covariance (np.ndarray): The covariance matrix of the Kalman filter.
@@ -34,6 +38,7 @@ class BOTrack(STrack):
         update(new_track, frame_id): Update the YOLOv8 instance with new track and frame ID.
         tlwh: Property that gets the current position in tlwh format `(top left x, top left y, width, height)`.
         multi_predict(stracks): Predicts the mean and covariance of multiple object tracks using shared Kalman filter.
+        mean_to_tlwh(mean): Converts Kalman filter mean states of multiple tracks to tlwh format.
         convert_coords(tlwh): Converts tlwh bounding box coordinates to xywh format.
         tlwh_to_xywh(tlwh): Convert bounding box to xywh format `(center x, center y, width, height)`.
 
@@ -56,7 +61,7 @@ class BOTrack(STrack):
             score (float): Confidence score of the detection.
             cls (int): Class ID of the detected object.
             feat (np.ndarray | None): Feature vector associated with the detection.
-            feat_history (int): Maximum length of the feature history deque.
+            feat_history (int): Number of past features kept in the ring array gallery.
 
         Examples:
             Initialize a BOTrack object with bounding box, score, class ID, and feature vector
@@ -70,21 +75,34 @@ class BOTrack(STrack):
 
         self.smooth_feat = None
         self.curr_feat = None
+        self.features = None  # ring array allocated on first feature
+        self.feat_history = feat_history
+        self.feat_count = 0
+        self.alpha = 0.9
         if feat is not None:
             self.update_features(feat)
-        self.features = deque([], maxlen=feat_history)
-        self.alpha = 0.9
 
     def update_features(self, feat):
-        """Update the feature vector and apply exponential moving average smoothing."""
-        feat /= np.linalg.norm(feat)
+        """Update the feature vector, store it in the ring array gallery and apply exponential moving average."""
+        feat = np.asarray(feat, dtype=np.float32)
+        feat = feat / np.linalg.norm(feat)
         self.curr_feat = feat
         if self.smooth_feat is None:
             self.smooth_feat = feat
         else:
             self.smooth_feat = self.alpha * self.smooth_feat + (1 - self.alpha) * feat
-        self.features.append(feat)
         self.smooth_feat /= np.linalg.norm(self.smooth_feat)
+        if self.features is None:
+            self.features = np.zeros((self.feat_history, len(feat)), dtype=np.float32)
+        self.features[self.feat_count % self.feat_history] = feat
+        self.feat_count += 1
+
+    @property
+    def feature_gallery(self):
+        """Returns the stored past feature vectors as an array of shape (min(feat_count, feat_history), C)."""
+        if self.features is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.features[: min(self.feat_count, self.feat_history)]
 
     def predict(self):
         """Predicts the object's future state using the Kalman filter to update its mean and covariance."""
@@ -132,6 +150,13 @@ class BOTrack(STrack):
             stracks[i].mean = mean
             stracks[i].covariance = cov
 
+    @staticmethod
+    def mean_to_tlwh(mean):
+        """Convert Kalman filter mean states of shape (N, 4) from xywh to tlwh format, as the `tlwh` property does."""
+        ret = mean.copy()
+        ret[:, :2] -= ret[:, 2:] / 2
+        return ret
+
     def convert_coords(self, tlwh):
         """Converts tlwh bounding box coordinates to xywh format."""
         return self.tlwh_to_xywh(tlwh)
@@ -151,15 +176,18 @@ class BOTSORT(BYTETracker):
     Attributes:
         proximity_thresh (float): Threshold for spatial proximity (IoU) between tracks and detections.
         appearance_thresh (float): Threshold for appearance similarity (ReID embeddings) between tracks and detections.
-        encoder (Any): Object to handle ReID embeddings, set to None if ReID is not enabled.
+        encoder (ReID | None): Batched crop encoder for ReID embeddings, shared by all trackers with the same model and
+            device. None if ReID is disabled or if embeddings are pooled from the detector's features (`model: auto`).
         gmc (GMC): An instance of the GMC algorithm for data association.
         args (Any): Parsed command-line arguments containing tracking parameters.
 
     Methods:
         get_kalmanfilter(): Returns an instance of KalmanFilterXYWH for object tracking.
-        init_track(dets, scores, cls, img): Initialize track with detections, scores, and classes.
+        init_track(dets, scores, cls, img, feats): Initialize track with detections, scores, classes and features.
         get_dists(tracks, detections): Get distances between tracks and detections using IoU and (optionally) ReID.
         multi_predict(tracks): Predict and track multiple objects with YOLOv8 model.
+        state_dict(): Returns the tracker state including ReID features and GMC data as NumPy arrays.
+        load_state_dict(state): Restores the tracker state from a dictionary created by `state_dict`.
 
     Examples:
         Initialize BOTSORT and process detections
@@ -189,22 +217,29 @@ class BOTSORT(BYTETracker):
         self.proximity_thresh = args.proximity_thresh
         self.appearance_thresh = args.appearance_thresh
 
+        self.encoder = None
         if args.with_reid:
-            # Haven't supported BoT-SORT(reid) yet
-            self.encoder = None
+            model = getattr(args, "model", "auto")
+            if model != "auto":  # 'auto' features are pooled from the detector and passed to update()
+                device = getattr(args, "device", "")  # predictor device, set by on_predict_start
+                key = (model, str(device))
+                self.encoder = REID_ENCODERS.get(key)
+                if self.encoder is None:  # one copy of the weights for all streams on a device
+                    self.encoder = REID_ENCODERS[key] = ReID(model, device=device)
         self.gmc = GMC(method=args.gmc_method)
 
     def get_kalmanfilter(self):
         """Returns an instance of KalmanFilterXYWH for predicting and updating object states in the tracking process."""
         return KalmanFilterXYWH()
 
-    def init_track(self, dets, scores, cls, img=None):
+    def init_track(self, dets, scores, cls, img=None, feats=None):
         """Initialize object tracks using detection bounding boxes, scores, class labels, and optional ReID features."""
         if len(dets) == 0:
             return []
-        if self.args.with_reid and self.encoder is not None:
-            features_keep = self.encoder.inference(img, dets)
-            return [BOTrack(xyxy, s, c, f) for (xyxy, s, c, f) in zip(dets, scores, cls, features_keep)]  # detections
+        if self.args.with_reid and feats is None and self.encoder is not None and img is not None:
+            feats = self.encoder(img, dets)  # all detections embedded in one batch
+        if self.args.with_reid and feats is not None:
+            return [BOTrack(xyxy, s, c, f) for (xyxy, s, c, f) in zip(dets, scores, cls, feats)]  # detections
         else:
             return [BOTrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)]  # detections
 
@@ -216,10 +251,14 @@ class BOTSORT(BYTETracker):
         if self.args.fuse_score:
             dists = matching.fuse_score(dists, detections)
 
-        if self.args.with_reid and self.encoder is not None:
+        if (
+            self.args.with_reid
+            and dists.size
+            and all(t.smooth_feat is not None for t in tracks)
+            and all(d.curr_feat is not None for d in detections)
+        ):
             emb_dists = matching.embedding_distance(tracks, detections) / 2.0
-            emb_dists[emb_dists > self.appearance_thresh] = 1.0
-            emb_dists[dists_mask] = 1.0
+            emb_dists[(emb_dists > self.appearance_thresh) | dists_mask] = 1.0
             dists = np.minimum(dists, emb_dists)
         return dists
 
@@ -231,3 +270,50 @@ class BOTSORT(BYTETracker):
         """Resets the BOTSORT tracker to its initial state, clearing all tracked objects and internal states."""
         super().reset()
         self.gmc.reset_params()
+
+    def state_dict(self):
+        """
+        Return the tracker state, including ReID feature galleries and GMC previous frame data, as NumPy arrays.
+
+        Returns:
+            (Dict[str, np.ndarray]): Tracker state, serializable with `np.savez`.
+
+        Examples:
+            >>> np.savez("tracker.npz", **bot_sort.state_dict())
+        """
+        state = super().state_dict()
+        tracks = self.tracked_stracks + self.lost_stracks
+        dim = next((len(t.smooth_feat) for t in tracks if t.smooth_feat is not None), 0)
+        hist = max((t.feat_history for t in tracks), default=0) if dim else 0
+        smooth_feat = np.zeros((len(tracks), dim), dtype=np.float32)
+        curr_feat = np.zeros((len(tracks), dim), dtype=np.float32)
+        features = np.zeros((len(tracks), hist, dim), dtype=np.float32)
+        for i, t in enumerate(tracks):
+            if t.smooth_feat is not None:
+                smooth_feat[i], curr_feat[i], features[i, : t.feat_history] = t.smooth_feat, t.curr_feat, t.features
+        state.update(
+            smooth_feat=smooth_feat,
+            curr_feat=curr_feat,
+            features=features,
+            feat_count=np.array([t.feat_count for t in tracks], dtype=np.int64),
+            **{f"gmc.{k}": v for k, v in self.gmc.state_dict().items()},
+        )
+        return state
+
+    def load_state_dict(self, state):
+        """
+        Restore the tracker state, including ReID feature galleries and GMC previous frame data.
+
+        Args:
+            state (Dict[str, np.ndarray]): Tracker state, i.e. as loaded with `np.load` from an `.npz` file.
+
+        Examples:
+            >>> bot_sort.load_state_dict(np.load("tracker.npz"))
+        """
+        super().load_state_dict(state)
+        for i, t in enumerate(self.tracked_stracks + self.lost_stracks):
+            t.feat_count = int(state["feat_count"][i])
+            if t.feat_count:
+                t.smooth_feat, t.curr_feat = state["smooth_feat"][i].copy(), state["curr_feat"][i].copy()
+                t.features = state["features"][i, : t.feat_history].copy()
+        self.gmc.load_state_dict({k[4:]: state[k] for k in state if k.startswith("gmc.")})
@@ -34,6 +34,8 @@ class STrack(BaseTrack):
         predict(): Predict the next state of the object using Kalman filter.
         multi_predict(stracks): Predict the next states for multiple tracks.
         multi_gmc(stracks, H): Update multiple track states using a homography matrix.
+        multi_coords(stracks): Stack the box coordinates of multiple tracks into a single array.
+        mean_to_tlwh(mean): Convert Kalman filter mean states to tlwh format.
         activate(kalman_filter, frame_id): Activate a new tracklet.
         re_activate(new_track, frame_id, new_id): Reactivate a previously lost tracklet.
         update(new_track, frame_id): Update the state of a matched track.
@@ -119,6 +121,41 @@ class STrack(BaseTrack):
                 stracks[i].mean = mean
                 stracks[i].covariance = cov
 
+    @classmethod
+    def multi_coords(cls, stracks):
+        """
+        Stack the box coordinates of multiple tracks into one array, xywha for OBB tracks and xyxy otherwise.
+
+        Box conversion is vectorized over all tracks instead of going through the per-track `xyxy`/`xywha` properties.
+
+        Args:
+            stracks (List[STrack]): Tracks or detections of the same class, all with or all without angles.
+
+        Returns:
+            (np.ndarray): Coordinates of shape (N, 5) in xywha format for OBB tracks, else (N, 4) in xyxy format.
+
+        Examples:
+            >>> coords = STrack.multi_coords(tracks)
+        """
+        has_mean = np.array([st.mean is not None for st in stracks], dtype=bool)
+        tlwh = np.empty((len(stracks), 4), dtype=np.float64)
+        if has_mean.any():
+            tlwh[has_mean] = cls.mean_to_tlwh(np.asarray([st.mean[:4] for st in stracks if st.mean is not None]))
+        if not has_mean.all():
+            tlwh[~has_mean] = np.asarray([st._tlwh for st in stracks if st.mean is None])
+        if stracks[0].angle is None:
+            return np.concatenate([tlwh[:, :2], tlwh[:, :2] + tlwh[:, 2:]], 1)
+        angle = np.asarray([st.angle for st in stracks], dtype=np.float64)
+        return np.concatenate([tlwh[:, :2] + tlwh[:, 2:] / 2, tlwh[:, 2:], angle[:, None]], 1)
+
+    @staticmethod
+    def mean_to_tlwh(mean):
+        """Convert Kalman filter mean states of shape (N, 4) from xyah to tlwh format, as the `tlwh` property does."""
+        ret = mean.copy()
+        ret[:, 2] *= ret[:, 3]
+        ret[:, :2] -= ret[:, 2:] / 2
+        return ret
+
     def activate(self, kalman_filter, frame_id):
         """Activate a new tracklet using the provided Kalman filter and initialize its state and covariance."""
         self.kalman_filter = kalman_filter
@@ -250,12 +287,14 @@ class BYTETracker:
         kalman_filter (KalmanFilterXYAH): Kalman Filter object.
 
     Methods:
-        update(results, img=None): Updates object tracker with new detections.
+        update(results, img=None, feats=None): Updates object tracker with new detections.
         get_kalmanfilter(): Returns a Kalman filter object for tracking bounding boxes.
-        init_track(dets, scores, cls, img=None): Initialize object tracking with detections.
+        init_track(dets, scores, cls, img=None, feats=None): Initialize object tracking with detections.
         get_dists(tracks, detections): Calculates the distance between tracks and detections.
         multi_predict(tracks): Predicts the location of tracks.
         reset_id(): Resets the ID counter of STrack.
+        state_dict(): Returns the tracker state as a flat dictionary of NumPy arrays.
+        load_state_dict(state): Restores the tracker state from a dictionary created by `state_dict`.
         joint_stracks(tlista, tlistb): Combines two lists of stracks.
         sub_stracks(tlista, tlistb): Filters out the stracks present in the second list from the first list.
         remove_duplicate_stracks(stracksa, stracksb): Removes duplicate stracks based on IoU.
@@ -290,8 +329,8 @@ class BYTETracker:
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
-    def update(self, results, img=None):
-        """Updates the tracker with new detections and returns the current list of tracked objects."""
+    def update(self, results, img=None, feats=None):
+        """Updates the tracker with new detections and optional ReID features, returning the tracked objects."""
         self.frame_id += 1
         activated_stracks = []
         refind_stracks = []
@@ -315,8 +354,11 @@ class BYTETracker:
         scores_second = scores[inds_second]
         cls_keep = cls[remain_inds]
         cls_second = cls[inds_second]
+        feats_keep = feats_second = None
+        if feats is not None:
+            feats_keep, feats_second = feats[remain_inds], feats[inds_second]
 
-        detections = self.init_track(dets, scores_keep, cls_keep, img)
+        detections = self.init_track(dets, scores_keep, cls_keep, img, feats_keep)
         # Add newly detected tracklets to tracked_stracks
         unconfirmed = []
         tracked_stracks = []  # type: list[STrack]
@@ -347,7 +389,7 @@ class BYTETracker:
                 track.re_activate(det, self.frame_id, new_id=False)
                 refind_stracks.append(track)
         # Step 3: Second association, with low score detection boxes association the untrack to the low score detections
-        detections_second = self.init_track(dets_second, scores_second, cls_second, img)
+        detections_second = self.init_track(dets_second, scores_second, cls_second, img, feats_second)
         r_tracked_stracks = [strack_pool[i] for i in u_track if strack_pool[i].state == TrackState.Tracked]
         # TODO
         dists = matching.iou_distance(r_tracked_stracks, detections_second)
@@ -408,7 +450,7 @@ class BYTETracker:
         """Returns a Kalman filter object for tracking bounding boxes using KalmanFilterXYAH."""
         return KalmanFilterXYAH()
 
-    def init_track(self, dets, scores, cls, img=None):
+    def init_track(self, dets, scores, cls, img=None, feats=None):
         """Initializes object tracking with given detections, scores, and class labels using the STrack algorithm."""
         return [STrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)] if len(dets) else []  # detections
 
@@ -437,6 +479,84 @@ class BYTETracker:
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
+    def state_dict(self):
+        """
+        Return the tracker state as a flat dictionary of NumPy arrays.
+
+        Tracked and lost tracks are stored column-wise (boxes, Kalman means and covariances, IDs, states and frame
+        counters), removed tracks only by their IDs. Together with the frame counter and the global track ID counter
+        this allows a tracker with the same settings to resume with consistent IDs via `load_state_dict`.
+
+        Returns:
+            (Dict[str, np.ndarray]): Tracker state, serializable with `np.savez`.
+
+        Examples:
+            Checkpoint a tracker to a compact binary file and resume on another worker
+            >>> np.savez("tracker.npz", **tracker.state_dict())
+            >>> standby = BYTETracker(args, frame_rate=30)
+            >>> standby.load_state_dict(np.load("tracker.npz"))
+        """
+        tracks = self.tracked_stracks + self.lost_stracks
+        n = len(tracks)
+        return {
+            "frame_id": np.array(self.frame_id),
+            "track_count": np.array(BaseTrack._count),
+            "num_tracked": np.array(len(self.tracked_stracks)),
+            "tlwh": np.array([t.tlwh for t in tracks], dtype=np.float32).reshape(n, 4),
+            "angle": np.array([np.nan if t.angle is None else t.angle for t in tracks], dtype=np.float32),
+            "mean": np.array([t.mean for t in tracks], dtype=np.float64).reshape(n, 8),
+            "covariance": np.array([t.covariance for t in tracks], dtype=np.float64).reshape(n, 8, 8),
+            "score": np.array([t.score for t in tracks], dtype=np.float64),
+            "cls": np.array([t.cls for t in tracks], dtype=np.float32),
+            "idx": np.array([t.idx for t in tracks], dtype=np.float32),
+            "track_id": np.array([t.track_id for t in tracks], dtype=np.int64),
+            "state": np.array([t.state for t in tracks], dtype=np.int8),
+            "is_activated": np.array([t.is_activated for t in tracks], dtype=bool),
+            "tracklet_len": np.array([t.tracklet_len for t in tracks], dtype=np.int64),
+            "start_frame": np.array([t.start_frame for t in tracks], dtype=np.int64),
+            "end_frame": np.array([t.frame_id for t in tracks], dtype=np.int64),
+            "removed_id": np.array([t.track_id for t in self.removed_stracks], dtype=np.int64),
+        }
+
+    def load_state_dict(self, state):
+        """
+        Restore the tracker state from a dictionary created by `state_dict`.
+
+        Args:
+            state (Dict[str, np.ndarray]): Tracker state, i.e. as loaded with `np.load` from an `.npz` file.
+
+        Examples:
+            >>> tracker = BYTETracker(args, frame_rate=30)
+            >>> tracker.load_state_dict(np.load("tracker.npz"))
+        """
+        self.reset()
+        self.frame_id = int(state["frame_id"])
+        BaseTrack._count = int(state["track_count"])
+
+        tlwh, angle = np.asarray(state["tlwh"]), np.asarray(state["angle"])
+        xywh = np.concatenate([tlwh[:, :2] + tlwh[:, 2:] / 2, tlwh[:, 2:]], 1)
+        if len(angle) and not np.isnan(angle).any():  # OBB tracks
+            xywh = np.concatenate([xywh, angle[:, None]], 1)
+        dets = np.concatenate([xywh, np.asarray(state["idx"])[:, None]], 1)
+        tracks = self.init_track(dets, np.asarray(state["score"]), np.asarray(state["cls"]))
+        for i, t in enumerate(tracks):
+            t.kalman_filter = self.kalman_filter
+            t.mean, t.covariance = state["mean"][i].copy(), state["covariance"][i].copy()
+            t.track_id = int(state["track_id"][i])
+            t.state = int(state["state"][i])
+            t.is_activated = bool(state["is_activated"][i])
+            t.tracklet_len = int(state["tracklet_len"][i])
+            t.start_frame = int(state["start_frame"][i])
+            t.frame_id = int(state["end_frame"][i])
+        num_tracked = int(state["num_tracked"])
+        self.tracked_stracks, self.lost_stracks = tracks[:num_tracked], tracks[num_tracked:]
+
+        for track_id in state["removed_id"]:  # only the IDs of removed tracks are used for bookkeeping
+            track = BaseTrack()
+            track.track_id = int(track_id)
+            track.mark_removed()
+            self.removed_stracks.append(track)
+
     @staticmethod
     def joint_stracks(tlista, tlistb):
         """Combines two lists of STrack objects into a single list, ensuring no duplicates based on track IDs."""
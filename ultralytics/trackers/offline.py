@@ -0,0 +1,135 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""Offline tracking over pre-computed detections without running the detector or decoding images."""
+
+from multiprocessing.pool import Pool
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from ultralytics.utils import NUM_THREADS, TQDM, IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_requirements, check_yaml
+
+from .track import TRACKER_MAP
+
+DET_COLUMNS = "frame", "x", "y", "w", "h", "conf", "cls"  # xywh box center format, 'r' added after 'h' for OBB
+
+
+def load_detections(file):
+    """
+    Load stored detections of a single video as an array with one row per detection.
+
+    Supported formats are `.npy` arrays and `.csv`/`.parquet` tables with columns `frame, x, y, w, h, [r], conf, cls`,
+    where boxes are in xywh (center x, center y, width, height) format and the optional `r` column holds OBB angles.
+
+    Args:
+        file (str | Path): Path to the detections file.
+
+    Returns:
+        (np.ndarray): Detections of shape (N, 7) or (N, 8) for OBB in float32, columns as listed above.
+
+    Examples:
+        >>> dets = load_detections("video1.parquet")
+    """
+    file = Path(file)
+    if file.suffix == ".npy":
+        return np.load(file).astype(np.float32)
+    import pandas as pd
+
+    if file.suffix == ".parquet":
+        check_requirements("pyarrow")
+        df = pd.read_parquet(file)
+    elif file.suffix == ".csv":
+        df = pd.read_csv(file)
+    else:
+        raise ValueError(f"Unsupported detections format '{file.suffix}', use one of .npy, .csv or .parquet.")
+    columns = [*DET_COLUMNS[:5], "r", *DET_COLUMNS[5:]] if "r" in df.columns else list(DET_COLUMNS)
+    return df[columns].to_numpy(dtype=np.float32)
+
+
+def track_detections(detections, tracker="bytetrack.yaml", frame_rate=30, images=None):
+    """
+    Run a tracker over the stored detections of a single video.
+
+    Detections are grouped by frame and passed to the tracker frame by frame. As in `model.track()`, frames without
+    detections do not update the tracker. No images are decoded unless `images` is given, so by default BoT-SORT runs
+    without global motion compensation.
+
+    Args:
+        detections (np.ndarray | str | Path): Detections array as returned by `load_detections`, or a path to one.
+        tracker (str | dict): Tracker YAML file or a dictionary of tracker settings, i.e. for hyperparameter sweeps.
+        frame_rate (int): Frame rate of the video.
+        images (Dict[int, str] | List[str], optional): Image files indexed by frame number, passed to the tracker for
+            BoT-SORT global motion compensation.
+
+    Returns:
+        (np.ndarray): Tracks of shape (M, 9) with columns `frame, x1, y1, x2, y2, track_id, score, cls, idx`, or
+            (M, 10) with columns `frame, x, y, w, h, r, track_id, score, cls, idx` for OBB, where `idx` is the index of
+            the detection within its frame.
+
+    Examples:
+        >>> tracks = track_detections("video1.npy", tracker="botsort.yaml")
+    """
+    if not isinstance(detections, np.ndarray):
+        detections = load_detections(detections)
+    cfg = IterableSimpleNamespace(**(tracker if isinstance(tracker, dict) else yaml_load(check_yaml(tracker))))
+    if cfg.tracker_type not in TRACKER_MAP:
+        raise AssertionError(f"Only 'bytetrack' and 'botsort' are supported for now, but got '{cfg.tracker_type}'")
+    tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate)
+
+    is_obb = detections.shape[1] == 8
+    detections = detections[np.argsort(detections[:, 0], kind="stable")]
+    frames, starts = np.unique(detections[:, 0], return_index=True)
+    results = []
+    for frame, dets in zip(frames, np.split(detections, starts[1:])):
+        boxes = dets[:, 1:6] if is_obb else dets[:, 1:5]
+        r = SimpleNamespace(xywh=boxes[:, :4], conf=dets[:, -2], cls=dets[:, -1])
+        if is_obb:
+            r.xywhr = boxes
+        tracks = tracker.update(r, None if images is None else cv2.imread(str(images[int(frame)])))
+        if len(tracks):
+            results.append(np.concatenate([np.full((len(tracks), 1), frame, dtype=np.float32), tracks], 1))
+    return np.concatenate(results) if results else np.zeros((0, 10 if is_obb else 9), dtype=np.float32)
+
+
+def _track_file(args):
+    """Track a single detections file and optionally save the tracks, for use in a process pool."""
+    file, tracker, frame_rate, save_dir = args
+    tracks = track_detections(file, tracker, frame_rate)
+    if save_dir is not None:
+        np.save(Path(save_dir) / f"{Path(file).stem}.npy", tracks)
+    return tracks
+
+
+def track_videos(files, tracker="bytetrack.yaml", frame_rate=30, workers=NUM_THREADS, save_dir=None):
+    """
+    Run a tracker over the stored detections of many videos in parallel with a process pool.
+
+    Args:
+        files (List[str | Path]): Detections files, one per video, see `load_detections` for supported formats.
+        tracker (str | dict): Tracker YAML file or a dictionary of tracker settings, i.e. for hyperparameter sweeps.
+        frame_rate (int): Frame rate of the videos.
+        workers (int): Number of worker processes, 0 to track in the main process.
+        save_dir (str | Path, optional): Directory to save the tracks of each video as `<stem>.npy`.
+
+    Returns:
+        (Dict[str, np.ndarray]): Tracks of each video keyed by file path, see `track_detections` for the format.
+
+    Examples:
+        Sweep the track buffer over an archive of detections
+        >>> cfg = yaml_load(check_yaml("bytetrack.yaml"))
+        >>> for buffer in 30, 60, 90:
+        ...     tracks = track_videos(files, tracker={**cfg, "track_buffer": buffer})
+    """
+    files = [str(f) for f in files]
+    if save_dir is not None:
+        Path(save_dir).mkdir(parents=True, exist_ok=True)
+    args = [(f, tracker, frame_rate, save_dir) for f in files]
+    workers = min(workers, len(files))
+    if workers > 1:
+        with Pool(workers) as pool:
+            results = list(TQDM(pool.imap(_track_file, args), desc="Tracking", total=len(files)))
+    else:
+        results = [_track_file(a) for a in TQDM(args, desc="Tracking")]
+    return dict(zip(files, results))
@@ -5,11 +5,12 @@ from pathlib import Path
 
 import torch
 
-from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils import LOGGER, IterableSimpleNamespace, yaml_load
 from ultralytics.utils.checks import check_yaml
 
 from .bot_sort import BOTSORT
 from .byte_tracker import BYTETracker
+from .utils.reid import ReID
 
 # A mapping of tracker types to corresponding tracker classes
 TRACKER_MAP = {"bytetrack": BYTETracker, "botsort": BOTSORT}
@@ -40,6 +41,22 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
     if cfg.tracker_type not in {"bytetrack", "botsort"}:
         raise AssertionError(f"Only 'bytetrack' and 'botsort' are supported for now, but got '{cfg.tracker_type}'")
 
+    if hasattr(predictor, "_reid_hook"):  # detach ReID feature hook of a previous tracking session
+        predictor._reid_hook.remove()
+        del predictor._reid_hook, predictor._reid_feats
+    if cfg.tracker_type == "botsort" and cfg.with_reid and cfg.get("model", "auto") == "auto":
+        head = predictor.model.model.model[-1] if predictor.model.pt else None
+        if head is not None and hasattr(head, "stride"):  # reuse detector neck features as ReID embeddings
+            predictor._reid_feats = None
+            predictor._reid_strides = head.stride.tolist()
+            predictor._reid_hook = head.register_forward_pre_hook(
+                lambda m, x: setattr(predictor, "_reid_feats", list(x[0]))  # copy list, head mutates it in-place
+            )
+        else:
+            LOGGER.warning("WARNING ⚠️ ReID 'model: auto' requires a PyTorch YOLO detector, using 'yolo11n-cls.pt'.")
+            cfg.model = "yolo11n-cls.pt"
+
+    cfg.device = predictor.device  # run the ReID encoder next to the detector
     trackers = []
     for _ in range(predictor.dataset.bs):
         tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
@@ -74,17 +91,48 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
             tracker.reset()
             predictor.vid_path[i if is_stream else 0] = vid_path
 
-        det = (predictor.results[i].obb if is_obb else predictor.results[i].boxes).cpu().numpy()
-        if len(det) == 0:
-            continue
-        tracks = tracker.update(det, im0s[i])
-        if len(tracks) == 0:
-            continue
-        idx = tracks[:, -1].astype(int)
-        predictor.results[i] = predictor.results[i][idx]
-
-        update_args = {"obb" if is_obb else "boxes": torch.as_tensor(tracks[:, :-1])}
-        predictor.results[i].update(**update_args)
+        feats = None
+        if getattr(predictor, "_reid_feats", None) is not None and len(predictor.results[i]):
+            x = [f[i] for f in predictor._reid_feats]
+            shape = (x[0].shape[1] * predictor._reid_strides[0], x[0].shape[2] * predictor._reid_strides[0])
+            boxes = (predictor.results[i].obb if is_obb else predictor.results[i].boxes).xyxy.cpu().numpy()
+            feats = ReID.pool_features(x, boxes, predictor._reid_strides, shape, predictor.results[i].orig_shape)
+        predictor.results[i] = update_results(tracker, predictor.results[i], im0s[i], is_obb, feats)
+
+
+def update_results(tracker, result, img, is_obb=False, feats=None):
+    """
+    Update a tracker with the detections of a single image and return the results with track IDs.
+
+    Detections not matched to a confirmed track are dropped from the results. Results without detections or tracks are
+    returned unchanged.
+
+    Args:
+        tracker (BYTETracker | BOTSORT): Tracker of the video stream the image belongs to.
+        result (ultralytics.engine.results.Results): Detection results of the image.
+        img (np.ndarray): Original image, used for global motion compensation and ReID.
+        is_obb (bool): Whether the results hold oriented bounding boxes.
+        feats (np.ndarray, optional): ReID embeddings of the detections.
+
+    Returns:
+        (ultralytics.engine.results.Results): Results of the tracked detections, with track IDs in their boxes.
+
+    Examples:
+        >>> tracker = BYTETracker(args=cfg, frame_rate=30)
+        >>> result = update_results(tracker, model.predict(frame)[0], frame)
+    """
+    det = (result.obb if is_obb else result.boxes).cpu().numpy()
+    if len(det) == 0:
+        return result
+    tracks = tracker.update(det, img, feats)
+    if len(tracks) == 0:
+        return result
+    idx = tracks[:, -1].astype(int)
+    result = result[idx]
+
+    update_args = {"obb" if is_obb else "boxes": torch.as_tensor(tracks[:, :-1])}
+    result.update(**update_args)
+    return result
 
 
 def register_tracker(model: object, persist: bool) -> None:
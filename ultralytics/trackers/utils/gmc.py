@@ -30,6 +30,8 @@ class GMC:
         applyFeatures: Applies feature-based methods like ORB or SIFT to a raw frame.
         applySparseOptFlow: Applies the Sparse Optical Flow method to a raw frame.
         reset_params: Resets the internal parameters of the GMC object.
+        state_dict: Returns the previous frame data as a dictionary of NumPy arrays.
+        load_state_dict: Restores the previous frame data from a dictionary created by `state_dict`.
 
     Examples:
         Create a GMC object and apply it to a frame
@@ -375,3 +377,54 @@ class GMC:
         self.prevKeyPoints = None
         self.prevDescriptors = None
         self.initializedFirstFrame = False
+
+    def state_dict(self) -> dict:
+        """
+        Return the previous frame, keypoints and descriptors as a flat dictionary of NumPy arrays.
+
+        Feature-based keypoints (ORB, SIFT) are stored as their (x, y) locations, which is all `applyFeatures` uses.
+
+        Returns:
+            (Dict[str, np.ndarray]): GMC state, serializable with `np.savez`.
+
+        Examples:
+            >>> gmc = GMC(method="sparseOptFlow")
+            >>> _ = gmc.apply(np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8))
+            >>> state = gmc.state_dict()
+        """
+        state = {"initialized": np.array(self.initializedFirstFrame)}
+        if self.prevFrame is not None:
+            state["prev_frame"] = self.prevFrame
+        if self.prevKeyPoints is not None:
+            kps = self.prevKeyPoints
+            state["prev_keypoints"] = (
+                np.array([kp.pt for kp in kps], dtype=np.float32).reshape(-1, 2)
+                if self.method in {"orb", "sift"}
+                else kps
+            )
+        if self.prevDescriptors is not None:
+            state["prev_descriptors"] = self.prevDescriptors
+        return state
+
+    def load_state_dict(self, state: dict) -> None:
+        """
+        Restore the previous frame, keypoints and descriptors from a dictionary created by `state_dict`.
+
+        Args:
+            state (Dict[str, np.ndarray]): GMC state as returned by `state_dict`.
+
+        Examples:
+            >>> gmc = GMC(method="sparseOptFlow")
+            >>> gmc.load_state_dict(other_gmc.state_dict())
+        """
+        self.reset_params()
+        self.initializedFirstFrame = bool(state["initialized"])
+        if "prev_frame" in state:
+            self.prevFrame = np.asarray(state["prev_frame"])
+        if "prev_keypoints" in state:
+            kps = np.asarray(state["prev_keypoints"])
+            self.prevKeyPoints = (
+                tuple(cv2.KeyPoint(float(x), float(y), 1) for x, y in kps) if self.method in {"orb", "sift"} else kps
+            )
+        if "prev_descriptors" in state:
+            self.prevDescriptors = np.asarray(state["prev_descriptors"])
@@ -2,9 +2,10 @@
 
 import numpy as np
 import scipy
+import torch
 from scipy.spatial.distance import cdist
 
-from ultralytics.utils.metrics import batch_probiou, bbox_ioa
+from ultralytics.utils.metrics import bbox_ioa, probiou
 
 try:
     import lap  # for linear_assignment
@@ -83,16 +84,15 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
         atlbrs = atracks
         btlbrs = btracks
     else:
-        atlbrs = [track.xywha if track.angle is not None else track.xyxy for track in atracks]
-        btlbrs = [track.xywha if track.angle is not None else track.xyxy for track in btracks]
+        atlbrs = type(atracks[0]).multi_coords(atracks) if len(atracks) else []
+        btlbrs = type(btracks[0]).multi_coords(btracks) if len(btracks) else []
 
     ious = np.zeros((len(atlbrs), len(btlbrs)), dtype=np.float32)
     if len(atlbrs) and len(btlbrs):
         if len(atlbrs[0]) == 5 and len(btlbrs[0]) == 5:
-            ious = batch_probiou(
-                np.ascontiguousarray(atlbrs, dtype=np.float32),
-                np.ascontiguousarray(btlbrs, dtype=np.float32),
-            ).numpy()
+            ious = obb_iou(
+                np.ascontiguousarray(atlbrs, dtype=np.float32), np.ascontiguousarray(btlbrs, dtype=np.float32)
+            )
         else:
             ious = bbox_ioa(
                 np.ascontiguousarray(atlbrs, dtype=np.float32),
@@ -102,6 +102,45 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     return 1 - ious  # cost matrix
 
 
+def obb_iou(aobbs: np.ndarray, bobbs: np.ndarray) -> np.ndarray:
+    """
+    Compute probabilistic IoU between two sets of oriented boxes, gated by their axis-aligned bounding boxes.
+
+    ProbIoU is only evaluated for pairs whose axis-aligned bounds overlap, all other pairs get an IoU of 0. Since
+    disjoint boxes have a ProbIoU well below any association threshold this leaves matches unchanged, while the cost
+    for scenes with hundreds of objects scales with the number of nearby pairs instead of all N x M pairs.
+
+    Args:
+        aobbs (np.ndarray): Oriented boxes of shape (N, 5) in xywha format.
+        bobbs (np.ndarray): Oriented boxes of shape (M, 5) in xywha format.
+
+    Returns:
+        (np.ndarray): IoU matrix of shape (N, M) in float32.
+
+    Examples:
+        >>> aobbs = np.array([[50, 50, 20, 10, 0.3], [200, 200, 30, 10, 1.2]], dtype=np.float32)
+        >>> bobbs = np.array([[52, 51, 20, 10, 0.35]], dtype=np.float32)
+        >>> ious = obb_iou(aobbs, bobbs)
+    """
+
+    def bounds(obbs):
+        """Axis-aligned (x1, y1, x2, y2) bounds of xywha boxes."""
+        cos, sin = np.abs(np.cos(obbs[:, 4])), np.abs(np.sin(obbs[:, 4]))
+        ex = (obbs[:, 2] * cos + obbs[:, 3] * sin) / 2
+        ey = (obbs[:, 2] * sin + obbs[:, 3] * cos) / 2
+        return obbs[:, 0] - ex, obbs[:, 1] - ey, obbs[:, 0] + ex, obbs[:, 1] + ey
+
+    ax1, ay1, ax2, ay2 = bounds(aobbs)
+    bx1, by1, bx2, by2 = bounds(bobbs)
+    i, j = np.nonzero(
+        (ax1[:, None] < bx2) & (bx1 < ax2[:, None]) & (ay1[:, None] < by2) & (by1 < ay2[:, None])
+    )  # candidate pairs with overlapping axis-aligned bounds
+    ious = np.zeros((len(aobbs), len(bobbs)), dtype=np.float32)
+    if len(i):
+        ious[i, j] = probiou(torch.from_numpy(aobbs[i]), torch.from_numpy(bobbs[j])).numpy().reshape(-1)
+    return ious
+
+
 def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -> np.ndarray:
     """
     Compute distance between tracks and detections based on embeddings.
@@ -125,11 +164,10 @@ def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -
     if cost_matrix.size == 0:
         return cost_matrix
     det_features = np.asarray([track.curr_feat for track in detections], dtype=np.float32)
-    # for i, track in enumerate(tracks):
-    # cost_matrix[i, :] = np.maximum(0.0, cdist(track.smooth_feat.reshape(1,-1), det_features, metric))
     track_features = np.asarray([track.smooth_feat for track in tracks], dtype=np.float32)
-    cost_matrix = np.maximum(0.0, cdist(track_features, det_features, metric))  # Normalized features
-    return cost_matrix
+    if metric == "cosine":  # features are L2-normalized, so cosine distance is a single matrix product
+        return np.maximum(0.0, 1.0 - track_features @ det_features.T)
+    return np.maximum(0.0, cdist(track_features, det_features, metric))
 
 
 def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
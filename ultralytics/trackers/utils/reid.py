@@ -0,0 +1,106 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torchvision.ops import roi_align
+
+from ultralytics.utils import LOGGER
+from ultralytics.utils.ops import xywh2xyxy
+from ultralytics.utils.torch_utils import select_device
+
+
+class ReID:
+    """
+    Batched appearance encoder for re-identification (ReID) in BoT-SORT tracking.
+
+    All detections of a frame are cropped and resized in a single `roi_align` call and embedded with one forward pass of
+    a YOLO model, using the `embed` feature of `BaseModel._predict_once` to return pooled intermediate features. For
+    detection models the pooled neck outputs feeding the head are used, for classification models the last backbone
+    layer. Embeddings are L2-normalized so cosine distances reduce to a matrix product.
+
+    Attributes:
+        model (torch.nn.Module): YOLO model used as the feature extractor.
+        embed (List[int]): Indices of the model layers whose pooled outputs form the embedding.
+        imgsz (Tuple[int, int]): Crop size (height, width) fed to the model.
+        device (torch.device): Device the model runs on.
+
+    Methods:
+        __call__: Computes L2-normalized embeddings for all detections in an image.
+        pool_features: Pools L2-normalized embeddings for boxes directly from detector feature maps.
+
+    Examples:
+        >>> encoder = ReID("yolo11n-cls.pt")
+        >>> feats = encoder(img, dets)  # dets in xywh format, feats of shape (N, C)
+    """
+
+    def __init__(self, model="yolo11n-cls.pt", imgsz=(128, 128), device=""):
+        """
+        Initialize the ReID encoder with a YOLO model.
+
+        Args:
+            model (str): Path to the YOLO *.pt weights used as the feature extractor.
+            imgsz (Tuple[int, int]): Crop size (height, width), must be a multiple of the model stride.
+            device (str): Device to run the encoder on, i.e. 'cpu', '0'. Auto-selected if empty.
+        """
+        from ultralytics.nn.tasks import attempt_load_one_weight
+
+        self.device = select_device(device, verbose=False)
+        self.model, _ = attempt_load_one_weight(model, device=self.device, fuse=True)
+        head = self.model.model[-1]
+        self.embed = list(head.f) if isinstance(head.f, list) else [len(self.model.model) - 2]
+        self.imgsz = tuple(imgsz)
+        LOGGER.info(f"ReID: {model} embedding layers {self.embed} at crop size {self.imgsz}")
+
+    @torch.no_grad()
+    def __call__(self, img, dets):
+        """
+        Compute L2-normalized embeddings for all detections in an image with one batched forward pass.
+
+        Args:
+            img (np.ndarray): Original BGR image of shape (H, W, 3).
+            dets (np.ndarray): Detections of shape (N, >=4) with boxes in xywh format in the first 4 columns.
+
+        Returns:
+            (np.ndarray): Embeddings of shape (N, C) in float32.
+        """
+        if len(dets) == 0:
+            return np.zeros((0, 0), dtype=np.float32)
+        im = torch.from_numpy(np.ascontiguousarray(img[..., ::-1].transpose(2, 0, 1))).to(self.device)
+        im = im[None].float() / 255  # BGR HWC uint8 to RGB BCHW float
+        boxes = xywh2xyxy(torch.as_tensor(np.asarray(dets)[:, :4], dtype=torch.float32, device=self.device))
+        crops = roi_align(im, [boxes], output_size=self.imgsz, aligned=True)  # (N, 3, h, w) crops in one call
+        feats = torch.stack(self.model.predict(crops, embed=self.embed))
+        return F.normalize(feats.float(), dim=1).cpu().numpy()
+
+    @staticmethod
+    @torch.no_grad()
+    def pool_features(feats, boxes, strides, shape, orig_shape):
+        """
+        Pool L2-normalized embeddings for boxes directly from a detector's multi-scale feature maps.
+
+        This reuses the neck features computed during detection so no additional forward pass is needed.
+
+        Args:
+            feats (List[torch.Tensor]): Feature maps of shape (C_i, H_i, W_i) for a single image, one per head level.
+            boxes (np.ndarray): Boxes in xyxy format of shape (N, 4) in original image coordinates.
+            strides (Sequence[float]): Stride of each feature map level.
+            shape (Tuple[int, int]): Letterboxed model input shape (height, width).
+            orig_shape (Tuple[int, int]): Original image shape (height, width).
+
+        Returns:
+            (np.ndarray): Embeddings of shape (N, sum(C_i)) in float32.
+        """
+        gain = min(shape[0] / orig_shape[0], shape[1] / orig_shape[1])
+        pad = (
+            round((shape[1] - orig_shape[1] * gain) / 2 - 0.1),
+            round((shape[0] - orig_shape[0] * gain) / 2 - 0.1),
+        )  # wh padding, matches ops.scale_boxes()
+        rois = torch.as_tensor(boxes[:, :4], dtype=torch.float32, device=feats[0].device) * gain
+        rois[:, 0::2] += pad[0]
+        rois[:, 1::2] += pad[1]
+        pooled = [
+            roi_align(f[None].float(), [rois], output_size=1, spatial_scale=1 / float(s), aligned=True).flatten(1)
+            for f, s in zip(feats, strides)
+        ]
+        return F.normalize(torch.cat(pooled, 1), dim=1).cpu().numpy()
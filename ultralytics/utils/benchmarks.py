@@ -3,9 +3,10 @@
 Benchmark a YOLO model formats for speed and accuracy.
 
 Usage:
-    from ultralytics.utils.benchmarks import ProfileModels, benchmark
+    from ultralytics.utils.benchmarks import ProfileModels, benchmark, benchmark_dataloader
     ProfileModels(['yolov8n.yaml', 'yolov8s.yaml']).profile()
     benchmark(model='yolov8n.pt', imgsz=160)
+    benchmark_dataloader(data='coco8.yaml', imgsz=640, prefetch=(2, 4))
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -177,6 +178,62 @@ def benchmark(
     return df
 
 
+def benchmark_dataloader(data="coco8.yaml", imgsz=640, batch=16, workers=8, prefetch=(2, 4), device="", batches=50):
+    """
+    Benchmark the throughput of the training dataloader for several prefetch depths, with and without GPU staging.
+
+    Batches are loaded with training augmentations and their images are moved to the device as `preprocess_batch` does,
+    without running a model, so the results are the training speed that data loading allows at most.
+
+    Args:
+        data (str): Path to the dataset YAML, its 'train' split is loaded.
+        imgsz (int): Image size.
+        batch (int): Batch size.
+        workers (int): Number of dataloader workers.
+        prefetch (Tuple[int]): Numbers of batches loaded ahead per worker to compare.
+        device (str): Device the images are moved to, staging with `DevicePrefetcher` is only compared on CUDA.
+        batches (int): Number of timed batches per configuration, after one warmup batch.
+
+    Returns:
+        (pandas.DataFrame): Images and batches per second for each prefetch depth and staging setting.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_dataloader
+        >>> benchmark_dataloader("coco8.yaml", imgsz=640, batch=16, workers=8, prefetch=(2, 4, 8), device="0")
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data.build import DevicePrefetcher, build_dataloader, build_yolo_dataset
+    from ultralytics.data.utils import check_det_dataset
+
+    device = select_device(device, verbose=False)
+    data = check_det_dataset(data)
+    dataset = build_yolo_dataset(get_cfg(overrides={"imgsz": imgsz}), data["train"], batch, data, mode="train")
+    y = []
+    for p in prefetch:
+        loader = build_dataloader(dataset, batch, workers, prefetch=p)
+        for staged in (False, True) if device.type == "cuda" else (False,):
+            source = DevicePrefetcher(loader, device) if staged else loader
+            stream = (b for _ in iter(int, 1) for b in source)  # endless over epochs
+            next(stream)  # warmup, starts the workers
+            t = time.perf_counter()
+            n = 0
+            for _ in range(batches):
+                im = next(stream)["img"].to(device, non_blocking=True).float() / 255
+                n += len(im)
+            if device.type == "cuda":
+                torch.cuda.synchronize(device)
+            dt = time.perf_counter() - t
+            stream.close()
+            y.append([p, staged, round(n / dt, 1), round(batches / dt, 2)])
+        del loader  # stop the workers
+
+    df = pd.DataFrame(y, columns=["Prefetch", "Staged", "Images/s", "Batches/s"])
+    LOGGER.info(f"\nDataloader benchmarks at imgsz={imgsz}, batch={batch}, workers={workers}\n{df}\n")
+    return df
+
+
 class RF100Benchmark:
     """Benchmark YOLO model performance across various formats for speed and accuracy."""
 
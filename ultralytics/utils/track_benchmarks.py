@@ -0,0 +1,288 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Benchmark multi-object trackers for speed and accuracy by replaying MOTChallenge-format detections.
+
+Usage:
+    from ultralytics.utils.track_benchmarks import track_benchmark
+    track_benchmark()  # synthetic trajectories, no downloads required
+    track_benchmark(sequences=["MOT17/train/MOT17-02-FRCNN", "MOT17/train/MOT17-04-FRCNN"])
+
+Sequences follow the MOTChallenge layout with detections in `det/det.txt` and ground truth in `gt/gt.txt`, rows
+`frame, id, left, top, width, height, conf, ...`. Trackers are timed per stage (Kalman predict, global motion
+compensation, distance computation and linear assignment) and evaluated with HOTA, MOTA and IDF1.
+"""
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from ultralytics.trackers.offline import track_detections
+from ultralytics.trackers.track import TRACKER_MAP
+from ultralytics.trackers.utils import matching
+from ultralytics.trackers.utils.gmc import GMC
+from ultralytics.utils import LOGGER
+from ultralytics.utils.metrics import bbox_ioa
+
+STAGES = "predict", "gmc", "distance", "assignment"
+TRACKERS = tuple(dict.fromkeys(TRACKER_MAP.values()))
+
+
+def load_mot(file):
+    """
+    Load a MOTChallenge detection or ground truth file.
+
+    Ground truth rows with a zero 'consider' flag (column 7) are dropped, all other rows are kept.
+
+    Args:
+        file (str | Path): Path to a MOTChallenge `det.txt` or `gt.txt` file.
+
+    Returns:
+        (np.ndarray): Rows of `frame, id, left, top, width, height, conf` in float32.
+    """
+    data = np.loadtxt(file, delimiter=",", dtype=np.float32, ndmin=2)
+    if Path(file).stem == "gt" and data.shape[1] > 6:
+        data = data[data[:, 6] != 0]
+        data[:, 6] = 1.0
+    return data[:, :7]
+
+
+def synthetic_mot(frames=300, objects=30, imgsz=(1080, 1920), miss=0.1, false_pos=2, noise=2.0, seed=0):
+    """
+    Generate synthetic ground truth trajectories and noisy detections in MOTChallenge format.
+
+    Objects move with constant velocity plus random acceleration, enter and leave at random frames, and detections are
+    perturbed by Gaussian box noise, randomly missed and mixed with random false positives.
+
+    Args:
+        frames (int): Number of frames.
+        objects (int): Number of ground truth trajectories.
+        imgsz (Tuple[int, int]): Image size (height, width) bounding the object centers.
+        miss (float): Probability of missing a ground truth object in a frame.
+        false_pos (float): Mean number of false positive detections per frame.
+        noise (float): Standard deviation of the detection box noise in pixels.
+        seed (int): Random seed.
+
+    Returns:
+        (Tuple[np.ndarray, np.ndarray]): Detections and ground truth with rows of
+            `frame, id, left, top, width, height, conf`.
+    """
+    rng = np.random.default_rng(seed)
+    h, w = imgsz
+    gt, dets = [], []
+    for i in range(objects):
+        start = int(rng.integers(0, frames * 3 // 4))
+        n = int(rng.integers(frames // 10, frames - start + 1))
+        wh = rng.uniform(20, 80, 2) * np.array([1.0, 2.0])
+        vel = rng.uniform(-4, 4, 2) + np.cumsum(rng.normal(0, 0.1, (n, 2)), 0)
+        xy = rng.uniform(0, (w, h)) + np.cumsum(vel, 0)
+        f = np.arange(start, start + n) + 1
+        gt.append(np.column_stack([f, np.full(n, i + 1), xy - wh / 2, np.tile(wh, (n, 1)), np.ones(n)]))
+        keep = rng.random(n) > miss
+        k = keep.sum()
+        box = np.column_stack([xy[keep] - wh / 2, np.tile(wh, (k, 1))]) + rng.normal(0, noise, (k, 4))
+        dets.append(np.column_stack([f[keep], np.full(k, -1), box, rng.uniform(0.3, 1.0, k)]))
+    num_fp = rng.poisson(false_pos, frames)
+    f = np.repeat(np.arange(frames) + 1, num_fp)
+    box = np.column_stack([rng.uniform(0, (w, h), (len(f), 2)), rng.uniform(20, 80, (len(f), 2))])
+    dets.append(np.column_stack([f, np.full(len(f), -1), box, rng.uniform(0.05, 0.6, len(f))]))
+    dets, gt = np.concatenate(dets).astype(np.float32), np.concatenate(gt).astype(np.float32)
+    return dets[np.argsort(dets[:, 0], kind="stable")], gt[np.argsort(gt[:, 0], kind="stable")]
+
+
+@contextmanager
+def profile_stages(dt):
+    """
+    Accumulate tracker time spent per stage into a dictionary while the context is active.
+
+    Timed are the tracker `update` ('update') and `multi_predict` ('predict') methods, `GMC.apply` ('gmc'), the
+    distance functions of `matching` ('distance') and `matching.linear_assignment` ('assignment'). Originals are
+    restored on exit.
+
+    Args:
+        dt (Dict[str, float]): Dictionary receiving the accumulated seconds per stage.
+    """
+
+    def timed(fn, stage):
+        """Wrap a function to add its run time to a stage."""
+
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                dt[stage] = dt.get(stage, 0.0) + time.perf_counter() - t
+
+        return wrapper
+
+    patches = [
+        (cls, name, stage) for cls in TRACKERS for name, stage in (("update", "update"), ("multi_predict", "predict"))
+    ]
+    patches = [p for p in patches if p[1] in p[0].__dict__]  # methods defined by the class itself, not inherited
+    patches += [(GMC, "apply", "gmc"), (matching, "linear_assignment", "assignment")]
+    patches += [(matching, name, "distance") for name in ("iou_distance", "embedding_distance", "fuse_score")]
+    originals = [(obj, name, obj.__dict__[name]) for obj, name, _ in patches]
+    try:
+        for obj, name, stage in patches:
+            setattr(obj, name, timed(getattr(obj, name), stage))
+        yield dt
+    finally:
+        for obj, name, fn in originals:
+            setattr(obj, name, fn)
+
+
+def mot_metrics(tracks, gt, iou_thres=0.5):
+    """
+    Compute HOTA, MOTA and IDF1 for tracker output against ground truth.
+
+    MOTA and IDF1 follow the CLEAR MOT and identity metrics at a fixed IoU threshold, HOTA follows Luiten et al. (2020)
+    averaged over IoU thresholds 0.05 to 0.95, matching the TrackEval implementation.
+
+    Args:
+        tracks (np.ndarray): Tracker output, rows of `frame, x1, y1, x2, y2, track_id, ...`.
+        gt (np.ndarray): Ground truth, rows of `frame, id, left, top, width, height, ...`.
+        iou_thres (float): IoU threshold for MOTA and IDF1 matches.
+
+    Returns:
+        (Dict[str, float]): HOTA, DetA, AssA, MOTA, IDF1 and the number of ID switches.
+    """
+    gt_xyxy = np.concatenate([gt[:, 2:4], gt[:, 2:4] + gt[:, 4:6]], 1)
+    gt_ids, gt_inv = np.unique(gt[:, 1], return_inverse=True)
+    tr_ids, tr_inv = np.unique(tracks[:, 5], return_inverse=True) if len(tracks) else (np.zeros(0), np.zeros(0, int))
+    ng, nt = len(gt_ids), len(tr_ids)
+    alphas = np.arange(0.05, 0.99, 0.05)
+
+    # Per-frame IoU matrices between ground truth and tracker boxes
+    frames = []
+    for f in np.union1d(gt[:, 0], tracks[:, 0] if len(tracks) else []):
+        gi, ti = np.nonzero(gt[:, 0] == f)[0], np.nonzero(tracks[:, 0] == f)[0] if len(tracks) else np.zeros(0, int)
+        iou = bbox_ioa(gt_xyxy[gi], tracks[ti, 1:5], iou=True) if len(gi) and len(ti) else np.zeros((len(gi), len(ti)))
+        frames.append((gt_inv[gi], tr_inv[ti], iou))
+
+    # HOTA global alignment score
+    potential = np.zeros((ng, nt))
+    gt_count, tr_count = np.bincount(gt_inv, minlength=ng), np.bincount(tr_inv, minlength=nt)
+    for g, t, iou in frames:
+        if iou.size:
+            sim = iou / (iou.sum(0, keepdims=True) + iou.sum(1, keepdims=True) - iou + np.finfo(float).eps)
+            potential[np.ix_(g, t)] += sim
+    alignment = potential / np.maximum(1, gt_count[:, None] + tr_count[None] - potential)
+
+    tp, loc = np.zeros(len(alphas)), np.zeros(len(alphas))
+    match_counts = np.zeros((len(alphas), ng, nt))
+    clear = {"tp": 0, "idsw": 0}
+    id_counts = np.zeros((ng, nt))
+    last_match = {}
+    for g, t, iou in frames:
+        if not iou.size:
+            continue
+        # HOTA matching maximizes alignment-weighted similarity
+        r, c = linear_sum_assignment(-(alignment[np.ix_(g, t)] * iou))
+        for a, alpha in enumerate(alphas):
+            ok = iou[r, c] >= alpha - np.finfo(float).eps
+            tp[a] += ok.sum()
+            loc[a] += iou[r, c][ok].sum()
+            match_counts[a, g[r[ok]], t[c[ok]]] += 1
+        # CLEAR MOT matching keeps previous assignments where still valid
+        cost = np.where(iou >= iou_thres, 1 - iou, 1e6)
+        for i, gid in enumerate(g):
+            j = np.nonzero(t == last_match.get(gid, -1))[0]
+            if len(j) and iou[i, j[0]] >= iou_thres:
+                cost[i, j[0]] = -1.0  # prefer continuing the previous match
+        r, c = linear_sum_assignment(cost)
+        valid = cost[r, c] < 1e6
+        for gid, tid in zip(g[r[valid]], t[c[valid]]):
+            clear["idsw"] += int(gid in last_match and last_match[gid] != tid)
+            last_match[gid] = tid
+        clear["tp"] += int(valid.sum())
+        id_counts[np.ix_(g, t)] += iou >= iou_thres
+
+    num_gt, num_tr = len(gt), len(tracks)
+    fn, fp = num_gt - tp, num_tr - tp
+    det_a = tp / np.maximum(1, tp + fn + fp)
+    ass = match_counts / np.maximum(1, gt_count[None, :, None] + tr_count[None, None] - match_counts)
+    ass_a = (match_counts * ass).sum((1, 2)) / np.maximum(1, tp)
+    r, c = linear_sum_assignment(-id_counts)
+    idtp = id_counts[r, c].sum()
+    mota = 1 - ((num_gt - clear["tp"]) + (num_tr - clear["tp"]) + clear["idsw"]) / max(1, num_gt)
+    return {
+        "HOTA": float(np.sqrt(det_a * ass_a).mean()),
+        "DetA": float(det_a.mean()),
+        "AssA": float(ass_a.mean()),
+        "MOTA": float(mota),
+        "IDF1": float(2 * idtp / max(1, num_gt + num_tr)),
+        "IDSW": clear["idsw"],
+    }
+
+
+def benchmark_tracker(dets, gt=None, tracker="bytetrack.yaml", frame_rate=30, images=None):
+    """
+    Replay MOTChallenge-format detections through a tracker, timing each stage and evaluating against ground truth.
+
+    Only time spent inside the tracker is measured, image decoding for global motion compensation is excluded.
+
+    Args:
+        dets (np.ndarray): Detections, rows of `frame, id, left, top, width, height, conf`.
+        gt (np.ndarray, optional): Ground truth in the same format, metrics are skipped if None.
+        tracker (str | dict): Tracker YAML file or a dictionary of tracker settings.
+        frame_rate (int): Frame rate of the sequence.
+        images (Dict[int, str], optional): Image files indexed by frame number, enables BoT-SORT GMC.
+
+    Returns:
+        (Dict[str, float]): Frames per second, milliseconds per frame for each stage and in total, and tracking metrics
+            if ground truth is given.
+    """
+    xywh = np.concatenate([dets[:, 2:4] + dets[:, 4:6] / 2, dets[:, 4:6]], 1)
+    dets = np.column_stack([dets[:, 0], xywh, dets[:, 6], np.zeros(len(dets), dtype=np.float32)])
+    num_frames = int(max(dets[:, 0].max(initial=0), gt[:, 0].max(initial=0) if gt is not None else 0))
+    dt = {}
+    with profile_stages(dt):
+        tracks = track_detections(dets, tracker=tracker, frame_rate=frame_rate, images=images)
+    total = dt.get("update", 0.0)
+    results = {"FPS": num_frames / max(total, 1e-9), "total (ms)": 1e3 * total / max(1, num_frames)}
+    results.update({f"{k} (ms)": 1e3 * dt.get(k, 0.0) / max(1, num_frames) for k in STAGES})
+    if gt is not None:
+        results.update(mot_metrics(tracks, gt))
+    return results
+
+
+def track_benchmark(sequences=None, trackers=("bytetrack.yaml", "botsort.yaml"), frame_rate=30, **kwargs):
+    """
+    Benchmark trackers on MOTChallenge sequences or, if none are given, on locally generated synthetic trajectories.
+
+    Args:
+        sequences (List[str | Path], optional): MOTChallenge sequence directories containing `det/det.txt`, optionally
+            `gt/gt.txt` and `img1/*.jpg` images for GMC. Synthetic sequences from `synthetic_mot` are used if None.
+        trackers (Tuple[str | dict]): Tracker YAML files or dictionaries of tracker settings to benchmark.
+        frame_rate (int): Frame rate of the sequences.
+        **kwargs (Any): Arguments passed to `synthetic_mot` when no sequences are given.
+
+    Returns:
+        (pandas.DataFrame): One row per tracker and sequence with speed, per-stage times and tracking metrics.
+
+    Examples:
+        >>> from ultralytics.utils.track_benchmarks import track_benchmark
+        >>> df = track_benchmark(frames=500, objects=50)
+    """
+    import pandas as pd
+
+    if sequences is None:
+        data = {"synthetic": (*synthetic_mot(**kwargs), None)}
+    else:
+        data = {}
+        for seq in map(Path, sequences):
+            gt_file = seq / "gt" / "gt.txt"
+            images = {int(f.stem): f for f in (seq / "img1").glob("*.jpg")} or None
+            data[seq.name] = load_mot(seq / "det" / "det.txt"), load_mot(gt_file) if gt_file.exists() else None, images
+
+    rows = []
+    for tracker in trackers:
+        name = tracker.get("tracker_type", "custom") if isinstance(tracker, dict) else Path(tracker).stem
+        for seq, (dets, gt, images) in data.items():
+            results = benchmark_tracker(dets, gt, tracker, frame_rate, images)
+            rows.append({"Tracker": name, "Sequence": seq, **results})
+    df = pd.DataFrame(rows).round(4)
+    LOGGER.info(f"\nTracker benchmarks complete\n{df.to_string(index=False)}\n")
+    return df